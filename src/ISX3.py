@@ -1,23 +1,176 @@
-import struct
+import contextlib
+from typing import NamedTuple
 import serial
 import serial.tools.list_ports
 import csv
 import check_User_Input as input_user
 import time
+import numpy as np
+from frame_decoder import FRAME_SIZE, FrameDecoder, frames_to_array
+from acquisition import AcquisitionThread, ContinuousSession
+from result_writers import WriterThread, open_writer
+from raw_capture import RawCapture
+from scheduler import SweepScheduler
+from eit import EITAcquisition
+import analysis
+from sweep_timing import SweepClock, SweepStatus, estimate_sweep_duration, sweep_clock
+from instrumentation import Metrics
+from device_config import (CHANNEL_COUNT_REQUEST, FrontendConfig, SetupConfig, channel_request, frontend_config,
+                           setup_config)
+from isx3_logging import LazyHex, get_logger
+from transport import FULL_SPEED, TransportProfile, candidate_profiles, get_profile, open_transport
+
+log = get_logger(__name__)
 
 
 MSG_DICT = {
-    "0x01": "No message inside the message buffer",
-    "0x02": "Timeout: Communication-timeout (less data than expected)",
-    "0x04": "Wake-Up Message: System boot ready",
-    "0x11": "TCP-Socket: Valid TCP client-socket connection",
-    "0x81": "Not-Acknowledge: Command has not been executed",
-    "0x82": "Not-Acknowledge: Command could not be recognized",
-    "0x83": "Command-Acknowledge: Command has been executed successfully",
-    "0x84": "System-Ready Message: System is operational and ready to receive data",
-    "0x92": "Data holdup: Measurement data could not be sent via the master interface",
+    0x01: "No message inside the message buffer",
+    0x02: "Timeout: Communication-timeout (less data than expected)",
+    0x04: "Wake-Up Message: System boot ready",
+    0x11: "TCP-Socket: Valid TCP client-socket connection",
+    0x81: "Not-Acknowledge: Command has not been executed",
+    0x82: "Not-Acknowledge: Command could not be recognized",
+    0x83: "Command-Acknowledge: Command has been executed successfully",
+    0x84: "System-Ready Message: System is operational and ready to receive data",
+    0x92: "Data holdup: Measurement data could not be sent via the master interface",
 }
 
+# Upper bound for a single bulk read from the serial port, until a transport profile sets its own
+READ_CHUNK_SIZE = 4096
+# Polling interval for waits shorter than the port timeout, USB full-speed delivers data in 1 ms frames
+READ_POLL_INTERVAL = 0.001
+
+# System messages are framed as [0x18, 0x01, message code, 0x18]
+SYSTEM_MESSAGE_HEADER = bytes([0x18, 0x01])
+SYSTEM_MESSAGE_SIZE = 4
+
+# Messages the device sends once it is operational again after a reset, the system-ready message comes last
+READY_MESSAGES = (0x04, 0x84)
+WAKE_UP_MESSAGE = 0x04
+SYSTEM_READY_MESSAGE = 0x84
+NACK_MESSAGES = (0x81, 0x82)
+ACK_MESSAGE = 0x83
+NO_MESSAGE = 0x01
+# Sent by the Ethernet interface to every newly connected client socket
+TCP_SOCKET_MESSAGE = 0x11
+DATA_HOLDUP_MESSAGE = 0x92
+# Messages the device sends on its own, they are never the answer to a command
+UNSOLICITED_MESSAGES = (WAKE_UP_MESSAGE, SYSTEM_READY_MESSAGE, TCP_SOCKET_MESSAGE, DATA_HOLDUP_MESSAGE)
+
+
+def find_system_message(buffer, start: int = 0, skip=()) -> int:
+    """
+    Locates the next complete system message frame in a byte buffer.
+
+    Args:
+        buffer (bytes or bytearray): Received bytes.
+        start (int): Index to start searching from.
+        skip (tuple of int): Message codes that are passed over, e.g. `UNSOLICITED_MESSAGES`.
+
+    Returns:
+        int: Index of the first frame byte, or -1 if no complete frame was found.
+    """
+    idx = buffer.find(SYSTEM_MESSAGE_HEADER, start)
+    while idx >= 0:
+        if idx + SYSTEM_MESSAGE_SIZE > len(buffer):
+            return -1
+        if buffer[idx + SYSTEM_MESSAGE_SIZE - 1] == 0x18:
+            if buffer[idx + 2] not in skip:
+                return idx
+            idx = buffer.find(SYSTEM_MESSAGE_HEADER, idx + SYSTEM_MESSAGE_SIZE)
+        else:
+            idx = buffer.find(SYSTEM_MESSAGE_HEADER, idx + 1)
+    return -1
+
+
+def find_response_frame(buffer, command: int):
+    """
+    Extracts the first complete response frame [command, length, data..., command] from a byte buffer.
+
+    Args:
+        buffer (bytes or bytearray): Received bytes.
+        command (int): Command byte that starts and ends the frame (e.g., 0xB1).
+
+    Returns:
+        bytes or None: The frame, None if no complete frame has arrived yet.
+    """
+    idx = buffer.find(bytes([command]))
+    while 0 <= idx < len(buffer) - 1:
+        frame_end = idx + buffer[idx + 1] + 3
+        if frame_end > len(buffer):
+            return None
+        if buffer[frame_end - 1] == command:
+            return bytes(buffer[idx:frame_end])
+        idx = buffer.find(bytes([command]), idx + 1)
+    return None
+
+
+class SystemMessage(NamedTuple):
+    """
+    System message received in answer to a command.
+
+    Attributes:
+        code (int): Message code (e.g., 0x83 for ACK), NO_MESSAGE if no complete frame arrived.
+        received (bytes): All bytes read while waiting for the message.
+    """
+    code: int
+    received: bytes
+
+    @property
+    def text(self) -> str:
+        return MSG_DICT.get(self.code, "Unknown message")
+
+    @property
+    def acknowledged(self) -> bool:
+        return self.code == ACK_MESSAGE
+
+    @property
+    def rejected(self) -> bool:
+        return self.code in NACK_MESSAGES
+
+    def to_int(self) -> list:
+        return list(self.received)
+
+    def to_hex(self) -> list:
+        return [hex(receive) for receive in self.received]
+
+
+def parse_system_message(buffer, start: int = 0, skip=()) -> SystemMessage:
+    """
+    Parses the first complete system message frame in a byte buffer.
+
+    Args:
+        buffer (bytes or bytearray): Received bytes.
+        start (int): Index to start searching from.
+        skip (tuple of int): Message codes that are passed over, e.g. `UNSOLICITED_MESSAGES`.
+
+    Returns:
+        SystemMessage: The message, with the code NO_MESSAGE if the buffer holds no complete frame.
+    """
+    idx = find_system_message(buffer, start, skip)
+    code = NO_MESSAGE if idx < 0 else buffer[idx + 2]
+    return SystemMessage(code, bytes(buffer))
+
+
+def build_fs_settings_command(measurement_mode, measurement_channel="Main Port",
+                              current_measurement_range="autoranging", voltage_measurement_range="1V"):
+    """
+    Validates the frontend settings and builds the 0xB0 command frame.
+
+    Args:
+        measurement_mode (int): Measurement mode (2=2-point, 3=3-point, 4=4-point).
+        measurement_channel (str): Measurement channel to use (e.g., "Main Port").
+        current_measurement_range (str): Current measurement range (e.g., "10mA").
+        voltage_measurement_range (str): Voltage measurement range (e.g., "1V").
+
+    Returns:
+        bytearray or None: The command frame, None if the mode is not supported.
+    """
+    config = frontend_config(measurement_mode, measurement_channel, current_measurement_range,
+                             voltage_measurement_range)
+    return None if config is None else bytearray(config.frame)
+
+
 class ISX3:
 
     def __init__(self, n_el: int) -> None:
@@ -28,118 +181,328 @@ class ISX3:
                         n_el (int): Number of electrodes used in the measurement setup.
                     """
         self.n_el = n_el
+        # Name and parameters of the transport profile of the connection
         self.serial_protocol = None
+        self.profile = None
+        self.read_chunk_size = READ_CHUNK_SIZE
         self.device = None
         self.frequency_points = 0
         self.ret_hex_int = None
         self.print_msg = True
+        self.command_timeout = 1.0
+        self.metrics = None
+        self.last_message = None
+        # Shadow of the device state: the acknowledged setup and frontend channel stack, None if unknown
+        self.setup = None
+        self.frontend = None
+        # Seconds after which a skipped frontend write first cross-checks the shadow with the device
+        self.verify_interval = None
+        self._last_verified = 0.0
+        # Setup of the latest sweep, kept across resets to rebuild the frequency axis
+        self.sweep_setup = None
+        # Completion status of the last `start_measurement` sweep
+        self.last_status = None
+
+    def enable_metrics(self, metrics: Metrics = None) -> Metrics:
+        """
+                Attaches an instrumentation layer that times the phases of a sweep and counts
+                bytes, frames, resync events, ACK latencies and the time blocked in `read()`.
+
+                Args:
+                    metrics (Metrics): Metrics object to record into, a new one is created if not given.
+
+                Returns:
+                    Metrics: The attached metrics, export them with `snapshot()` or `to_prometheus()`.
+                """
+        self.metrics = metrics if metrics is not None else Metrics()
+        return self.metrics
 
-    def is_port_available(self, port: str) -> bool:
+    def disable_metrics(self):
+        """
+                Detaches the instrumentation layer, the driver records nothing afterwards.
+
+                Returns:
+                    None
+                """
+        self.metrics = None
+
+    def _phase(self, name: str):
+        if self.metrics is None:
+            return contextlib.nullcontext()
+        return self.metrics.phase(name)
+
+    def record_decoder(self, decoder: FrameDecoder):
+        """
+                Adds the counters of a finished frame decoder to the attached metrics.
+
+                Args:
+                    decoder (FrameDecoder): Decoder of a completed read.
+
+                Returns:
+                    None
+                """
+        metrics = self.metrics
+        if metrics is None:
+            return
+        metrics.count("frames_decoded", decoder.frames_decoded)
+        metrics.count("resync_events", decoder.resync_count)
+        metrics.count("skipped_bytes", decoder.skipped_bytes)
+        metrics.count("framing_errors", decoder.framing_errors)
+        metrics.count("invalid_values", decoder.invalid_values)
+        metrics.count("invalid_frequency_ids", decoder.invalid_ids)
+        metrics.count("sequence_gaps", decoder.sequence_gaps)
+
+    def is_port_available(self, port: str, available_ports=None) -> bool:
         """
         Checks if the specified COM port is available.
 
         Args:
             port (str): COM port identifier (e.g., "COM3").
+            available_ports (list of str): Previously enumerated ports. The ports are
+            enumerated again if not given.
 
         Returns:
             bool: True if the port is available, False otherwise.
         """
-        available_ports = [p.device for p in serial.tools.list_ports.comports()]
+        if available_ports is None:
+            available_ports = [p.device for p in serial.tools.list_ports.comports()]
         return port in available_ports
 
-    def connect_device_fs(self, port: str):
+    def connect_device_fs(self, port: str, available_ports=None) -> bool:
         """
         Connects to the ISX3 device via the specified serial port (USB full-speed).
 
         Args:
             port (str): COM port to connect to (e.g., "COM3").
+            available_ports (list of str): Previously enumerated ports, avoids enumerating them again.
 
-        Raises:
-            serial.SerialException: If the connection cannot be established.
+        Returns:
+            bool: True if the device is connected.
         """
-        if not self.is_port_available(port):
-            print(f"Error: Port {port} is not available.")
-            return
+        return self.connect(port, FULL_SPEED, available_ports)
 
-        if hasattr(self, "serial_protocol"):
-            print(
-                f"Serial connection 'self.serial_protocol' already defined as {self.serial_protocol}."
-            )
+    def connect(self, target: str, profile="auto", available_ports=None) -> bool:
+        """
+        Connects to the ISX3 device with the read sizes, timeouts and buffer sizes of a transport profile.
+
+        Args:
+            target (str): COM port (e.g., "COM3"), or "host:port" for the Ethernet interface.
+            profile (str or TransportProfile): "FS" (USB full-speed), "HS" (USB high-speed), "TCP", or
+            "auto" to probe the profiles that can reach `target`, fastest first, and keep the first
+            one the unit answers on. The probe can only tell the profiles apart by their baud rate,
+            so on a USB virtual COM port, which ignores the baud rate, "auto" only checks that the
+            unit answers and always keeps "HS". Pick "FS" explicitly for a full-speed unit.
+            available_ports (list of str): Previously enumerated ports, avoids enumerating them again.
+
+        Returns:
+            bool: True if the device is connected, the profile is kept in `profile` and `serial_protocol`.
+        """
+        if profile == "auto":
+            profiles = candidate_profiles(target)
         else:
-            self.serial_protocol = "FS"
+            resolved = get_profile(profile)
+            if resolved is None:
+                log.warning("Invalid transport profile '%s', set it to 'FS'.", profile)
+                resolved = FULL_SPEED
+            profiles = [resolved]
+
+        if profiles[0].kind == "serial" and not self.is_port_available(target, available_ports):
+            log.error("Port %s is not available.", target)
+            return False
+
+        for candidate in profiles:
+            try:
+                device = open_transport(target, candidate)
+            except (serial.SerialException, OSError, ValueError) as e:
+                log.error("Error: %s", e)
+                continue
+            if candidate.kind == "tcp" and not self._read_socket_message(device):
+                log.warning("No TCP socket message from %s.", target)
+            if len(profiles) > 1 and not self.probe(device):
+                log.info("No answer from %s with the %s profile.", target, candidate.name)
+                device.close()
+                continue
+
+            self._attach(device, candidate)
+            log.info("Successfully Connected to %s (%s profile).", target, candidate.name)
+            return True
+        return False
 
+    def probe(self, device) -> bool:
+        """
+        Checks if the unit answers on an open connection with a harmless channel count readback.
+
+        A probe at a wrong baud rate can leave a partial frame in the receiver of the unit,
+        which then rejects the next request. The request is therefore sent a second time
+        before the connection counts as silent.
+
+        Args:
+            device (serial.Serial): Open connection that is not attached yet.
+
+        Returns:
+            bool: True if the unit acknowledged the request.
+        """
+        with self._borrow(device):
+            for _ in range(2):
+                device.reset_input_buffer()
+                self.write_command_string(CHANNEL_COUNT_REQUEST)
+                if self.last_message is not None and self.last_message.acknowledged:
+                    return True
+        return False
+
+    def _read_socket_message(self, device) -> bool:
+        with self._borrow(device):
+            self.system_message_callback_usb_fs(skip=())
+        return self.last_message is not None and self.last_message.code == TCP_SOCKET_MESSAGE
+
+    @contextlib.contextmanager
+    def _borrow(self, device):
+        # Talks to a connection that is not attached yet
+        previous = self.device
+        self.device = device
         try:
-            self.device = serial.Serial(
-                port=port,
-                baudrate=9600,
-                timeout=1,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                bytesize=serial.EIGHTBITS,
-            )
-            print(f"Successfully Connected to {self.device.name}. \n")
-        except serial.SerialException as e:
-            print("Error: ", e)
-
-    def system_message_callback_usb_fs(self):
+            yield device
+        finally:
+            self.device = previous
+
+    def _attach(self, device, profile: TransportProfile):
+        self.device = device
+        self.profile = profile
+        self.serial_protocol = profile.name
+        self.read_chunk_size = profile.read_chunk_size
+        # A newly connected unit has an unknown state
+        self.setup = None
+        self.frontend = None
+
+    def system_message_callback_usb_fs(self, timeout: float = None, skip=UNSOLICITED_MESSAGES):
         """
         Reads system messages from the serial buffer and interprets them.
 
+        Returns as soon as a complete 0x18 system message frame has arrived instead of
+        waiting for the serial read to time out. Messages the device sends on its own,
+        e.g. a late system-ready message after a reset, are passed over, so they are not
+        taken as the answer to the next command.
+
+        Args:
+            timeout (float): Maximum time in seconds to wait for the message, defaults to `command_timeout`.
+            skip (tuple of int): Message codes that are not an answer, `UNSOLICITED_MESSAGES` by default.
+
         Returns:
-            list or tuple or None: Depending on `ret_hex_int`, returns hexadecimal, integer values, both, or None.
+            SystemMessage or list or tuple: The parsed message. If `ret_hex_int` is "hex", "int" or
+            "both", the received bytes as hexadecimal strings, integer values or both instead.
         """
-        timeout_count = 0
-        received = []
-        data_count = 0
+        deadline = time.time() + (self.command_timeout if timeout is None else timeout)
+        buffer = bytearray()
 
-        while True:
-            buffer = self.device.read()
-            if buffer:
-                received.extend(buffer)
-                data_count += len(buffer)
-                timeout_count = 0
-                continue
-            timeout_count += 1
-            if timeout_count >= 1:
-                # Break if we haven't received any data
+        while find_system_message(buffer, skip=skip) < 0:
+            remaining = deadline - time.time()
+            if remaining <= 0:
                 break
+            buffer += self.read_available(max_wait=remaining)
 
-            received = "".join(str(received))  # If you need all the data
-        received_hex = [hex(receive) for receive in received]
-        try:
-            msg_idx = received_hex.index("0x18")
-            if self.print_msg:
-                print(MSG_DICT[received_hex[msg_idx + 2]])
-        except BaseException:
-            if self.print_msg:
-                print(MSG_DICT["0x01"])
-            # self.print_msg = False
+        message = parse_system_message(buffer, skip=skip)
+        self.last_message = message
         if self.print_msg:
-            print("message buffer:\n", received_hex)
-            print("message length:\t", data_count)
+            log.info("%s", message.text)
+            log.debug("message buffer: %s (%d bytes)", LazyHex(buffer), len(buffer))
 
-        if self.ret_hex_int is None:
-            return None
-        elif self.ret_hex_int == "hex":
-            return received_hex
+        # The hex strings are only built if the caller asked for them
+        if self.ret_hex_int == "hex":
+            return message.to_hex()
         elif self.ret_hex_int == "int":
-            return received
+            return message.to_int()
         elif self.ret_hex_int == "both":
-            return received, received_hex
-        return None
+            return message.to_int(), message.to_hex()
+        return message
 
-    def write_command_string(self, command):
+    def wait_for_system_message(self, codes, timeout: float, received: list = None):
+        """
+        Reads system messages until one of the given message codes arrives.
+
+        Args:
+            codes (tuple of int): Message codes to wait for (e.g., (0x04, 0x84)).
+            timeout (float): Maximum time in seconds to wait.
+            received (list): Collects the codes of all messages read on the way, including the last one.
+
+        Returns:
+            int or None: The received message code, None if none arrived in time.
+        """
+        deadline = time.time() + timeout
+        buffer = bytearray()
+        pos = 0
+
+        while True:
+            idx = find_system_message(buffer, pos)
+            while idx >= 0:
+                code = buffer[idx + 2]
+                if received is not None:
+                    received.append(code)
+                if code in codes:
+                    return code
+                pos = idx + SYSTEM_MESSAGE_SIZE
+                idx = find_system_message(buffer, pos)
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            buffer += self.read_available(max_wait=remaining)
+
+    def write_command_string(self, command, timeout: float = None):
         """
                 Writes a command to the device and processes the resulting system message.
 
                 Args:
                     command (bytearray): Formatted command frame.
+                    timeout (float): Maximum time in seconds to wait for the ACK/NACK, defaults to `command_timeout`.
+
+                Returns:
+                    SystemMessage or list or tuple: Result of `system_message_callback_usb_fs`.
                 """
+        metrics = self.metrics
+        if metrics is None:
+            self.device.write(command)
+            return self.system_message_callback_usb_fs(timeout)
+
+        start = time.perf_counter()
         self.device.write(command)
-        self.system_message_callback_usb_fs()
+        message = self.system_message_callback_usb_fs(timeout)
+        metrics.observe("ack_latency_seconds", time.perf_counter() - start)
+        metrics.count("commands_sent")
+        return message
+
+    def query(self, request, timeout: float = None):
+        """
+                Writes a readback request and waits for the response frame and the acknowledgement.
+
+                Args:
+                    request (bytes or bytearray): Formatted request frame (e.g., 0xB1).
+                    timeout (float): Maximum time in seconds to wait, defaults to `command_timeout`.
+
+                Returns:
+                    bytes or None: The response frame, None if it did not arrive or the request was rejected.
+                """
+        deadline = time.time() + (self.command_timeout if timeout is None else timeout)
+        command = request[0]
+        buffer = bytearray()
+        self.device.write(request)
+
+        while True:
+            frame = find_response_frame(buffer, command)
+            message_idx = find_system_message(buffer, skip=UNSOLICITED_MESSAGES)
+            if message_idx >= 0 and (frame is not None or buffer[message_idx + 2] in NACK_MESSAGES):
+                break
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            buffer += self.read_available(max_wait=remaining)
+
+        self.last_message = parse_system_message(buffer, skip=UNSOLICITED_MESSAGES)
+        log.debug("Response to %s: %s", LazyHex(request), LazyHex(buffer))
+        return frame
 
     def set_fs_settings(self, measurement_mode, measurement_channel="Main Port",
-                        current_measurement_range="autoranging", voltage_measurement_range="1V"):
+                        current_measurement_range="autoranging", voltage_measurement_range="1V",
+                        force: bool = False):
         """
                 Configures the frontend settings for the measurement.
 
@@ -148,146 +511,119 @@ class ISX3:
                     measurement_channel (str): Measurement channel to use (e.g., "Main Port").
                     current_measurement_range (str): Current measurement range (e.g., "10mA").
                     voltage_measurement_range (str): Voltage measurement range (e.g., "1V").
+                    force (bool): Sends the settings even if the device already holds them.
 
                 Returns:
                     None
                 """
-        # Clear stack to avoid overflow
-        self.write_command_string(bytearray([0xB0, 0x03, 0xFF, 0xFF, 0xFF, 0xB0]))
-
-        # Convert parameters
-        mode = input_user.check_measurement_mode(measurement_mode)
-        if mode == -1:
-            print(f"Invalid Measurement Mode '{measurement_mode}', set it to default Value (4 Points).")
-            mode = 0x02
-        current_range = input_user.check_current_range_settings(current_measurement_range)
-        if current_range == -1:
-            print(f"Invalid range mode '{current_measurement_range}', set it to 'autoranging'.")
-            current_range = 0x00
-        voltage_range = input_user.check_voltage_range_settings(voltage_measurement_range)
-        if voltage_range == -1:
-            print(f"Invalid voltage range '{voltage_measurement_range}', set it to ±1V.")
-            voltage_range = 0x01
-        channel_code = input_user.check_measurement_channel(measurement_channel)
-        if channel_code == -1:
-            print(f"Invalid Channel '{measurement_channel}', set it to 'Main Port'.")
-            channel_code = 0x01
-
-        # 2-byte extension channels (default to 0x0000 if not used)
-        ext = [0x00, 0x00]
-
-        # Build command based on measurement mode
-        if mode == 0x01:  # 2-point
-            command = [
-                0xB0, 0x09, mode, current_range, voltage_range,
-                channel_code, *ext,  # C channel
-                channel_code, *ext,  # W channel
-                0xB0
-            ]
-        elif mode == 0x03:  # 3-point
-            command = [
-                0xB0, 0x0C, mode, current_range, voltage_range,
-                channel_code, *ext,  # C channel
-                channel_code, *ext,  # R channel
-                channel_code, *ext,  # W channel
-                0xB0
-            ]
-        elif mode == 0x02:  # 4-point
-            command = [
-                0xB0, 0x0F, mode, current_range, voltage_range,
-                channel_code, *ext,  # C channel
-                channel_code, *ext,  # R channel
-                channel_code, *ext,  # S channel
-                channel_code, *ext,  # W channel
-                0xB0
-            ]
-        else:
-            print("Unsupported measurement mode. Aborting.")
-            return
+        config = frontend_config(measurement_mode, measurement_channel, current_measurement_range,
+                                 voltage_measurement_range)
+        if config is not None:
+            self.apply_frontend_config(config, force)
 
-        self.device.write(bytearray(command))
-        response = self.device.read(4)
-        print("Response from device: ", response)
-        print("FS settings applied.\n")
+    def apply_frontend_config(self, config: FrontendConfig, force: bool = False) -> bool:
+        """
+                Sends precomputed frontend settings as the only channel, skipped if the device already holds them.
 
-    def get_fs_settings(self):
-        self.device.reset_input_buffer()
+                Args:
+                    config (FrontendConfig): Settings created with `device_config.frontend_config`.
+                    force (bool): Sends the settings even if the device already holds them.
 
-        # Step 1: Query number of configured channels
-        request = bytearray([0xB1, 0x03, 0x02, 0x00, 0xB1])
-        self.device.write(request)
-        response = self.device.read(16)
+                Returns:
+                    bool: True if the device holds the settings afterwards.
+                """
+        return self.apply_frontend_configs((config,), force)
 
-        if len(response) < 6 or response[0] != 0xB1 or response[-1] != 0xB1:
-            print("No valid B1 response frame for channel count.\n")
-            return
+    def apply_frontend_configs(self, configs, force: bool = False) -> bool:
+        """
+                Brings the frontend channel stack of the device to `configs`, sending only the difference.
 
-        num_channels = int.from_bytes(response[2:4], "big")
-        print(f"Number of configured channels: {num_channels}")
+                Nothing is sent if the shadow already matches. If the shadow is the beginning
+                of the requested stack, only the missing channels are appended. Otherwise the
+                stack is cleared and rewritten.
 
-        if num_channels == 0:
-            print("No configured frontend channels.\n")
-            return
+                Args:
+                    configs (list of FrontendConfig): Channel settings in stack order.
+                    force (bool): Clears and rewrites the stack even if the shadow matches.
+
+                Returns:
+                    bool: True if the device holds the requested stack afterwards.
+                """
+        configs = tuple(configs)
+        shadow = self.frontend
+        if not force and shadow is not None and self.verify_interval is not None \
+                and time.time() - self._last_verified >= self.verify_interval:
+            self.verify_shadow()
+            shadow = self.frontend
+
+        if not force and shadow == configs:
+            log.debug("FS settings unchanged, nothing sent.")
+            return True
+
+        with self._phase("configure"):
+            if force or shadow is None or configs[:len(shadow)] != shadow:
+                # Clear stack to avoid overflow
+                self.write_command_string(bytearray([0xB0, 0x03, 0xFF, 0xFF, 0xFF, 0xB0]))
+                shadow = ()
+
+            for config in configs[len(shadow):]:
+                self.write_command_string(config.frame)
+                if self.last_message is None or not self.last_message.acknowledged:
+                    log.warning("Device rejected the FS settings %s.", config)
+                    self.frontend = None
+                    return False
+                shadow += (config,)
+                self.frontend = shadow
+
+        log.info("FS settings applied.")
+        return True
 
-        # Step 2: Query each channel config
+    def get_fs_settings(self):
+        """
+                Reads the configured frontend channels back from the device.
+
+                Returns:
+                    tuple of FrontendConfig or None: The channel stack of the device, None if the readback failed.
+                """
+        response = self.query(CHANNEL_COUNT_REQUEST)
+        if response is None or len(response) < 5:
+            log.warning("No valid B1 response frame for channel count.")
+            return None
+
+        num_channels = int.from_bytes(response[2:4], "big")
+        log.info("Number of configured channels: %d", num_channels)
+
+        configs = []
         for ch in range(1, num_channels + 1):
-            self.device.reset_input_buffer()
-            self.device.write(bytearray([0xB1, 0x02, ch, 0xB1]))
-            response = self.device.read(32)
-
-            print(f"\nRaw response for channel {ch}:", response.hex())
-
-            for i in range(len(response)):
-                if response[i] == 0xB1:
-                    end_index = response.find(b'\xB1', i + 1)
-                    if end_index != -1:
-                        frame = response[i:end_index + 1]
-                        print("Valid B1 Frame found:", frame.hex())
-
-                        frame_type = frame[1]
-                        mode = frame[2]
-                        current = frame[3]
-                        voltage = frame[4]
-
-                        def get_channel_info(start_index):
-                            ch = frame[start_index]
-                            ext = int.from_bytes(frame[start_index + 1:start_index + 3], 'big')
-                            print("\n")
-                            return ch, ext
-
-                        if frame_type == 0x09 and len(frame) == 17:  # 2-point
-                            ch_c, ext_c = get_channel_info(5)
-                            ch_w, ext_w = get_channel_info(8)
-                            print("2-point configuration:")
-                            print(f"Mode: 0x{mode:02X}, Current: 0x{current:02X}, Voltage: 0x{voltage:02X}")
-                            print(f"C: 0x{ch_c:02X} (ext: {ext_c}), W: 0x{ch_w:02X} (ext: {ext_w})")
-
-                        elif frame_type == 0x0C and len(frame) == 20:  # 3-point
-                            ch_c, ext_c = get_channel_info(5)
-                            ch_r, ext_r = get_channel_info(8)
-                            ch_w, ext_w = get_channel_info(11)
-                            print("3-point configuration:")
-                            print(f"Mode: 0x{mode:02X}, Current: 0x{current:02X}, Voltage: 0x{voltage:02X}")
-                            print(
-                                f"C: 0x{ch_c:02X} (ext: {ext_c}), R: 0x{ch_r:02X} (ext: {ext_r}), W: 0x{ch_w:02X} (ext: {ext_w})")
-
-                        elif frame_type == 0x0F and len(frame) == 23:  # 4-point
-                            ch_c, ext_c = get_channel_info(5)
-                            ch_r, ext_r = get_channel_info(8)
-                            ch_s, ext_s = get_channel_info(11)
-                            ch_w, ext_w = get_channel_info(14)
-                            print("4-point configuration:")
-                            print(f"Mode: 0x{mode:02X}, Current: 0x{current:02X}, Voltage: 0x{voltage:02X}")
-                            print(f"C: 0x{ch_c:02X} (ext: {ext_c}), R: 0x{ch_r:02X} (ext: {ext_r}), "
-                                  f"S: 0x{ch_s:02X} (ext: {ext_s}), W: 0x{ch_w:02X} (ext: {ext_w})")
-                        else:
-                            print("Unknown or unsupported frame format.")
-                        break
-            else:
-                print("No valid B1 frame found for this channel.")
-        print("\n")
+            response = self.query(channel_request(ch))
+            config = None if response is None else FrontendConfig.from_response(response)
+            if config is None:
+                log.warning("No valid B1 frame found for channel %d.", ch)
+                return None
+            log.info("Channel %d: %s", ch, config)
+            configs.append(config)
+        return tuple(configs)
+
+    def verify_shadow(self) -> bool:
+        """
+                Cross-checks the shadow of the frontend settings with the device readback.
+
+                The shadow is replaced by the readback, so a mismatch is repaired by the next
+                `set_fs_settings` call. The setup cannot be read back and is not checked.
 
-    def set_setup(self, start_frequency, end_frequency, count, scale, precision, amplitude, excitation_type):
+                Returns:
+                    bool: True if the shadow matched the device.
+                """
+        self._last_verified = time.time()
+        configs = self.get_fs_settings()
+        matched = configs is not None and configs == self.frontend
+        if not matched:
+            log.warning("Frontend shadow did not match the device, it was refreshed from the readback.")
+        self.frontend = configs
+        return matched
+
+    def set_setup(self, start_frequency, end_frequency, count, scale, precision, amplitude, excitation_type,
+                  force: bool = False):
         """
                 Configures the measurement setup parameters such as frequency range and signal characteristics.
 
@@ -299,80 +635,434 @@ class ISX3:
                     precision (float): Measurement precision.
                     amplitude (str): Signal amplitude.
                     excitation_type (str): Type of excitation, "voltage" or "current".
+                    force (bool): Sends the setup even if the device already holds it.
                 """
         self.print_msg = False
-        # resets the setup
-        self.device.write(bytearray([0x86, 0x01, 0x01, 0x86]))
-
-        self.frequency_points = count
+        self.apply_setup_config(setup_config(start_frequency, end_frequency, count, scale, precision,
+                                             amplitude, excitation_type), force)
 
-        frequency_data = input_user.check_frequency_range(start_frequency, end_frequency)[0] + input_user.check_frequency_range(start_frequency, end_frequency)[1]
-
-        settings_formatted = [0xB6, 0x16, 0x03]
-
-        for data in frequency_data:
-            settings_formatted.append(data)
-
-        for data in input_user.check_count(count):
-            settings_formatted.append(data)
-
-        settings_formatted.append(input_user.check_scale(scale))
-
-        for data in input_user.check_precision(precision):
-            settings_formatted.append(data)
+    def apply_setup_config(self, config: SetupConfig, force: bool = False) -> bool:
+        """
+                Sends a precomputed measurement setup, skipped if the device already holds it.
 
-        for data in input_user.check_amplitude(amplitude, excitation_type):
-            settings_formatted.append(data)
+                The device state is forgotten on every software reset, so the fast path
+                applies to back-to-back sweeps with `reset=False`.
 
-        settings_formatted.append(0xB6)
+                Args:
+                    config (SetupConfig): Setup created with `device_config.setup_config`.
+                    force (bool): Sends the setup even if the device already holds it.
 
-        self.write_command_string(bytearray(settings_formatted))
+                Returns:
+                    bool: True if the device holds the setup afterwards.
+                """
+        self.frequency_points = config.frequency_points
+        self.sweep_setup = config
+        if config == self.setup and not force:
+            log.debug("Setup unchanged, nothing sent.")
+            return True
+
+        with self._phase("configure"):
+            # resets the setup
+            self.write_command_string(bytearray([0x86, 0x01, 0x01, 0x86]))
+            self.write_command_string(config.frame)
+
+        acknowledged = self.last_message is not None and self.last_message.acknowledged
+        self.setup = config if acknowledged else None
+        log.info("Set the setup.")
+        return acknowledged
+
+    def frequency_axis(self):
+        """
+                Returns the frequency of every frequency ID of the current setup.
 
-        print("Set the setup. \n")
+                Returns:
+                    numpy.ndarray or None: Frequencies in Hz, None if no setup was applied.
+                """
+        if self.sweep_setup is None:
+            return None
+        return analysis.frequency_axis(self.sweep_setup)
 
-    def start_measurement(self, spectra: int = 20):
+    def start_measurement(self, spectra: int = 20, result_mode: str = "tuples",
+                          csv_path: str = "measurement_results.csv", reset: bool = True, writer=None,
+                          timeout: float = None, retries: int = 1):
         """
-                Starts a measurement process and writes results to a CSV file.
+                Starts a measurement process and writes results to a CSV file or a streaming result writer.
 
                 Args:
                     spectra (int): Number of repetitions for each frequency point.
+                    result_mode (str): "tuples" returns a list of (Frequency ID, Real, Imaginary) tuples,
+                    "array" returns a complex64 NumPy array of shape (spectra, frequency_points) that is
+                    decoded in one pass without per-frame Python objects. Missing values are NaN.
+                    csv_path (str): Path of the CSV file the results are written to.
+                    reset (bool): Resets the device after the measurement and waits until it is ready again.
+                    Back-to-back sweeps with the same setup can skip the reset.
+                    writer (ResultWriter or str): Writer, or output path passed to `open_writer`, that receives
+                    the results on a separate thread while they arrive. Replaces the CSV file at `csv_path`.
+                    A write error (e.g. a full disk) is raised once the measurement has stopped.
+                    timeout (float): Maximum time in seconds to wait for the data. If not given, it is derived
+                    from the estimated sweep duration of the applied setup, and reading stops early once no
+                    data has arrived for several frequency points. The outcome is kept in `last_status`.
+                    retries (int): Rounds of re-measuring only the missing or corrupt frequency points
+                    (see `remeasure_missing`), 0 returns the sweep as received.
 
                 Returns:
-                    list of tuple: List containing measurement results as (Frequency ID, Real, Imaginary).
+                    list of tuple or numpy.ndarray: Measurement results in the requested `result_mode`.
                 """
         if not self.device:
-            print("Device not connected.")
+            log.error("Device not connected.")
             return []
 
+        if result_mode not in ("tuples", "array"):
+            log.warning("Invalid result mode '%s', set it to 'tuples'.", result_mode)
+            result_mode = "tuples"
+
         spectra = input_user.check_input_spectra(spectra)
         expected_results = spectra * self.frequency_points
 
-        print(f"Starts the measuring for {spectra} Cycles...")
+        log.info("Starts the measuring for %d Cycles...", spectra)
+
+        setup = self.sweep_setup
+        estimated_duration = None if setup is None else estimate_sweep_duration(setup, spectra)
+        clock = sweep_clock(setup, spectra, timeout)
+
+        metrics = self.metrics
+        phase_start = time.perf_counter()
 
         #starts the measuring
-        self.device.write(bytearray([0xB8, 0x03, 0x01, 0x00, spectra, 0xB8]))
+        self.begin_measurement(spectra)
+
+        writer_thread = None
+        if writer is not None:
+            writer_thread = WriterThread(open_writer(writer) if isinstance(writer, str) else writer)
 
         # Reads the Data
-        results = self.read_measurement_data(expected_results=expected_results, timeout=10.0)
+        if result_mode == "array":
+            raw_frames = self.read_measurement_frames(expected_results=expected_results, timeout=clock.deadline,
+                                                      on_raw=writer_thread and writer_thread.submit_raw, clock=clock)
+            results = frames_to_array(raw_frames, spectra, self.frequency_points)
+        else:
+            results = self.read_measurement_data(expected_results=expected_results, timeout=clock.deadline,
+                                                 on_frames=writer_thread and writer_thread.submit, clock=clock)
+
+        status = SweepStatus(spectra, self.frequency_points, clock.reason or "complete", clock.elapsed,
+                             estimated_duration)
+        if result_mode == "array":
+            status.mark_array(results)
+        else:
+            status.mark(np.fromiter((row[0] for row in results), dtype=np.int64, count=len(results)))
+        self.last_status = status
 
-        # Stops the measuring
+        if metrics is not None:
+            metrics.observe("read_data_seconds", time.perf_counter() - phase_start)
+            phase_start = time.perf_counter()
+
+        # Stops the measuring, reads ACK or NACK
         self.stop_measurement()
-        self.system_message_callback_usb_fs()  # read ACK or NACK
 
+        if metrics is not None:
+            metrics.observe("stop_seconds", time.perf_counter() - phase_start)
+
+        # Fills the gaps by re-measuring only the missing frequency points
+        if retries > 0 and not status.complete and self.sweep_setup is not None:
+            data = results if result_mode == "array" else analysis.tuples_to_array(results, self.frequency_points,
+                                                                                   spectra)
+            gaps = np.isnan(data)
+            data = self.remeasure_missing(data, status, retries, timeout)
+            if writer_thread is not None:
+                # Recovered values are appended to the stream after the sweep
+                writer_thread.submit(analysis.array_to_tuples(np.where(gaps, data, np.nan)))
+            results = data if result_mode == "array" else analysis.array_to_tuples(data)
+        if not status.complete:
+            log.warning("Sweep incomplete: %s", status)
+
+        phase_start = time.perf_counter()
+
+        if writer_thread is not None:
+            writer_thread.close()
+            log.info("%d Measurement Results were written into %s.", writer_thread.frames_written,
+                     writer_thread.writer.path)
         # Write to CSV
-        with open("measurement_results.csv", mode="w", newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(["Frequency ID", "Real Part", "Imaginary Part"])
-            for row in results:
-                writer.writerow(row)
+        elif result_mode == "array":
+            freq_ids = np.tile(np.arange(self.frequency_points), spectra)
+            flat = results.ravel()
+            np.savetxt(csv_path, np.column_stack((freq_ids, flat.real, flat.imag)),
+                       fmt=("%d", "%.9g", "%.9g"), delimiter=",",
+                       header="Frequency ID,Real Part,Imaginary Part", comments="")
+            result_count = int(np.count_nonzero(~np.isnan(flat)))
+            log.info("%d Measurement Results were written into %s.", result_count, csv_path)
+        else:
+            with open(csv_path, mode="w", newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(["Frequency ID", "Real Part", "Imaginary Part"])
+                for row in results:
+                    writer.writerow(row)
+            result_count = len(results)
+            log.info("%d Measurement Results were written into %s.", result_count, csv_path)
+
+        if metrics is not None:
+            metrics.observe("export_seconds", time.perf_counter() - phase_start)
+            metrics.count("sweeps")
+
+        if reset:
+            self.software_reset()
+        return results
+
+    def start_measurement_async(self, spectra: int = 20, capacity: int = 65536, overflow: str = "block",
+                                reset: bool = True, timeout: float = None):
+        """
+                Starts a measurement on a background reader thread and returns immediately.
 
-        print(f"{len(results)} Measurement Results were written into measurement_results.csv.")
+                Decoded frames are collected in a bounded ring buffer, poll them with
+                `poll()` or `poll_spectra()` while the measurement runs. Can be used as
+                a context manager, leaving the block stops the thread.
 
-        self.software_reset()
-        time.sleep(6)
-        return results
+                Args:
+                    spectra (int): Number of repetitions for each frequency point.
+                    capacity (int): Ring buffer capacity in frames.
+                    overflow (str): "block" pauses reading while the buffer is full, "drop"
+                    discards new frames. Both cases are counted in `stats`.
+                    reset (bool): Resets the device after the measurement, see `start_measurement`.
+                    timeout (float): Deadline in seconds, derived from the sweep setup if not given.
+                    The thread also stops when the stream stalls, the cause is kept in `reason`.
 
-    def read_measurement_data(self, expected_results, timeout):
+                Returns:
+                    AcquisitionThread or None: The running acquisition, None if no device is connected.
+                """
+        if not self.device:
+            log.error("Device not connected.")
+            return None
+
+        spectra = input_user.check_input_spectra(spectra)
+        log.info("Starts the measuring for %d Cycles in the background...", spectra)
+        return AcquisitionThread(self, spectra, capacity, overflow, reset, timeout).start()
+
+    def capture_raw(self, path: str, spectra: int = 20, timeout: float = None, capacity: int = None,
+                    reset: bool = True):
+        """
+                Runs a measurement and captures the raw serial byte stream into a memory-mapped file.
+
+                Nothing is decoded while capturing. Decode the file later with
+                `raw_capture.replay` or `raw_capture.CaptureReader`.
+
+                Args:
+                    path (str): Capture file path, an existing file is replaced.
+                    spectra (int): Number of repetitions for each frequency point.
+                    timeout (float): Maximum time in seconds to wait for the data. If not given, it is derived
+                    from the estimated sweep duration of the applied setup, and capturing stops early once no
+                    data has arrived for several frequency points.
+                    capacity (int): Preallocated capture size in bytes, defaults to twice the expected data size.
+                    reset (bool): Resets the device after the measurement, see `start_measurement`.
+
+                Returns:
+                    int: Number of captured bytes.
+                """
+        if not self.device:
+            log.error("Device not connected.")
+            return 0
+
+        spectra = input_user.check_input_spectra(spectra)
+        expected_bytes = spectra * self.frequency_points * FRAME_SIZE
+        if capacity is None:
+            capacity = 2 * expected_bytes + self.read_chunk_size
+
+        log.info("Starts the raw capture for %d Cycles...", spectra)
+        clock = sweep_clock(self.sweep_setup, spectra, timeout)
+        with RawCapture(path, capacity) as capture:
+            self.begin_measurement(spectra)
+            while not clock.expired() and not capture.full:
+                chunk = self.read_available()
+                if chunk:
+                    capture.write(chunk)
+                    # The start acknowledgement alone does not start the stall detector
+                    if capture.position > FRAME_SIZE:
+                        clock.frames_received()
+                    else:
+                        clock.data_received()
+                elif capture.position >= expected_bytes:
+                    # All data has arrived once the line is quiet
+                    break
+
+            if clock.reason is not None:
+                log.warning("Raw capture stopped after %.2f s (%s).", clock.elapsed, clock.reason)
+
+            self.stop_measurement()
+            captured = capture.position
+            if capture.dropped_bytes:
+                log.warning("Capture file full, %d bytes were dropped.", capture.dropped_bytes)
+
+        log.info("%d bytes were captured into %s.", captured, path)
+        if reset:
+            self.software_reset()
+        return captured
+
+    def stream_spectra(self, callback=None, max_spectra: int = None, block_spectra: int = 65535,
+                       stall_timeout: float = 10.0, writer=None):
+        """
+                Streams spectra from one configured session without reconfiguring the device.
+
+                The device is started once with `block_spectra` cycles and restarted
+                transparently whenever that block is used up. No setup, reset or file I/O
+                happens between spectra.
+
+                Args:
+                    callback (callable): Called with every completed spectrum. If not given, the
+                    session is returned so it can be iterated as a generator.
+                    max_spectra (int): Stops after this many spectra, runs until stopped if not given.
+                    block_spectra (int): Spectra requested per start command (at most 65535).
+                    stall_timeout (float): Time in seconds without data after which a block is restarted.
+                    writer (ResultWriter or str): Writer, or output path passed to `open_writer`, that receives
+                    the frames of every delivered spectrum on a separate thread. It is closed when the session
+                    ends and raises the first write error there.
+
+                Returns:
+                    ContinuousSession or int or None: The session if no callback is given, otherwise the
+                    number of delivered spectra. None if no device is connected.
+                """
+        if not self.device:
+            log.error("Device not connected.")
+            return None
+
+        writer_thread = None
+        if writer is not None:
+            writer_thread = WriterThread(open_writer(writer) if isinstance(writer, str) else writer)
+
+        session = ContinuousSession(self, input_user.check_input_spectra(block_spectra), max_spectra,
+                                    stall_timeout, writer_thread)
+        if callback is None:
+            return session
+        return session.run(callback)
+
+    def sweep_combinations(self, combinations=None, spectra: int = 1, measurement_mode: int = 4,
+                           measurement_channel: str = "Extension Port", current_measurement_range: str = "autoranging",
+                           voltage_measurement_range: str = "1V", timeout: float = None, reset: bool = True):
+        """
+                Measures several electrode combinations selected through the extension port channel fields.
+
+                Args:
+                    combinations (list of tuple): Electrode per channel role, all adjacent combinations of
+                    `n_el` electrodes if not given (see `scheduler.electrode_combinations`).
+                    spectra (int): Number of spectra per combination.
+                    measurement_mode (int): Measurement mode (2, 3 or 4 points).
+                    measurement_channel (str): Port of the electrode multiplexer (e.g., "Extension Port").
+                    current_measurement_range (str): Current measurement range (e.g., "10mA").
+                    voltage_measurement_range (str): Voltage measurement range (e.g., "1V").
+                    timeout (float): Deadline in seconds for the data of one combination, derived from
+                    the measurement setup if not given.
+                    reset (bool): Resets the device once after the last combination.
+
+                Returns:
+                    dict: Electrode combination mapped to a complex64 array of shape (spectra, frequency_points).
+                """
+        if not self.device:
+            log.error("Device not connected.")
+            return {}
+
+        scheduler = SweepScheduler(self, combinations, measurement_mode, measurement_channel,
+                                   current_measurement_range, voltage_measurement_range)
+        return scheduler.run(spectra, timeout, reset)
+
+    def eit(self, injection: str = "adjacent", measurement_channel: str = "Extension Port",
+            current_measurement_range: str = "autoranging", voltage_measurement_range: str = "1V",
+            stack_size: int = 1):
+        """
+                Prepares EIT frame acquisition over the injection-measurement pattern of `n_el` electrodes.
+
+                Args:
+                    injection (str): "adjacent" or "opposite" injection, see `eit.eit_pattern`.
+                    measurement_channel (str): Port of the electrode multiplexer (e.g., "Extension Port").
+                    current_measurement_range (str): Current measurement range (e.g., "10mA").
+                    voltage_measurement_range (str): Voltage measurement range (e.g., "1V").
+                    stack_size (int): Measurements per frontend channel stack, the whole pattern if None.
+                    Stacking assumes a channel order that is not confirmed on hardware, see `SweepScheduler`.
+
+                Returns:
+                    EITAcquisition or None: Call `acquire(frames)` or iterate `iter_frames()`, the achieved
+                    rate is reported in `frames_per_second`. None if no device is connected.
+                """
+        if not self.device:
+            log.error("Device not connected.")
+            return None
+        return EITAcquisition(self, injection, measurement_channel, current_measurement_range,
+                              voltage_measurement_range, stack_size)
+
+    def remeasure_missing(self, data, status: SweepStatus = None, attempts: int = 1, timeout: float = None):
+        """
+                Re-measures the missing slots of a sweep and fills them in.
+
+                Every contiguous run of missing frequency IDs is measured with a setup covering
+                only that run (see `SetupConfig.sub_range`), for as many spectra as the run lacks
+                at most. The original setup is applied again afterwards.
+
+                Args:
+                    data (numpy.ndarray): Complex array of shape (spectra, frequency_points) measured with the
+                    current setup, missing or corrupt values are NaN.
+                    status (SweepStatus): Completion status of the sweep, updated in place. Derived from the
+                    NaN slots of `data` if not given.
+                    attempts (int): Maximum number of re-measurement rounds.
+                    timeout (float): Maximum time in seconds per sub-range, derived from its setup if not given.
+
+                Returns:
+                    numpy.ndarray: Copy of `data` with the recovered values filled in.
+                """
+        data = np.array(data, dtype=np.complex64)
+        if status is None:
+            status = SweepStatus(data.shape[0], data.shape[1], "complete", 0.0)
+            status.mark_array(data)
+        # Slots without a valid value count as missing
+        status.received &= ~np.isnan(data)
+
+        setup = self.sweep_setup
+        if not self.device or setup is None:
+            return data
+
+        recovered = status.recovered
+        with self._phase("recover"):
+            for _ in range(attempts):
+                ranges = status.missing_ranges
+                if not ranges:
+                    break
+                for first, last in ranges:
+                    missing = ~status.received[:, first:last + 1]
+                    spectra = int(missing.sum(axis=0).max())
+                    sub = setup.sub_range(first, last)
+                    if not self.apply_setup_config(sub):
+                        log.warning("Setup for frequency IDs %d-%d was not acknowledged.", first, last)
+                        continue
+
+                    clock = sweep_clock(sub, spectra, timeout)
+                    self.begin_measurement(spectra)
+                    raw_frames = self.read_measurement_frames(spectra * sub.frequency_points, clock.deadline,
+                                                              clock=clock)
+                    self.stop_measurement()
+                    values = frames_to_array(raw_frames, spectra, sub.frequency_points)
+
+                    # The k-th missing slot of a frequency point takes its k-th re-measured value
+                    rows, columns = np.nonzero(missing)
+                    filled = values[np.cumsum(missing, axis=0)[rows, columns] - 1, columns]
+                    valid = ~np.isnan(filled)
+                    data[rows[valid], first + columns[valid]] = filled[valid]
+                    status.received[rows[valid], first + columns[valid]] = True
+                    status.recovered += int(valid.sum())
+
+            self.apply_setup_config(setup)
+
+        log.info("%d missing results recovered, %d still missing.", status.recovered - recovered,
+                 status.expected_results - status.received_results)
+        return data
+
+    def begin_measurement(self, spectra: int):
+        """
+                Sends the start frame for a measurement of `spectra` cycles.
+
+                Args:
+                    spectra (int): Validated number of spectra (1-65535), sent as a 16-bit big-endian value.
+
+                Returns:
+                    None
+                """
+        self.device.write(bytearray([0xB8, 0x03, 0x01, *spectra.to_bytes(2, "big"), 0xB8]))
+
+    def read_measurement_data(self, expected_results, timeout, on_frames=None, clock: SweepClock = None):
         """
                 Reads measurement data frames from the serial port.
 
@@ -384,39 +1074,168 @@ class ISX3:
                     returns the data collected up to that point. This prevents indefinite blocking in case of connection
                     issues or incomplete data transmission
 
+                    on_frames (callable): Called with every list of newly decoded frames, e.g. `WriterThread.submit`.
+
+                    clock (SweepClock): Deadline and stall detector to use instead of `timeout`, its `reason`
+                    tells why reading stopped early.
+
                 Returns:
                     list of tuple: Parsed measurement data (Frequency ID, Real, Imaginary).
                 """
-        start = time.time()
+        clock = clock or SweepClock(timeout)
         results = []
-        buffer = []
-
-        while time.time() - start < timeout and len(results) < expected_results:
-            byte = self.device.read(1)
-            if byte:
-                buffer.append(byte[0])
-
-                if len(buffer) >= 13:
-                    if buffer[-13] == 0xB8 and buffer[-12] == 0x0A and buffer[-1] == 0xB8:
-                        frame = buffer[-13:]
-                        freq_id = int.from_bytes(frame[2:4], "big")
-                        real = struct.unpack(">f", bytes(frame[4:8]))[0]
-                        imag = struct.unpack(">f", bytes(frame[8:12]))[0]
-                        results.append((freq_id, real, imag))
-                        buffer.clear()
+        decoder = FrameDecoder(self.frequency_points)
+        metrics = self.metrics
+
+        while len(results) < expected_results and not clock.expired():
+            chunk = self.read_available(clock.remaining())
+            if chunk:
+                clock.data_received()
+            elif not decoder.pending:
+                continue
+
+            # A quiet line confirms a frame held back at the end of the data
+            if metrics is None:
+                frames = decoder.feed(chunk, flush=not chunk)
+            else:
+                decode_start = time.perf_counter()
+                frames = decoder.feed(chunk, flush=not chunk)
+                metrics.observe("decode_seconds", time.perf_counter() - decode_start)
+            if frames:
+                clock.frames_received()
+                results.extend(frames)
+                if on_frames is not None:
+                    on_frames(frames)
+        self.record_decoder(decoder)
         return results
 
-    def software_reset(self):
+    def read_measurement_frames(self, expected_results, timeout, on_raw=None, clock: SweepClock = None):
         """
-                Sends a software reset command to the device.
+                Reads measurement data frames from the serial port without decoding them.
+
+                Args:
+                    expected_results (int): Expected number of measurement results.
+                    timeout (float): The maximum time in seconds to wait for measurement data from the device.
+                    on_raw (callable): Called with the raw bytes of every batch of new frames,
+                    e.g. `WriterThread.submit_raw`.
+                    clock (SweepClock): Deadline and stall detector to use instead of `timeout`.
 
                 Returns:
-                    None
+                    bytearray: Concatenated raw 13-byte frames, to be decoded with `frames_to_array`.
                 """
-        self.print_msg = True
-        self.write_command_string(bytearray([0xA1, 0x00, 0xA1]))
-        self.print_msg = False
+        clock = clock or SweepClock(timeout)
+        raw_frames = bytearray()
+        received = 0
+        decoder = FrameDecoder(self.frequency_points)
+
+        metrics = self.metrics
+
+        while received < expected_results and not clock.expired():
+            chunk = self.read_available(clock.remaining())
+            if chunk:
+                clock.data_received()
+            elif not decoder.pending:
+                continue
 
+            # A quiet line confirms a frame held back at the end of the data
+            before = len(raw_frames)
+            if metrics is None:
+                received += decoder.feed_raw(chunk, raw_frames, flush=not chunk)
+            else:
+                decode_start = time.perf_counter()
+                received += decoder.feed_raw(chunk, raw_frames, flush=not chunk)
+                metrics.observe("decode_seconds", time.perf_counter() - decode_start)
+            if len(raw_frames) > before:
+                clock.frames_received()
+                if on_raw is not None:
+                    on_raw(raw_frames[before:])
+        self.record_decoder(decoder)
+        return raw_frames
+
+    def read_available(self, max_wait: float = None):
+        """
+                Reads every byte currently waiting in the serial input buffer.
+
+                Blocks for at most the serial timeout when nothing is waiting, so callers
+                can poll without spinning.
+
+                Args:
+                    max_wait (float): Shorter upper bound in seconds for the blocking wait.
+
+                Returns:
+                    bytes: Received bytes, empty if the read timed out.
+                """
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+            data = self._read_available(max_wait)
+            metrics.observe("read_blocked_seconds", time.perf_counter() - start)
+            metrics.count("bytes_read", len(data))
+            if not data:
+                metrics.count("read_timeouts")
+            return data
+        return self._read_available(max_wait)
+
+    def _read_available(self, max_wait: float = None):
+        device = self.device
+        waiting = device.in_waiting
+        serial_timeout = device.timeout
+        if waiting or max_wait is None or (serial_timeout is not None and serial_timeout <= max_wait):
+            return device.read(min(max(waiting, 1), self.read_chunk_size))
+
+        # Waits shorter than the port timeout poll the input buffer, changing the timeout
+        # would reconfigure the port (tcsetattr/SetCommTimeouts) on every read
+        deadline = time.time() + max_wait
+        while not waiting:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return b""
+            time.sleep(min(READ_POLL_INTERVAL, remaining))
+            waiting = device.in_waiting
+        return device.read(min(waiting, self.read_chunk_size))
+
+    def software_reset(self, wait_ready: bool = True, timeout: float = 6.0):
+        """
+                Sends a software reset command to the device.
+
+                Args:
+                    wait_ready (bool): Waits for the system-ready (0x84) message that follows the
+                    wake-up (0x04) message instead of returning right after the acknowledgement.
+                    timeout (float): Maximum time in seconds to wait for the device to become ready.
+
+                Returns:
+                    bool: True if the device acknowledged the reset and, if requested, reported readiness.
+                """
+        with self._phase("reset"):
+            return self._software_reset(wait_ready, timeout)
+
+    def _software_reset(self, wait_ready: bool, timeout: float):
+        # The reset discards the configuration held by the device
+        self.setup = None
+        self.frontend = None
+        if not wait_ready:
+            self.print_msg = True
+            self.write_command_string(bytearray([0xA1, 0x00, 0xA1]))
+            self.print_msg = False
+            return True
+
+        # The acknowledgement and the ready messages can arrive in the same read,
+        # so all of them are taken from one message stream. The wake-up message is
+        # followed by the system-ready message, which has to be consumed here, otherwise
+        # the next command would take it as its answer.
+        self.device.write(bytearray([0xA1, 0x00, 0xA1]))
+        received = []
+        code = self.wait_for_system_message((SYSTEM_READY_MESSAGE,) + NACK_MESSAGES, timeout, received)
+        if code is None:
+            if WAKE_UP_MESSAGE in received:
+                log.warning("Device woke up but sent no system-ready message within %s s after the reset.",
+                            timeout)
+                return True
+            log.warning("Device did not report readiness within %s s after the reset.", timeout)
+            return False
+
+        log.info("%s", MSG_DICT[code])
+        return code in READY_MESSAGES
 
     def stop_measurement(self):
         """
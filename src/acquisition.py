@@ -0,0 +1,402 @@
+import threading
+import time
+
+from frame_decoder import FrameDecoder
+from isx3_logging import get_logger
+from sweep_timing import sweep_clock
+
+log = get_logger(__name__)
+
+
+class FrameRingBuffer:
+
+    def __init__(self, capacity: int = 65536, overflow: str = "block") -> None:
+        """
+        Bounded single-producer/single-consumer ring buffer of decoded frames.
+
+        The producer only advances `_write_index` and the consumer only advances
+        `_read_index`, so no lock is needed as long as exactly one thread writes
+        and one thread reads.
+
+        Args:
+            capacity (int): Maximum number of buffered frames.
+            overflow (str): "block" makes the producer wait for free space and counts
+            each wait as a backpressure event, "drop" discards the new frame and
+            counts it as an overrun.
+        """
+        if overflow not in ("block", "drop"):
+            log.warning("Invalid overflow policy '%s', set it to 'block'.", overflow)
+            overflow = "block"
+        self.capacity = capacity
+        self.overflow = overflow
+        self._slots = [None] * capacity
+        self._write_index = 0
+        self._read_index = 0
+        self.backpressure_events = 0
+        self.overruns = 0
+        self.high_watermark = 0
+
+    def __len__(self) -> int:
+        return self._write_index - self._read_index
+
+    def push(self, frame, stop_event=None) -> bool:
+        """
+        Appends one frame, applying the overflow policy when the buffer is full.
+
+        Args:
+            frame (tuple): Decoded frame (Frequency ID, Real, Imaginary).
+            stop_event (threading.Event): Aborts a blocking wait when set.
+
+        Returns:
+            bool: True if the frame was stored, False if it was dropped or the wait was aborted.
+        """
+        if self._write_index - self._read_index >= self.capacity:
+            if self.overflow == "drop":
+                self.overruns += 1
+                return False
+            else:
+                self.backpressure_events += 1
+                while self._write_index - self._read_index >= self.capacity:
+                    if stop_event is not None and stop_event.is_set():
+                        return False
+                    time.sleep(0.001)
+
+        self._slots[self._write_index % self.capacity] = frame
+        self._write_index += 1
+        self.high_watermark = max(self.high_watermark, self._write_index - self._read_index)
+        return True
+
+    def pop_all(self, max_items: int = None) -> list:
+        """
+        Removes and returns the buffered frames in arrival order.
+
+        Args:
+            max_items (int): Upper bound for the number of returned frames.
+
+        Returns:
+            list of tuple: Decoded frames (Frequency ID, Real, Imaginary).
+        """
+        start = self._read_index
+        stop = self._write_index
+        if max_items is not None:
+            stop = min(stop, start + max_items)
+
+        frames = [self._slots[i % self.capacity] for i in range(start, stop)]
+        self._read_index = stop
+        return frames
+
+
+class SpectrumAssembler:
+
+    def __init__(self, frequency_points: int) -> None:
+        """
+        Groups consecutive frames into spectra.
+
+        A spectrum is complete once `frequency_points` frames have arrived or the
+        frequency ID wraps around, so a dropped frame only shortens one spectrum.
+
+        Args:
+            frequency_points (int): Number of frequency points per spectrum.
+        """
+        self.frequency_points = frequency_points
+        self._pending = []
+
+    def add(self, frames) -> list:
+        """
+        Adds frames in arrival order.
+
+        Args:
+            frames (list of tuple): Decoded frames (Frequency ID, Real, Imaginary).
+
+        Returns:
+            list of list of tuple: Spectra completed by these frames.
+        """
+        spectra = []
+        pending = self._pending
+        for frame in frames:
+            if pending and frame[0] <= pending[-1][0]:
+                spectra.append(pending)
+                pending = []
+            pending.append(frame)
+            if len(pending) == self.frequency_points:
+                spectra.append(pending)
+                pending = []
+        self._pending = pending
+        return spectra
+
+    def flush(self) -> list:
+        """
+        Returns the trailing incomplete spectrum, if any.
+
+        Returns:
+            list of list of tuple: Zero or one incomplete spectrum.
+        """
+        pending = self._pending
+        self._pending = []
+        return [pending] if pending else []
+
+
+class AcquisitionThread:
+
+    def __init__(self, isx3, spectra: int, capacity: int = 65536, overflow: str = "block",
+                 reset: bool = True, timeout: float = None) -> None:
+        """
+        Runs one measurement on a dedicated reader thread.
+
+        The thread starts the measurement, drains the serial port into a
+        FrameRingBuffer and stops the device once all frames have arrived, the
+        sweep deadline has passed or the stream stalled, like `ISX3.start_measurement`.
+        The ISX3 handler must not be used by other threads while it runs.
+
+        Args:
+            isx3 (ISX3): Connected and configured device handler.
+            spectra (int): Number of spectra to measure.
+            capacity (int): Ring buffer capacity in frames.
+            overflow (str): Ring buffer overflow policy, "block" or "drop".
+            reset (bool): Resets the device after the measurement and waits until it is ready again.
+            timeout (float): Deadline in seconds, derived from the sweep setup if not given.
+        """
+        self.isx3 = isx3
+        self.spectra = spectra
+        self.reset = reset
+        self.timeout = timeout
+        self.frequency_points = isx3.frequency_points
+        self.expected_results = spectra * isx3.frequency_points
+        self.buffer = FrameRingBuffer(capacity, overflow)
+        self.decoder = FrameDecoder(isx3.frequency_points)
+        self.frames_received = 0
+        self.error = None
+        # Why reading stopped: "complete", "timeout", "stall" or "stopped", None while running
+        self.reason = None
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ISX3-acquisition", daemon=True)
+        self._assembler = SpectrumAssembler(self.frequency_points)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """
+        Starts the reader thread, does nothing if it was already started.
+
+        Returns:
+            AcquisitionThread: self, to allow chaining.
+        """
+        if self._thread.ident is None:
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        """
+        Asks the reader thread to stop and waits for it to finish.
+
+        Args:
+            timeout (float): Maximum time in seconds to wait for the thread.
+
+        Returns:
+            None
+        """
+        self._stop_event.set()
+        self._thread.join(timeout)
+
+    def join(self, timeout: float = None) -> bool:
+        """
+        Waits until the measurement has finished.
+
+        Args:
+            timeout (float): Maximum time in seconds to wait.
+
+        Returns:
+            bool: True if the thread has finished.
+        """
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    @property
+    def stats(self) -> dict:
+        """
+        Counters describing the state of the acquisition.
+        """
+        return {
+            "frames_received": self.frames_received,
+            "expected_results": self.expected_results,
+            "reason": self.reason,
+            "buffered": len(self.buffer),
+            "high_watermark": self.buffer.high_watermark,
+            "backpressure_events": self.buffer.backpressure_events,
+            "overruns": self.buffer.overruns,
+            "skipped_bytes": self.decoder.skipped_bytes,
+            "resync_count": self.decoder.resync_count,
+            "rejected_frames": self.decoder.rejected_frames,
+            "sequence_gaps": self.decoder.sequence_gaps,
+        }
+
+    def poll(self, max_items: int = None) -> list:
+        """
+        Returns the frames that arrived since the last call without blocking.
+
+        Args:
+            max_items (int): Upper bound for the number of returned frames.
+
+        Returns:
+            list of tuple: Decoded frames (Frequency ID, Real, Imaginary).
+        """
+        return self.buffer.pop_all(max_items)
+
+    def poll_spectra(self) -> list:
+        """
+        Returns the spectra completed since the last call without blocking.
+
+        After the thread has finished, a trailing incomplete spectrum is returned as well.
+
+        Returns:
+            list of list of tuple: One list of frames per completed spectrum.
+        """
+        finished = not self.running
+        spectra = self._assembler.add(self.buffer.pop_all())
+        if finished and not len(self.buffer):
+            spectra += self._assembler.flush()
+        return spectra
+
+    def _run(self):
+        isx3 = self.isx3
+        try:
+            clock = sweep_clock(isx3.sweep_setup, self.spectra, self.timeout)
+            isx3.begin_measurement(self.spectra)
+            while (not self._stop_event.is_set() and self.frames_received < self.expected_results
+                   and not clock.expired()):
+                chunk = isx3.read_available(clock.remaining())
+                if chunk:
+                    clock.data_received()
+                elif not self.decoder.pending:
+                    continue
+                # A quiet line confirms a frame held back at the end of the data
+                frames = self.decoder.feed(chunk, flush=not chunk)
+                if frames:
+                    clock.frames_received()
+                for frame in frames:
+                    self.frames_received += 1
+                    self.buffer.push(frame, self._stop_event)
+
+            if clock.reason is not None:
+                self.reason = clock.reason
+                log.warning("Measurement ended with %d of %d results (%s).", self.frames_received,
+                            self.expected_results, clock.reason)
+            else:
+                self.reason = "stopped" if self._stop_event.is_set() else "complete"
+            isx3.record_decoder(self.decoder)
+            isx3.stop_measurement()  # reads ACK or NACK
+            if self.reset:
+                isx3.software_reset()
+        except Exception as e:
+            self.error = e
+            log.error("Error in acquisition thread: %s", e)
+
+
+class ContinuousSession:
+
+    def __init__(self, isx3, block_spectra: int = 65535, max_spectra: int = None,
+                 stall_timeout: float = 10.0, writer_thread=None) -> None:
+        """
+        Streams spectra indefinitely from an already configured device.
+
+        The device counts at most 65535 spectra per start command, so the session
+        sends a new start frame whenever a block is used up. Iterate over the
+        session to receive spectra, or pass a callback to `run`.
+
+        Args:
+            isx3 (ISX3): Connected and configured device handler.
+            block_spectra (int): Spectra requested per start command.
+            max_spectra (int): Stops after this many spectra, runs until stopped if not given.
+            stall_timeout (float): Time in seconds without data after which the block is restarted.
+            writer_thread (WriterThread): Receives the frames of every delivered spectrum and is closed when
+            the session ends, a writer error is raised from there.
+        """
+        self.isx3 = isx3
+        self.block_spectra = block_spectra
+        self.max_spectra = max_spectra
+        self.stall_timeout = stall_timeout
+        self.writer_thread = writer_thread
+        self.decoder = FrameDecoder(isx3.frequency_points)
+        self.spectra_delivered = 0
+        self.blocks_started = 0
+        self.stalls = 0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """
+        Ends the session after the current read, may be called from another thread.
+
+        Returns:
+            None
+        """
+        self._stop_event.set()
+
+    def run(self, callback) -> int:
+        """
+        Hands every completed spectrum to `callback` until the session ends.
+
+        Args:
+            callback (callable): Called with one list of (Frequency ID, Real, Imaginary) frames per spectrum.
+
+        Returns:
+            int: Number of delivered spectra.
+        """
+        for spectrum in self:
+            callback(spectrum)
+        return self.spectra_delivered
+
+    def __iter__(self):
+        isx3 = self.isx3
+        assembler = SpectrumAssembler(isx3.frequency_points)
+        block_results = self.block_spectra * isx3.frequency_points
+        remaining = 0
+        last_data = time.time()
+
+        try:
+            while not self._stop_event.is_set():
+                if self.max_spectra is not None and self.spectra_delivered >= self.max_spectra:
+                    break
+
+                if remaining <= 0:
+                    isx3.begin_measurement(self.block_spectra)
+                    self.blocks_started += 1
+                    remaining = block_results
+                    last_data = time.time()
+
+                chunk = isx3.read_available()
+                if chunk:
+                    last_data = time.time()
+                else:
+                    if time.time() - last_data > self.stall_timeout:
+                        # Frames were lost and the device finished the block early
+                        log.warning("No data for %s s, restarting the measurement block.", self.stall_timeout)
+                        self.stalls += 1
+                        remaining = 0
+                    if not self.decoder.pending:
+                        continue
+
+                # A quiet line confirms a frame held back at the end of the data
+                frames = self.decoder.feed(chunk, flush=not chunk)
+                remaining -= len(frames)
+                for spectrum in assembler.add(frames):
+                    self.spectra_delivered += 1
+                    # Only delivered spectra are written, frames beyond `max_spectra` are dropped
+                    if self.writer_thread is not None:
+                        self.writer_thread.submit(spectrum)
+                    yield spectrum
+                    if self.max_spectra is not None and self.spectra_delivered >= self.max_spectra:
+                        break
+        finally:
+            isx3.record_decoder(self.decoder)
+            isx3.stop_measurement()  # reads ACK or NACK
+            if self.writer_thread is not None:
+                self.writer_thread.close()
@@ -0,0 +1,159 @@
+import numpy as np
+
+# Scale factor that makes the median absolute deviation comparable to a standard deviation
+MAD_SCALE = 1.4826
+
+
+def frequency_axis(setup) -> np.ndarray:
+    """
+    Rebuilds the frequency of every frequency ID from a measurement setup.
+
+    Args:
+        setup (SetupConfig): The setup the measurement ran with, e.g. `ISX3.sweep_setup`.
+
+    Returns:
+        numpy.ndarray: float64 frequencies in Hz, indexed by frequency ID.
+    """
+    start, end, count = setup.start_frequency, setup.end_frequency, setup.frequency_points
+    if count == 1:
+        return np.array([start], dtype=np.float64)
+    if setup.log_scale:
+        return np.geomspace(start, end, count)
+    return np.linspace(start, end, count)
+
+
+def magnitude(z) -> np.ndarray:
+    """
+    Impedance magnitude |Z| of every value.
+
+    Args:
+        z (numpy.ndarray): Complex impedances, e.g. of shape (spectra, frequency_points).
+
+    Returns:
+        numpy.ndarray: |Z| in the shape of `z`.
+    """
+    return np.abs(z)
+
+
+def phase(z, degrees: bool = True) -> np.ndarray:
+    """
+    Impedance phase of every value.
+
+    Args:
+        z (numpy.ndarray): Complex impedances.
+        degrees (bool): Returns degrees instead of radians.
+
+    Returns:
+        numpy.ndarray: Phase angles in the shape of `z`.
+    """
+    return np.angle(z, deg=degrees)
+
+
+def reject_outliers(z, threshold: float = 3.5) -> np.ndarray:
+    """
+    Replaces outlying spectra values with NaN, separately for every frequency point.
+
+    A value is an outlier if the magnitude of its distance to the complex median of
+    its frequency point exceeds `threshold` robust standard deviations (median
+    absolute deviation scaled by MAD_SCALE). Existing NaN values are ignored.
+
+    Args:
+        z (numpy.ndarray): Complex impedances of shape (spectra, frequency_points).
+        threshold (float): Allowed distance in robust standard deviations.
+
+    Returns:
+        numpy.ndarray: Copy of `z` with the outliers set to NaN.
+    """
+    z = np.array(z, copy=True)
+    median = np.nanmedian(z.real, axis=0) + 1j * np.nanmedian(z.imag, axis=0)
+    distance = np.abs(z - median)
+    spread = MAD_SCALE * np.nanmedian(distance, axis=0)
+    with np.errstate(invalid="ignore"):
+        outliers = distance > threshold * np.where(spread > 0, spread, np.inf)
+    z[outliers] = np.nan
+    return z
+
+
+def summarize(z, setup=None, threshold: float = None) -> dict:
+    """
+    Computes per-frequency statistics across all spectra in one vectorized pass.
+
+    Args:
+        z (numpy.ndarray): Complex impedances of shape (spectra, frequency_points), missing values are NaN.
+        setup (SetupConfig): The setup of the measurement, adds the frequency axis if given.
+        threshold (float): Rejects outliers with `reject_outliers` first if given.
+
+    Returns:
+        dict: "mean" (complex), "std" (of the complex values), "magnitude_mean", "magnitude_std",
+        "phase_mean", "phase_std" (degrees), "count" (valid spectra) per frequency point and,
+        with a setup, "frequency" in Hz.
+    """
+    z = np.asarray(z)
+    if threshold is not None:
+        z = reject_outliers(z, threshold)
+
+    count = (~np.isnan(z)).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean, std = _mean_std(z, count)
+        magnitude_mean, magnitude_std = _mean_std(magnitude(z), count)
+        phase_mean, phase_std = _mean_std(phase(z), count)
+    summary = {
+        "mean": mean,
+        "std": std,
+        "magnitude_mean": magnitude_mean,
+        "magnitude_std": magnitude_std,
+        "phase_mean": phase_mean,
+        "phase_std": phase_std,
+        "count": count,
+    }
+    if setup is not None:
+        summary["frequency"] = frequency_axis(setup)
+    return summary
+
+
+def _mean_std(values, count):
+    mean = np.nansum(values, axis=0) / count
+    std = np.sqrt(np.nansum(np.abs(values - mean) ** 2, axis=0) / count)
+    return mean, std
+
+
+def tuples_to_array(results, frequency_points: int, spectra: int = None) -> np.ndarray:
+    """
+    Converts the (Frequency ID, Real, Imaginary) tuples of `start_measurement` into a complex array.
+
+    A new spectrum starts whenever the frequency ID does not increase.
+
+    Args:
+        results (list of tuple): Measurement results in arrival order.
+        frequency_points (int): Number of frequency points per spectrum.
+        spectra (int): Number of rows, derived from the data if not given.
+
+    Returns:
+        numpy.ndarray: complex64 array of shape (spectra, frequency_points), missing values are NaN.
+    """
+    if not len(results):
+        return np.full((spectra or 0, frequency_points), np.nan, dtype=np.complex64)
+    columns = np.asarray(results, dtype=np.float64)
+    freq_id = columns[:, 0].astype(np.int64)
+    rows = np.concatenate(([0], np.cumsum(np.diff(freq_id) <= 0)))
+    if spectra is None:
+        spectra = int(rows[-1]) + 1
+    keep = (rows < spectra) & (freq_id >= 0) & (freq_id < frequency_points)
+    data = np.full((spectra, frequency_points), np.nan, dtype=np.complex64)
+    data[rows[keep], freq_id[keep]] = columns[keep, 1] + 1j * columns[keep, 2]
+    return data
+
+
+def array_to_tuples(data) -> list:
+    """
+    Converts a complex (spectra, frequency_points) array back into (Frequency ID, Real, Imaginary) tuples.
+
+    Args:
+        data (numpy.ndarray): Complex impedances, missing values are NaN and skipped.
+
+    Returns:
+        list of tuple: Results spectrum by spectrum in frequency ID order.
+    """
+    rows, freq_ids = np.nonzero(~np.isnan(data))
+    values = data[rows, freq_ids]
+    return list(zip(freq_ids.tolist(), values.real.tolist(), values.imag.tolist()))
@@ -0,0 +1,405 @@
+import asyncio
+import re
+
+import check_User_Input as input_user
+from device_config import CHANNEL_COUNT_REQUEST, FrontendConfig, channel_request, setup_config
+from frame_decoder import FRAME_START, FRAME_LENGTH, PAYLOAD_STRUCT
+from ISX3 import (MSG_DICT, NACK_MESSAGES, NO_MESSAGE, READY_MESSAGES, SYSTEM_READY_MESSAGE, UNSOLICITED_MESSAGES,
+                  WAKE_UP_MESSAGE, build_fs_settings_command)
+from isx3_logging import get_logger
+
+log = get_logger(__name__)
+
+SYSTEM_MESSAGE = 0x18
+# Readback responses (0xB1) are the only other frames the device sends
+RESPONSE_COMMANDS = (0xB1,)
+# The longest readback is the 15 data bytes of a 4-point channel setting
+MAX_RESPONSE_LENGTH = 0x0F
+# Expected length byte of the fixed-size frames
+FRAME_LENGTHS = {SYSTEM_MESSAGE: 0x01, FRAME_START: FRAME_LENGTH}
+FRAME_STARTS = re.compile(b"[" + re.escape(bytes([SYSTEM_MESSAGE, FRAME_START, *RESPONSE_COMMANDS])) + b"]")
+
+
+class ISX3Protocol(asyncio.Protocol):
+
+    def __init__(self) -> None:
+        """
+        asyncio protocol that splits the ISX3 byte stream into frames.
+
+        Every frame has the form [command, length, data..., command]. System
+        messages (0x18) and measurement frames (0xB8) are routed to their own
+        queues, readback responses (0xB1) to the response queue. Bytes that do not
+        start a known frame, or a candidate with a wrong length or end byte, are
+        skipped, so a stray byte does not hold back the frames behind it.
+        """
+        self.transport = None
+        self.messages = asyncio.Queue()
+        self.frames = asyncio.Queue()
+        self.responses = asyncio.Queue()
+        self.closed = asyncio.get_event_loop().create_future()
+        self.skipped_bytes = 0
+        self._buffer = bytearray()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        if not self.closed.done():
+            self.closed.set_result(exc)
+
+    def data_received(self, data):
+        buffer = self._buffer
+        buffer += data
+        end = len(buffer)
+        pos = 0
+
+        while pos < end:
+            match = FRAME_STARTS.search(buffer, pos)
+            if match is None:
+                self.skipped_bytes += end - pos
+                pos = end
+                break
+            self.skipped_bytes += match.start() - pos
+            pos = match.start()
+            if pos + 2 > end:
+                break
+
+            command = buffer[pos]
+            expected_length = FRAME_LENGTHS.get(command)
+            length = buffer[pos + 1]
+            if expected_length is None:
+                valid_length = length <= MAX_RESPONSE_LENGTH
+            else:
+                valid_length = length == expected_length
+            if not valid_length:
+                self.skipped_bytes += 1
+                pos += 1
+                continue
+            frame_end = pos + length + 3
+            if frame_end > end:
+                break
+            if buffer[frame_end - 1] != command:
+                self.skipped_bytes += 1
+                pos += 1
+                continue
+
+            if command == SYSTEM_MESSAGE:
+                self.messages.put_nowait(buffer[pos + 2])
+            elif command == FRAME_START:
+                self.frames.put_nowait(PAYLOAD_STRUCT.unpack_from(buffer, pos + 2))
+            else:
+                self.responses.put_nowait(bytes(buffer[pos:frame_end]))
+            pos = frame_end
+
+        del buffer[:pos]
+
+
+class AsyncISX3:
+
+    def __init__(self, n_el: int, command_timeout: float = 1.0) -> None:
+        """
+        asyncio counterpart of the ISX3 device handler.
+
+        All device I/O runs on the event loop, so one loop can drive many
+        devices concurrently without a thread per device.
+
+        Args:
+            n_el (int): Number of electrodes used in the measurement setup.
+            command_timeout (float): Time in seconds to wait for a command acknowledgement.
+        """
+        self.n_el = n_el
+        self.command_timeout = command_timeout
+        self.frequency_points = 0
+        self.print_msg = True
+        self.name = None
+        self.transport = None
+        self.protocol = None
+        self._command_lock = None
+        # Number of the latest measurement started by iter_frames, and if it still runs
+        self._measurement = 0
+        self._measuring = False
+
+    async def connect(self, port: str, baudrate: int = 9600):
+        """
+        Opens the serial port on the running event loop.
+
+        Requires the `pyserial-asyncio` package.
+
+        Args:
+            port (str): COM port to connect to (e.g., "COM3").
+            baudrate (int): Serial baud rate.
+
+        Returns:
+            None
+        """
+        import serial_asyncio
+
+        loop = asyncio.get_event_loop()
+        transport, protocol = await serial_asyncio.create_serial_connection(
+            loop, ISX3Protocol, port, baudrate=baudrate
+        )
+        self.attach(transport, protocol, port)
+        log.info("Successfully Connected to %s.", port)
+
+    def attach(self, transport, protocol, name: str = None):
+        """
+        Uses an already opened asyncio transport, e.g. a TCP connection.
+
+        Args:
+            transport (asyncio.Transport): Open transport to the device.
+            protocol (ISX3Protocol): Protocol instance bound to the transport.
+            name (str): Name used in messages.
+
+        Returns:
+            None
+        """
+        self.transport = transport
+        self.protocol = protocol
+        self.name = name
+        self._command_lock = asyncio.Lock()
+
+    async def close(self):
+        """
+        Closes the transport and waits until the connection is down.
+
+        Returns:
+            None
+        """
+        if self.transport is not None:
+            self.transport.close()
+            await self.protocol.closed
+            self.transport = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def write_command(self, command, timeout: float = None):
+        """
+        Writes a command and waits for the resulting system message.
+
+        Messages the device sends on its own (`UNSOLICITED_MESSAGES`) are passed over.
+
+        Args:
+            command (bytearray): Formatted command frame.
+            timeout (float): Time in seconds to wait, defaults to `command_timeout`.
+
+        Returns:
+            int or None: Message code (e.g. 0x83 for ACK), None on timeout.
+        """
+        timeout = self.command_timeout if timeout is None else timeout
+        messages = self.protocol.messages
+        async with self._command_lock:
+            # Drop messages left over from earlier commands that timed out
+            while not messages.empty():
+                messages.get_nowait()
+            self.transport.write(bytes(command))
+            try:
+                code = await asyncio.wait_for(self._next_message(UNSOLICITED_MESSAGES), timeout)
+            except asyncio.TimeoutError:
+                code = None
+
+        if self.print_msg:
+            log.info("%s: %s", self.name, MSG_DICT.get(NO_MESSAGE if code is None else code, "Unknown message"))
+        return code
+
+    async def _next_message(self, skip=(), received: list = None):
+        while True:
+            code = await self.protocol.messages.get()
+            if received is not None:
+                received.append(code)
+            if code not in skip:
+                return code
+
+    async def query(self, command, timeout: float = None):
+        """
+        Writes a request and waits for the response frame.
+
+        Args:
+            command (bytearray): Formatted request frame.
+            timeout (float): Time in seconds to wait, defaults to `command_timeout`.
+
+        Returns:
+            bytes or None: The complete response frame, None on timeout.
+        """
+        timeout = self.command_timeout if timeout is None else timeout
+        responses = self.protocol.responses
+        async with self._command_lock:
+            while not responses.empty():
+                responses.get_nowait()
+            self.transport.write(bytes(command))
+            try:
+                return await asyncio.wait_for(responses.get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+    async def set_fs_settings(self, measurement_mode, measurement_channel="Main Port",
+                              current_measurement_range="autoranging", voltage_measurement_range="1V"):
+        """
+        Configures the frontend settings for the measurement.
+
+        Args:
+            measurement_mode (int): Measurement mode (2=2-point, 3=3-point, 4=4-point).
+            measurement_channel (str): Measurement channel to use (e.g., "Main Port").
+            current_measurement_range (str): Current measurement range (e.g., "10mA").
+            voltage_measurement_range (str): Voltage measurement range (e.g., "1V").
+
+        Returns:
+            int or None: Message code of the settings command.
+        """
+        # Clear stack to avoid overflow
+        await self.write_command(bytearray([0xB0, 0x03, 0xFF, 0xFF, 0xFF, 0xB0]))
+
+        command = build_fs_settings_command(measurement_mode, measurement_channel,
+                                            current_measurement_range, voltage_measurement_range)
+        if command is None:
+            return None
+        return await self.write_command(command)
+
+    async def get_fs_settings(self):
+        """
+        Reads back the configured frontend channels.
+
+        Returns:
+            list of FrontendConfig: One configuration per configured channel.
+        """
+        response = await self.query(CHANNEL_COUNT_REQUEST)
+        if response is None or len(response) < 5:
+            log.warning("%s: No valid B1 response frame for channel count.", self.name)
+            return []
+
+        num_channels = int.from_bytes(response[2:4], "big")
+        configs = []
+        for ch in range(1, num_channels + 1):
+            frame = await self.query(channel_request(ch))
+            config = None if frame is None else FrontendConfig.from_response(frame)
+            if config is not None:
+                configs.append(config)
+        return configs
+
+    async def set_setup(self, start_frequency, end_frequency, count, scale, precision, amplitude, excitation_type):
+        """
+        Configures the measurement setup parameters such as frequency range and signal characteristics.
+
+        Args:
+            start_frequency (str): Starting frequency, e.g., "1kHz".
+            end_frequency (str): Ending frequency, e.g., "10MHz".
+            count (int): Number of frequency points.
+            scale (str): Scale type, "log" or "linear".
+            precision (float): Measurement precision.
+            amplitude (str): Signal amplitude.
+            excitation_type (str): Type of excitation, "voltage" or "current".
+
+        Returns:
+            int or None: Message code of the setup command.
+        """
+        config = setup_config(start_frequency, end_frequency, count, scale, precision, amplitude, excitation_type)
+        # resets the setup
+        await self.write_command(bytearray([0x86, 0x01, 0x01, 0x86]))
+        # The validated count, an invalid count is replaced by the default
+        self.frequency_points = config.frequency_points
+        return await self.write_command(config.frame)
+
+    async def iter_frames(self, spectra: int = 20, timeout: float = 10.0):
+        """
+        Starts a measurement and yields frames as they arrive.
+
+        The measurement is stopped when all frames arrived or no frame arrived
+        within `timeout` seconds. A consumer that leaves the loop early has to close
+        the generator with `await frames.aclose()` to stop the measurement right away,
+        otherwise it is stopped when the generator is finalized or the next
+        measurement starts, whichever comes first.
+
+        Args:
+            spectra (int): Number of repetitions for each frequency point.
+            timeout (float): Maximum time in seconds to wait for the next frame.
+
+        Yields:
+            tuple: Measurement result (Frequency ID, Real, Imaginary).
+        """
+        spectra = input_user.check_input_spectra(spectra)
+        expected_results = spectra * self.frequency_points
+        frames = self.protocol.frames
+
+        if self._measuring:
+            # An earlier consumer left its loop without closing the generator
+            await self.stop_measurement()
+        self._measurement += 1
+        measurement = self._measurement
+        self._measuring = True
+
+        # Frames left over from an earlier measurement must not be taken as results of this one
+        while not frames.empty():
+            frames.get_nowait()
+        self.transport.write(bytes([0xB8, 0x03, 0x01, *spectra.to_bytes(2, "big"), 0xB8]))
+        try:
+            for _ in range(expected_results):
+                try:
+                    yield await asyncio.wait_for(frames.get(), timeout)
+                except asyncio.TimeoutError:
+                    log.warning("%s: Timeout while waiting for measurement data.", self.name)
+                    break
+        finally:
+            # A generator finalized late must not stop a newer measurement
+            if measurement == self._measurement and self._measuring:
+                self._measuring = False
+                await self.stop_measurement()
+
+    async def start_measurement(self, spectra: int = 20, timeout: float = 10.0, reset: bool = True):
+        """
+        Runs a complete measurement and optionally resets the device afterwards.
+
+        Args:
+            spectra (int): Number of repetitions for each frequency point.
+            timeout (float): Maximum time in seconds to wait for the next frame.
+            reset (bool): Resets the device after the measurement and waits until it is ready again.
+
+        Returns:
+            list of tuple: Measurement results as (Frequency ID, Real, Imaginary).
+        """
+        results = [frame async for frame in self.iter_frames(spectra, timeout)]
+        if reset:
+            await self.software_reset()
+        return results
+
+    async def stop_measurement(self):
+        """
+        Stops the measurement process.
+
+        Returns:
+            int or None: Message code of the stop command.
+        """
+        return await self.write_command(bytearray([0xB8, 0x01, 0x00, 0xB8]))
+
+    async def software_reset(self, wait_ready: bool = True, timeout: float = 6.0):
+        """
+        Sends a software reset command to the device.
+
+        Args:
+            wait_ready (bool): Waits for the system-ready (0x84) message that follows the wake-up (0x04) message.
+            timeout (float): Maximum time in seconds to wait for the device to become ready.
+
+        Returns:
+            bool: True if the device acknowledged the reset and, if requested, reported readiness.
+        """
+        code = await self.write_command(bytearray([0xA1, 0x00, 0xA1]))
+        if code in NACK_MESSAGES or code is None:
+            return False
+        if not wait_ready:
+            return True
+
+        # The wake-up message is followed by the system-ready message, which is consumed here
+        received = []
+        waiting = tuple(message for message in UNSOLICITED_MESSAGES if message != SYSTEM_READY_MESSAGE)
+        try:
+            code = await asyncio.wait_for(self._next_message(waiting, received), timeout)
+        except asyncio.TimeoutError:
+            if WAKE_UP_MESSAGE in received:
+                log.warning("%s: Device woke up but sent no system-ready message within %s s after the reset.",
+                            self.name, timeout)
+                return True
+            log.warning("%s: Device did not report readiness within %s s after the reset.", self.name, timeout)
+            return False
+        return code in READY_MESSAGES
@@ -0,0 +1,519 @@
+import argparse
+import contextlib
+import csv
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from frame_decoder import FrameDecoder, frames_to_array
+from isx3_logging import LOGGER_NAME
+
+# Metrics compared against a baseline and whether a higher value is better
+TRACKED_METRICS = {
+    "decoder.bulk.frames_per_s": True,
+    "decoder.bulk.bytes_per_s": True,
+    "command.round_trip_ms.median": False,
+    "command.round_trip_ms.p99": False,
+    "setup_frames.commands_per_s": True,
+    "export.csv_writer.results_per_s": True,
+    "export.raw_binary.results_per_s": True,
+    "memory.tuples.peak_mb_per_million": False,
+    "memory.array.peak_mb_per_million": False,
+    "sweep.tuples.seconds": False,
+    "sweep.array.seconds": False,
+}
+
+
+def build_frame_stream(frames: int, frequency_points: int = 100, noise: float = 0.0, seed: int = 0) -> bytes:
+    """
+    Builds a simulated ISX3 byte stream of 0xB8 measurement frames.
+
+    Args:
+        frames (int): Number of measurement frames to generate.
+        frequency_points (int): Number of frequency IDs before the ID wraps around.
+        noise (float): Probability of inserting a random garbage byte between two frames.
+        seed (int): Seed for the random generator, so runs are reproducible.
+
+    Returns:
+        bytes: The concatenated byte stream.
+    """
+    rng = random.Random(seed)
+    stream = bytearray()
+    for i in range(frames):
+        if noise and rng.random() < noise:
+            stream.append(rng.randrange(256))
+        stream += bytes([0xB8, 0x0A])
+        stream += struct.pack(">Hff", i % frequency_points, rng.uniform(0, 1000), rng.uniform(-1000, 0))
+        stream.append(0xB8)
+    return bytes(stream)
+
+
+def chunked(stream: bytes, chunk_size: int):
+    """
+    Splits a byte stream into the pieces a serial port would deliver.
+
+    Args:
+        stream (bytes): Complete byte stream.
+        chunk_size (int): Bytes per read.
+
+    Returns:
+        list of bytes: The chunks in order.
+    """
+    return [stream[i:i + chunk_size] for i in range(0, len(stream), chunk_size)]
+
+
+def decode_per_byte(stream: bytes) -> list:
+    """
+    Reference implementation of the original byte-at-a-time decoder.
+
+    Only the parsing cost is measured here, the per-byte `read(1)` calls of the
+    original implementation would add one syscall per byte on top.
+
+    Args:
+        stream (bytes): Complete byte stream.
+
+    Returns:
+        list of tuple: Parsed measurement data (Frequency ID, Real, Imaginary).
+    """
+    results = []
+    buffer = []
+    for byte in stream:
+        buffer.append(byte)
+        if len(buffer) >= 13:
+            if buffer[-13] == 0xB8 and buffer[-12] == 0x0A and buffer[-1] == 0xB8:
+                frame = buffer[-13:]
+                freq_id = int.from_bytes(frame[2:4], "big")
+                real = struct.unpack(">f", bytes(frame[4:8]))[0]
+                imag = struct.unpack(">f", bytes(frame[8:12]))[0]
+                results.append((freq_id, real, imag))
+                buffer.clear()
+    return results
+
+
+def decode_bulk(chunks: list) -> list:
+    """
+    Decodes the stream with the incremental FrameDecoder.
+
+    Args:
+        chunks (list of bytes): Stream split into serial reads.
+
+    Returns:
+        list of tuple: Parsed measurement data (Frequency ID, Real, Imaginary).
+    """
+    decoder = FrameDecoder()
+    results = []
+    for chunk in chunks:
+        results.extend(decoder.feed(chunk))
+    return results
+
+
+def benchmark_decoder(frames: int = 200000, chunk_size: int = 4096, noise: float = 0.0, repeat: int = 3) -> dict:
+    """
+    Measures decoding throughput of the per-byte and the bulk decoder.
+
+    Args:
+        frames (int): Number of frames in the simulated stream.
+        chunk_size (int): Bytes delivered per simulated read.
+        noise (float): Probability of a garbage byte between frames.
+        repeat (int): Number of runs, the fastest one is reported.
+
+    Returns:
+        dict: Frames per second and bytes per second for both decoders.
+    """
+    stream = build_frame_stream(frames, noise=noise)
+    chunks = chunked(stream, chunk_size)
+
+    report = {"frames": frames, "bytes": len(stream), "chunk_size": chunk_size, "noise": noise}
+    for name, run in (("per_byte", lambda: decode_per_byte(stream)), ("bulk", lambda: decode_bulk(chunks))):
+        best = float("inf")
+        decoded = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            decoded = len(run())
+            best = min(best, time.perf_counter() - start)
+        report[name] = {
+            "decoded": decoded,
+            "seconds": best,
+            "frames_per_s": decoded / best,
+            "bytes_per_s": len(stream) / best,
+        }
+    report["speedup"] = report["per_byte"]["seconds"] / report["bulk"]["seconds"]
+    return report
+
+
+def benchmark_pool(device_counts=(1, 2, 4, 8), spectra: int = 10, count: int = 50, timeout: float = 0.05) -> list:
+    """
+    Measures how configuration and sweep time scale with the number of devices in a pool.
+
+    Args:
+        device_counts (tuple of int): Pool sizes to measure.
+        spectra (int): Spectra per sweep.
+        count (int): Frequency points per spectrum.
+        timeout (float): Simulated serial read timeout in seconds.
+
+    Returns:
+        list of dict: Timings per pool size.
+    """
+    from ISX3 import ISX3
+    from device_pool import ISX3Pool
+    from isx3_simulator import SimulatedISX3
+
+    report = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n in device_counts:
+            pool = ISX3Pool(n_el=4)
+            for i in range(n):
+                isx3 = ISX3(n_el=4)
+                isx3.device = SimulatedISX3(f"SIM{i}", timeout, seed=i)
+                isx3.print_msg = False
+                pool.add(f"SIM{i}", isx3)
+
+            start = time.perf_counter()
+            pool.set_fs_settings(measurement_mode=4)
+            pool.set_setup(start_frequency="1kHz", end_frequency="1MHz", count=count, scale="log",
+                           precision=1.0, amplitude="100mV", excitation_type="voltage")
+            configured = time.perf_counter()
+            results = pool.start_measurement(spectra, "array", csv_directory=directory)
+            finished = time.perf_counter()
+
+            report.append({
+                "devices": n,
+                "configure_s": configured - start,
+                "sweep_s": finished - configured,
+                "results": int(results.size),
+            })
+    return report
+
+
+@contextlib.contextmanager
+def _quiet():
+    """
+    Silences the driver's log output while a benchmark runs.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+
+def _simulated_isx3(timeout: float = 0.05, count: int = 50, **options):
+    from ISX3 import ISX3
+    from isx3_simulator import SimulatedISX3
+
+    isx3 = ISX3(n_el=4)
+    isx3.device = SimulatedISX3("SIM", timeout, **options)
+    isx3.print_msg = False
+    with _quiet():
+        isx3.set_fs_settings(measurement_mode=4)
+        isx3.set_setup(start_frequency="1kHz", end_frequency="1MHz", count=count, scale="log",
+                       precision=1.0, amplitude="100mV", excitation_type="voltage")
+    return isx3
+
+
+def benchmark_command_latency(iterations: int = 2000) -> dict:
+    """
+    Measures the command round trip (write, wait for ACK, parse) against the emulator.
+
+    Args:
+        iterations (int): Number of commands sent.
+
+    Returns:
+        dict: Round-trip latency statistics in milliseconds.
+    """
+    isx3 = _simulated_isx3()
+    command = bytearray([0x86, 0x01, 0x01, 0x86])
+    samples = []
+    with _quiet():
+        for _ in range(iterations):
+            start = time.perf_counter()
+            isx3.write_command_string(command)
+            samples.append((time.perf_counter() - start) * 1e3)
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "round_trip_ms": {
+            "mean": statistics.fmean(samples),
+            "median": samples[len(samples) // 2],
+            "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        },
+    }
+
+
+def benchmark_setup_frames(iterations: int = 20000) -> dict:
+    """
+    Measures how fast the 0xB6 setup and 0xB0 frontend command frames are built.
+
+    The tracked rate calls the uncached builders, so it measures validation and frame
+    construction. The rate of the memoized public functions is reported separately.
+
+    Args:
+        iterations (int): Number of frame pairs built.
+
+    Returns:
+        dict: Built frames per second, uncached and cached.
+    """
+    from device_config import frontend_config, setup_config
+
+    build_setup, build_frontend = setup_config.__wrapped__, frontend_config.__wrapped__
+    start = time.perf_counter()
+    for _ in range(iterations):
+        build_setup("1kHz", "1MHz", 50, "log", 1.0, "100mV", "voltage")
+        build_frontend(4, "Main Port", "10mA", "1V")
+    seconds = time.perf_counter() - start
+
+    cached_start = time.perf_counter()
+    for _ in range(iterations):
+        setup_config("1kHz", "1MHz", 50, "log", 1.0, "100mV", "voltage")
+        frontend_config(4, "Main Port", "10mA", "1V")
+    cached_seconds = time.perf_counter() - cached_start
+    return {"iterations": iterations, "seconds": seconds, "commands_per_s": 2 * iterations / seconds,
+            "cached_commands_per_s": 2 * iterations / cached_seconds}
+
+
+def benchmark_export(results: int = 200000) -> dict:
+    """
+    Measures the cost of exporting results to disk.
+
+    Compares the row-by-row csv.writer export of `start_measurement` with the
+    batched result writers.
+
+    Args:
+        results (int): Number of results written.
+
+    Returns:
+        dict: Results per second for every export path.
+    """
+    from result_writers import CsvWriter, RawBinaryWriter
+
+    rows = decode_bulk([build_frame_stream(results)])
+    freq_id, real, imag = zip(*rows)
+    report = {"results": results}
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        with open(os.path.join(directory, "rows.csv"), mode="w", newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(["Frequency ID", "Real Part", "Imaginary Part"])
+            for row in rows:
+                writer.writerow(row)
+        report["csv_rows"] = {"results_per_s": results / (time.perf_counter() - start)}
+
+        for name, writer_class, filename in (("csv_writer", CsvWriter, "batched.csv"),
+                                              ("raw_binary", RawBinaryWriter, "batched.bin")):
+            start = time.perf_counter()
+            with writer_class(os.path.join(directory, filename)) as writer:
+                writer.write_columns(freq_id, real, imag)
+            report[name] = {"results_per_s": results / (time.perf_counter() - start)}
+    return report
+
+
+def benchmark_memory(results: int = 1000000, frequency_points: int = 100) -> dict:
+    """
+    Measures the peak memory of decoding results as tuples and as a NumPy array.
+
+    Args:
+        results (int): Number of decoded results.
+        frequency_points (int): Frequency points per spectrum.
+
+    Returns:
+        dict: Peak memory in MB per million results for both result modes.
+    """
+    chunks = chunked(build_frame_stream(results, frequency_points), 4096)
+    spectra = -(-results // frequency_points)
+    report = {"results": results}
+
+    def decode_array():
+        raw_frames = bytearray()
+        decoder = FrameDecoder()
+        for chunk in chunks:
+            decoder.feed_raw(chunk, raw_frames)
+        return frames_to_array(raw_frames, spectra, frequency_points)
+
+    for name, run in (("tuples", lambda: decode_bulk(chunks)), ("array", decode_array)):
+        tracemalloc.start()
+        result = run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        report[name] = {"peak_mb": peak / 1e6, "peak_mb_per_million": peak / 1e6 * 1e6 / results}
+    return report
+
+
+def benchmark_sweep(count: int = 50, spectra: int = 100) -> dict:
+    """
+    Measures an end-to-end sweep (start, read, stop, CSV export, reset) against the emulator.
+
+    Args:
+        count (int): Frequency points per spectrum.
+        spectra (int): Spectra per sweep.
+
+    Returns:
+        dict: Sweep duration per result mode.
+    """
+    isx3 = _simulated_isx3(count=count)
+    report = {"count": count, "spectra": spectra}
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ("tuples", "array"):
+            start = time.perf_counter()
+            with _quiet():
+                isx3.start_measurement(spectra, mode, csv_path=os.path.join(directory, f"{mode}.csv"))
+            report[mode] = {"seconds": time.perf_counter() - start}
+    return report
+
+
+def run_suite(frames: int = 200000, count: int = 50, spectra: int = 100, pool=None) -> dict:
+    """
+    Runs every benchmark and collects the results in one report.
+
+    Args:
+        frames (int): Frames in the simulated stream of the decoder, export and memory benchmarks.
+        count (int): Frequency points per spectrum of the sweep benchmark.
+        spectra (int): Spectra of the sweep benchmark.
+        pool (list of int): Pool sizes for the device pool benchmark, skipped if not given.
+
+    Returns:
+        dict: The complete report.
+    """
+    report = {
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "decoder": benchmark_decoder(frames),
+        "command": benchmark_command_latency(),
+        "setup_frames": benchmark_setup_frames(),
+        "export": benchmark_export(frames),
+        "memory": benchmark_memory(frames),
+        "sweep": benchmark_sweep(count, spectra),
+    }
+    if pool:
+        report["pool"] = benchmark_pool(pool)
+    return report
+
+
+def tracked_metrics(report: dict) -> dict:
+    """
+    Extracts the metrics listed in TRACKED_METRICS from a report.
+
+    Args:
+        report (dict): Report of `run_suite`.
+
+    Returns:
+        dict: Metric name mapped to its value.
+    """
+    metrics = {}
+    for name in TRACKED_METRICS:
+        value = report
+        for key in name.split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+        if value is not None:
+            metrics[name] = value
+    return metrics
+
+
+def compare_to_baseline(metrics: dict, baseline: dict, tolerance: float = 0.2) -> list:
+    """
+    Compares metrics with a stored baseline.
+
+    Args:
+        metrics (dict): Current metrics of `tracked_metrics`.
+        baseline (dict): Baseline metrics loaded from JSON.
+        tolerance (float): Allowed relative slowdown before a metric counts as a regression.
+
+    Returns:
+        list of str: One description per regressed metric.
+    """
+    regressions = []
+    for name, value in metrics.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        higher_is_better = TRACKED_METRICS[name]
+        change = (value - reference) / reference
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append(f"{name}: {value:.4g} vs. baseline {reference:.4g} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ISX3 benchmark suite against simulated devices")
+    parser.add_argument("--frames", type=int, default=200000)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--noise", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--count", type=int, default=50, help="frequency points of the sweep benchmark")
+    parser.add_argument("--spectra", type=int, default=100, help="spectra of the sweep benchmark")
+    parser.add_argument("--pool", type=int, nargs="*", metavar="N",
+                        help="also run the device pool scaling benchmark for these pool sizes")
+    parser.add_argument("--decoder-only", action="store_true", help="only run the frame decoder benchmark")
+    parser.add_argument("--json", metavar="PATH", help="write the full report as JSON")
+    parser.add_argument("--save-baseline", metavar="PATH", help="store the tracked metrics as a new baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare the tracked metrics against a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="relative slowdown allowed before a metric counts as a regression")
+    args = parser.parse_args()
+
+    if args.decoder_only:
+        report = {"decoder": benchmark_decoder(args.frames, args.chunk_size, args.noise, args.repeat)}
+        if args.pool:
+            report["pool"] = benchmark_pool(args.pool)
+    else:
+        report = run_suite(args.frames, args.count, args.spectra, args.pool)
+
+    decoder = report["decoder"]
+    print(f"Stream: {decoder['frames']} frames, {decoder['bytes']} bytes, "
+          f"chunk size {decoder['chunk_size']}, noise {decoder['noise']}")
+    for name in ("per_byte", "bulk"):
+        result = decoder[name]
+        print(f"{name:>9}: {result['decoded']} frames in {result['seconds']:.3f} s "
+              f"({result['frames_per_s']:,.0f} frames/s, {result['bytes_per_s'] / 1e6:.2f} MB/s)")
+    print(f"  speedup: {decoder['speedup']:.1f}x")
+
+    if "command" in report:
+        latency = report["command"]["round_trip_ms"]
+        print(f"command round trip: median {latency['median']:.3f} ms, p99 {latency['p99']:.3f} ms")
+        print(f"setup frames: {report['setup_frames']['commands_per_s']:,.0f} commands/s")
+        export = report["export"]
+        print("export: " + ", ".join(f"{name} {export[name]['results_per_s']:,.0f} results/s"
+                                     for name in ("csv_rows", "csv_writer", "raw_binary")))
+        memory = report["memory"]
+        print("peak memory per million results: " + ", ".join(
+            f"{name} {memory[name]['peak_mb_per_million']:.1f} MB" for name in ("tuples", "array")))
+        sweep = report["sweep"]
+        print(f"sweep of {sweep['count']} points x {sweep['spectra']} spectra: "
+              f"tuples {sweep['tuples']['seconds']:.3f} s, array {sweep['array']['seconds']:.3f} s")
+
+    for result in report.get("pool", []):
+        print(f"pool of {result['devices']:>3} devices: configure {result['configure_s']:.3f} s, "
+              f"sweep {result['sweep_s']:.3f} s, {result['results']} results")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+    metrics = tracked_metrics(report)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump(metrics, file, indent=2, sort_keys=True)
+        print(f"Baseline written into {args.save_baseline}.")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare_to_baseline(metrics, json.load(file), args.tolerance)
+        if regressions:
+            print("Regressions against the baseline:")
+            for regression in regressions:
+                print("  " + regression)
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
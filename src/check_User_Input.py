@@ -1,5 +1,9 @@
 import struct
 
+from isx3_logging import get_logger
+
+log = get_logger(__name__)
+
 """
     Accepted Values:
     2
@@ -176,16 +180,16 @@ def check_frequency_range(start_frequency: float, end_frequency: float):
     max_frequency = 10000000.0
 
     if start_frequency >= default_end_frequency:
-        print("start frequency is greater than end frequency. Using default frequency values.")
+        log.warning("start frequency is greater than end frequency. Using default frequency values.")
         start_frequency = default_start_frequency
         end_frequency = default_end_frequency
 
     if start_frequency < min_frequency:
-        print("your start frequency is less than 1. Using default start frequency.")
+        log.warning("your start frequency is less than 1. Using default start frequency.")
         start_frequency = default_start_frequency
 
     if end_frequency > max_frequency:
-        print(f"your end frequency is greater than {max_frequency}. Using default end frequency.")
+        log.warning("your end frequency is greater than %s. Using default end frequency.", max_frequency)
         start_frequency = default_start_frequency
 
     return float_to_bytes(start_frequency), float_to_bytes(end_frequency)
@@ -205,7 +209,7 @@ def check_count(count: int):
     default_count = 60
 
     if count < min_count or count > max_count:
-        print(f"count is less than or equal to {min_count} and {max_count}. Taking default count.")
+        log.warning("count is less than or equal to %d and %d. Taking default count.", min_count, max_count)
         count = default_count
     return list(struct.pack(">f", float(count)))
 
@@ -231,7 +235,7 @@ def check_scale(scale: str):
         "lin": 0x01,
     }
     if scale not in scales:
-        print("Invalid scale. Setting to default scale (log).")
+        log.warning("Invalid scale. Setting to default scale (log).")
         return scales.get("log")
     else:
         return scales.get(scale)
@@ -251,7 +255,7 @@ def check_precision(precision):
     default_precision = 1.0
 
     if precision < min_precision or precision > max_precision:
-        print(f"Precision {precision} is out of range. Using default precision.")
+        log.warning("Precision %s is out of range. Using default precision.", precision)
         precision = default_precision
 
     return list(struct.pack(">f", precision))
@@ -284,7 +288,7 @@ def check_amplitude(amplitude, excitation_type):
         amplitude = parse_amplitude(amplitude, excitation_type)
 
     if amplitude is None or not (min_amp <= amplitude <= max_amp):
-        print("Invalid amplitude. Setting to default amplitude.")
+        log.warning("Invalid amplitude. Setting to default amplitude.")
         amplitude = default_amp
 
     return list(struct.pack(">f", amplitude))
@@ -301,7 +305,7 @@ def check_excitation_type(excitation_type):
             str: 'voltage' or 'current'. Defaults to 'voltage'.
         """
     if excitation_type not in ["voltage", "current"]:
-        print(f"Invalid excitation type. Setting to default excitation type.")
+        log.warning("Invalid excitation type. Setting to default excitation type.")
         excitation_type = "voltage"
 
     return excitation_type
@@ -339,7 +343,7 @@ def parse_frequency(value):
     try:
         return float(value) * multiplier
     except ValueError:
-        print(f"Could not parse frequency value: {value}. Using default 1000.0 Hz.")
+        log.warning("Could not parse frequency value: %s. Using default 1000.0 Hz.", value)
         return 1000.0
 
 def parse_amplitude(value, excitation_type="voltage"):
@@ -386,7 +390,7 @@ def parse_amplitude(value, excitation_type="voltage"):
     try:
         return float(value) * multiplier
     except ValueError:
-        print(f"Could not parse amplitude value: {value}. Using default.")
+        log.warning("Could not parse amplitude value: %s. Using default.", value)
         return None  # handled later in check_amplitude
 
 
@@ -405,11 +409,11 @@ def check_input_spectra(spectra):
     try:
         spectra = int(spectra)
     except (TypeError, ValueError):
-        print("Spectra must be an integer. Setting to default.")
+        log.warning("Spectra must be an integer. Setting to default.")
         return default_spectra
 
     if not (1 <= spectra <= 65535):
-        print("Spectra out of valid range (1–65535). Setting to default.")
+        log.warning("Spectra out of valid range (1–65535). Setting to default.")
         return default_spectra
 
     return spectra
\ No newline at end of file
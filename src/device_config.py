@@ -0,0 +1,278 @@
+import functools
+import struct
+from dataclasses import dataclass, field
+
+import check_User_Input as input_user
+from analysis import frequency_axis
+from isx3_logging import get_logger, record_warnings, replay
+
+log = get_logger(__name__)
+
+# Number of cached configurations, enough for the fixed sets a lab cycles through
+CONFIG_CACHE_SIZE = 256
+
+# Offset of the frequency count (float) inside the 0xB6 setup frame
+SETUP_COUNT_OFFSET = 11
+
+# Channel roles of the 0xB0 frame per measurement mode (number of points)
+CHANNEL_ROLES = {2: ("C", "W"), 3: ("C", "R", "W"), 4: ("C", "R", "S", "W")}
+
+# 0xB1 readback requests: number of configured channels, and the settings of channel n
+CHANNEL_COUNT_REQUEST = bytes([0xB1, 0x02, 0x02, 0x00, 0xB1])
+
+
+def memoize_config(builder):
+    """
+    Memoizes a configuration builder like `functools.lru_cache`, but logs its validation warnings on every call.
+
+    The warnings of the first call are recorded and replayed on each call with the same
+    parameters, so invalid input stays visible after the configuration is cached.
+    The uncached builder is available as `__wrapped__`.
+
+    Args:
+        builder (callable): Function that validates its arguments and returns a configuration.
+
+    Returns:
+        callable: The memoized builder with `cache_info` and `cache_clear`.
+    """
+    @functools.lru_cache(maxsize=CONFIG_CACHE_SIZE)
+    def build(*args, **kwargs):
+        with record_warnings() as warnings:
+            config = builder(*args, **kwargs)
+        return config, tuple(warnings)
+
+    @functools.wraps(builder)
+    def memoized(*args, **kwargs):
+        config, warnings = build(*args, **kwargs)
+        replay(warnings)
+        return config
+
+    memoized.cache_info = build.cache_info
+    memoized.cache_clear = build.cache_clear
+    return memoized
+
+
+def channel_request(channel: int) -> bytes:
+    return bytes([0xB1, 0x01, channel, 0xB1])
+
+
+@dataclass(frozen=True)
+class SetupConfig:
+    """
+    Validated measurement setup with its precomputed 0xB6 command frame.
+
+    Two configurations are equal if they produce the same frame, so "1kHz" and
+    "1000Hz" describe the same setup. Create instances with `setup_config`,
+    which validates every distinct parameter set only once.
+
+    Attributes:
+        frame (bytes): The complete 0xB6 command frame.
+        frequency_points (int): Validated number of frequency points the device measures.
+    """
+    frame: bytes
+    frequency_points: int = field(compare=False)
+
+    @property
+    def start_frequency(self) -> float:
+        return struct.unpack_from(">f", self.frame, 3)[0]
+
+    @property
+    def end_frequency(self) -> float:
+        return struct.unpack_from(">f", self.frame, 7)[0]
+
+    @property
+    def log_scale(self) -> bool:
+        return self.frame[15] == 0x01
+
+    @property
+    def precision(self) -> float:
+        return struct.unpack_from(">f", self.frame, 16)[0]
+
+    @property
+    def amplitude(self) -> float:
+        return struct.unpack_from(">f", self.frame, 20)[0]
+
+    def sub_range(self, first: int, last: int):
+        """
+        Setup that measures only the frequency IDs `first` to `last` of this setup, at the same frequencies.
+
+        The frame is derived from this already validated one, only start, end and count change.
+
+        Args:
+            first (int): First frequency ID of the range.
+            last (int): Last frequency ID of the range (inclusive).
+
+        Returns:
+            SetupConfig: The sub-range setup, its frequency ID 0 corresponds to `first`.
+        """
+        frequencies = frequency_axis(self)
+        count = last - first + 1
+        frame = bytearray(self.frame)
+        struct.pack_into(">fff", frame, 3, frequencies[first], frequencies[last], float(count))
+        return SetupConfig(bytes(frame), count)
+
+
+@dataclass(frozen=True)
+class FrontendConfig:
+    """
+    Validated frontend settings with their precomputed 0xB0 command frame.
+
+    Create instances with `frontend_config`, or from the device readback with `from_response`.
+
+    Attributes:
+        frame (bytes): The complete 0xB0 command frame.
+    """
+    frame: bytes
+
+    @classmethod
+    def from_response(cls, response: bytes):
+        """
+        Creates the configuration from a 0xB1 channel readback frame.
+
+        Args:
+            response (bytes): Frame [0xB1, length, settings..., 0xB1] answering `channel_request`.
+
+        Returns:
+            FrontendConfig or None: The configuration, None if the frame is malformed.
+        """
+        if len(response) < 6 or response[0] != 0xB1 or response[-1] != 0xB1 or response[1] != len(response) - 3:
+            return None
+        return cls(bytes([0xB0, *response[1:-1], 0xB0]))
+
+    @property
+    def mode(self) -> int:
+        return self.frame[2]
+
+    @property
+    def current_range(self) -> int:
+        return self.frame[3]
+
+    @property
+    def voltage_range(self) -> int:
+        return self.frame[4]
+
+    @property
+    def channels(self) -> list:
+        """
+        Channel codes and extension values as (channel, extension) tuples, in C, R, S, W order.
+        """
+        return [(self.frame[i], int.from_bytes(self.frame[i + 1:i + 3], "big"))
+                for i in range(5, len(self.frame) - 3, 3)]
+
+    def __str__(self) -> str:
+        channels = ", ".join(f"0x{channel:02X} (ext: {ext})" for channel, ext in self.channels)
+        return (f"Mode: 0x{self.mode:02X}, Current: 0x{self.current_range:02X}, "
+                f"Voltage: 0x{self.voltage_range:02X}, Channels: {channels}")
+
+
+@memoize_config
+def setup_config(start_frequency, end_frequency, count, scale, precision, amplitude, excitation_type) -> SetupConfig:
+    """
+    Validates the setup parameters once and builds the 0xB6 command frame.
+
+    Results are memoized, repeated calls with the same parameters return the same object
+    and log the same warnings.
+
+    Args:
+        start_frequency (str): Starting frequency, e.g., "1kHz".
+        end_frequency (str): Ending frequency, e.g., "10MHz".
+        count (int): Number of frequency points.
+        scale (str): Scale type, "log" or "linear".
+        precision (float): Measurement precision.
+        amplitude (str): Signal amplitude.
+        excitation_type (str): Type of excitation, "voltage" or "current".
+
+    Returns:
+        SetupConfig: The validated configuration.
+    """
+    start_bytes, end_bytes = input_user.check_frequency_range(start_frequency, end_frequency)
+    frame = bytes([
+        0xB6, 0x16, 0x03,
+        *start_bytes, *end_bytes,
+        *input_user.check_count(count),
+        input_user.check_scale(scale),
+        *input_user.check_precision(precision),
+        *input_user.check_amplitude(amplitude, excitation_type),
+        0xB6,
+    ])
+    frequency_points = int(struct.unpack_from(">f", frame, SETUP_COUNT_OFFSET)[0])
+    return SetupConfig(frame, frequency_points)
+
+
+@memoize_config
+def frontend_config(measurement_mode, measurement_channel="Main Port", current_measurement_range="autoranging",
+                    voltage_measurement_range="1V", electrodes: tuple = None):
+    """
+    Validates the frontend settings once and builds the 0xB0 command frame.
+
+    Results are memoized, repeated calls with the same parameters return the same object
+    and log the same warnings.
+
+    Args:
+        measurement_mode (int): Measurement mode (2=2-point, 3=3-point, 4=4-point).
+        measurement_channel (str): Measurement channel to use (e.g., "Main Port").
+        current_measurement_range (str): Current measurement range (e.g., "10mA").
+        voltage_measurement_range (str): Voltage measurement range (e.g., "1V").
+        electrodes (tuple of int): Electrode per channel role (see `CHANNEL_ROLES`), written into the
+        2-byte extension fields to select the electrodes of an extension port multiplexer.
+
+    Returns:
+        FrontendConfig or None: The validated configuration, None if the mode is not supported.
+    """
+    # Convert parameters
+    mode = input_user.check_measurement_mode(measurement_mode)
+    if mode == -1:
+        log.warning("Invalid Measurement Mode '%s', set it to default Value (4 Points).", measurement_mode)
+        mode = 0x02
+    current_range = input_user.check_current_range_settings(current_measurement_range)
+    if current_range == -1:
+        log.warning("Invalid range mode '%s', set it to 'autoranging'.", current_measurement_range)
+        current_range = 0x00
+    voltage_range = input_user.check_voltage_range_settings(voltage_measurement_range)
+    if voltage_range == -1:
+        log.warning("Invalid voltage range '%s', set it to ±1V.", voltage_measurement_range)
+        voltage_range = 0x01
+    channel_code = input_user.check_measurement_channel(measurement_channel)
+    if channel_code == -1:
+        log.warning("Invalid Channel '%s', set it to 'Main Port'.", measurement_channel)
+        channel_code = 0x01
+
+    roles = {0x01: 2, 0x03: 3, 0x02: 4}.get(mode, 0)
+    if electrodes is not None and (len(electrodes) != roles or not all(0 <= e <= 0xFFFF for e in electrodes)):
+        log.warning("Invalid electrodes %s for a %d-point measurement, using the extension value 0.",
+                    electrodes, roles)
+        electrodes = None
+
+    # 2-byte extension channels (default to 0x0000 if not used)
+    ext = [[*electrode.to_bytes(2, "big")] for electrode in electrodes] if electrodes else [[0x00, 0x00]] * roles
+
+    # Build command based on measurement mode
+    if mode == 0x01:  # 2-point
+        command = [
+            0xB0, 0x09, mode, current_range, voltage_range,
+            channel_code, *ext[0],  # C channel
+            channel_code, *ext[1],  # W channel
+            0xB0
+        ]
+    elif mode == 0x03:  # 3-point
+        command = [
+            0xB0, 0x0C, mode, current_range, voltage_range,
+            channel_code, *ext[0],  # C channel
+            channel_code, *ext[1],  # R channel
+            channel_code, *ext[2],  # W channel
+            0xB0
+        ]
+    elif mode == 0x02:  # 4-point
+        command = [
+            0xB0, 0x0F, mode, current_range, voltage_range,
+            channel_code, *ext[0],  # C channel
+            channel_code, *ext[1],  # R channel
+            channel_code, *ext[2],  # S channel
+            channel_code, *ext[3],  # W channel
+            0xB0
+        ]
+    else:
+        log.error("Unsupported measurement mode. Aborting.")
+        return None
+
+    return FrontendConfig(bytes(command))
@@ -0,0 +1,205 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import serial.tools.list_ports
+
+from ISX3 import ISX3
+from isx3_logging import get_logger
+
+log = get_logger(__name__)
+
+
+def match_ports(port_infos, match: str = None) -> list:
+    """
+    Filters enumerated serial ports, so one enumeration can serve several lookups.
+
+    Args:
+        port_infos (list of ListPortInfo): Ports returned by `serial.tools.list_ports.comports()`.
+        match (str): Case-insensitive text that must appear in the port description,
+        manufacturer or hardware ID. All ports are returned if not given.
+
+    Returns:
+        list of str: Matching port names (e.g., ["COM3", "COM4"]).
+    """
+    ports = []
+    for port in port_infos:
+        if match is not None:
+            text = " ".join(str(field) for field in (port.description, port.manufacturer, port.hwid)).lower()
+            if match.lower() not in text:
+                continue
+        ports.append(port.device)
+    return ports
+
+
+class ISX3Pool:
+
+    def __init__(self, n_el: int, max_workers: int = None) -> None:
+        """
+        Manages several ISX3 units and drives them in parallel.
+
+        Every device gets its own worker thread for blocking serial I/O, so
+        configuration and sweeps of all units overlap in time.
+
+        Args:
+            n_el (int): Number of electrodes used in the measurement setup.
+            max_workers (int): Upper bound for parallel worker threads, defaults to one per device.
+        """
+        self.n_el = n_el
+        self.max_workers = max_workers
+        self.devices = {}
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+    @staticmethod
+    def discover(match: str = None) -> list:
+        """
+        Enumerates the serial ports once and returns the ones that look like ISX3 units.
+
+        Args:
+            match (str): Case-insensitive text that must appear in the port description,
+            manufacturer or hardware ID. All ports are returned if not given.
+
+        Returns:
+            list of str: Matching port names (e.g., ["COM3", "COM4"]).
+        """
+        return match_ports(serial.tools.list_ports.comports(), match)
+
+    def add(self, name: str, isx3: ISX3):
+        """
+        Adds an already connected device handler to the pool.
+
+        Args:
+            name (str): Name used to tag the results of this device.
+            isx3 (ISX3): Connected device handler.
+
+        Returns:
+            None
+        """
+        self.devices[name] = isx3
+
+    def connect_all(self, ports: list = None, match: str = None, profile="FS") -> list:
+        """
+        Connects to every given or discovered port in parallel.
+
+        Args:
+            ports (list of str): Ports to connect to, discovered with `match` if not given.
+            match (str): Filter passed to `discover`.
+            profile (str or TransportProfile): Transport profile of every unit, "auto" probes each one
+            (see `ISX3.connect`).
+
+        Returns:
+            list of str: Ports that were connected successfully.
+        """
+        port_infos = serial.tools.list_ports.comports()
+        available_ports = [p.device for p in port_infos]
+        if ports is None:
+            ports = match_ports(port_infos, match)
+
+        def connect(port):
+            isx3 = ISX3(n_el=self.n_el)
+            isx3.connect(port, profile, available_ports)
+            return isx3
+
+        for port, isx3 in zip(ports, self._map(connect, ports)):
+            if isx3.device is not None:
+                self.devices[port] = isx3
+            else:
+                log.warning("Device on %s could not be connected and is skipped.", port)
+        return list(self.devices)
+
+    def set_fs_settings(self, **settings):
+        """
+        Applies the same frontend settings to all devices in parallel.
+
+        Args:
+            **settings: Keyword arguments of `ISX3.set_fs_settings`.
+
+        Returns:
+            None
+        """
+        self._map(lambda isx3: isx3.set_fs_settings(**settings), self.devices.values())
+
+    def set_setup(self, **setup):
+        """
+        Applies the same measurement setup to all devices in parallel.
+
+        Args:
+            **setup: Keyword arguments of `ISX3.set_setup`.
+
+        Returns:
+            None
+        """
+        self._map(lambda isx3: isx3.set_setup(**setup), self.devices.values())
+
+    def start_measurement(self, spectra: int = 20, result_mode: str = "tuples", csv_directory: str = ".",
+                          reset: bool = True):
+        """
+        Starts a synchronized sweep on all devices and merges the results.
+
+        All worker threads wait at a barrier and send their start frames together.
+        Each device writes its own CSV file named after the device.
+
+        Args:
+            spectra (int): Number of repetitions for each frequency point.
+            result_mode (str): "tuples" or "array", see `ISX3.start_measurement`.
+            csv_directory (str): Directory for the per-device CSV files.
+            reset (bool): Resets every device after the sweep, see `ISX3.start_measurement`.
+
+        Returns:
+            list of tuple or numpy.ndarray: In "tuples" mode one list of
+            (Device, Frequency ID, Real, Imaginary) tuples. In "array" mode a complex64
+            array of shape (devices, spectra, frequency_points) in the order of `devices`.
+            Devices that are not connected are skipped.
+        """
+        names = []
+        for name, isx3 in self.devices.items():
+            if isx3.device is not None:
+                names.append(name)
+            else:
+                log.warning("Device %s is not connected and is skipped.", name)
+
+        if not names:
+            log.error("No connected devices in the pool.")
+            if result_mode == "array":
+                frequency_points = max((isx3.frequency_points for isx3 in self.devices.values()), default=0)
+                return np.empty((0, spectra, frequency_points), dtype=np.complex64)
+            return []
+
+        barrier = threading.Barrier(len(names))
+
+        def measure(name):
+            isx3 = self.devices[name]
+            csv_path = f"{csv_directory}/measurement_results_{_file_safe(name)}.csv"
+            barrier.wait()
+            return isx3.start_measurement(spectra, result_mode, csv_path, reset)
+
+        # Every device needs its own worker, otherwise the barrier could never be passed
+        results = self._map(measure, names, max_workers=len(names))
+        if result_mode == "array":
+            return np.stack(results)
+        return [(name, *row) for name, rows in zip(names, results) for row in rows]
+
+    def close(self):
+        """
+        Closes all serial connections.
+
+        Returns:
+            None
+        """
+        for isx3 in self.devices.values():
+            if isx3.device is not None:
+                isx3.device.close()
+
+    def _map(self, function, items, max_workers: int = None) -> list:
+        items = list(items)
+        if not items:
+            return []
+        max_workers = max_workers or self.max_workers or len(items)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(function, items))
+
+
+def _file_safe(name: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in name).strip("_")
@@ -0,0 +1,136 @@
+import time
+
+import numpy as np
+
+from isx3_logging import get_logger
+from scheduler import SweepScheduler
+
+log = get_logger(__name__)
+
+
+def eit_pattern(n_el: int, injection: str = "adjacent") -> list:
+    """
+    Generates the injection-measurement pattern of one EIT frame.
+
+    Current is injected between electrode C and W, the voltage is measured between
+    every adjacent pair R, S that shares no electrode with the injection pair.
+    Electrodes are numbered from 1.
+
+    Args:
+        n_el (int): Number of electrodes on the ring.
+        injection (str): "adjacent" injects between neighbours, "opposite" between
+        electrodes half the ring apart (requires an even `n_el` of at least 6). Every
+        injection pair is used once, with C the lower electrode.
+
+    Returns:
+        list of tuple: (C, R, S, W) electrodes per measurement, in frame order.
+    """
+    if n_el < 4:
+        log.error("An EIT frame needs at least 4 electrodes, got %d.", n_el)
+        return []
+    if injection == "opposite" and (n_el % 2 or n_el < 6):
+        # With 4 electrodes every adjacent voltage pair touches an opposite injection pair
+        log.warning("Opposite injection needs an even number of at least 6 electrodes, got %d, "
+                    "using adjacent injection.", n_el)
+        injection = "adjacent"
+    elif injection not in ("adjacent", "opposite"):
+        log.warning("Invalid injection pattern '%s', set it to 'adjacent'.", injection)
+        injection = "adjacent"
+
+    offset = n_el // 2 if injection == "opposite" else 1
+    # Opposite pairs repeat with reversed polarity after half the ring
+    injections = n_el // 2 if injection == "opposite" else n_el
+    pattern = []
+    for i in range(injections):
+        c, w = i + 1, (i + offset) % n_el + 1
+        for j in range(n_el):
+            r, s = j + 1, (j + 1) % n_el + 1
+            if not {c, w} & {r, s}:
+                pattern.append((c, r, s, w))
+    return pattern
+
+
+class EITAcquisition:
+
+    def __init__(self, isx3, injection: str = "adjacent", measurement_channel: str = "Extension Port",
+                 current_measurement_range: str = "autoranging", voltage_measurement_range: str = "1V",
+                 stack_size: int = 1) -> None:
+        """
+        Acquires EIT frames by driving the ISX3 through the injection-measurement pattern of `isx3.n_el`.
+
+        The pattern is measured in the order that switches the fewest electrodes, every
+        other frame runs that order backwards so consecutive frames share their boundary
+        configuration. With `stack_size` > 1 several measurements are loaded into the
+        frontend channel stack and measured with one start, a frame that fits into the
+        stack then needs no configuration after the first frame. This relies on the
+        channel order assumed by `SweepScheduler`, which is not confirmed on hardware.
+        Results are always returned in pattern order.
+
+        Args:
+            isx3 (ISX3): Connected device handler with the measurement setup applied.
+            injection (str): "adjacent" or "opposite" injection, see `eit_pattern`.
+            measurement_channel (str): Port of the electrode multiplexer (e.g., "Extension Port").
+            current_measurement_range (str): Current measurement range (e.g., "10mA").
+            voltage_measurement_range (str): Voltage measurement range (e.g., "1V").
+            stack_size (int): Measurements per channel stack, the whole pattern if None. Halved
+            automatically if the device rejects the stack. One measurement per start by default.
+        """
+        self.isx3 = isx3
+        self.pattern = eit_pattern(isx3.n_el, injection)
+        self.scheduler = SweepScheduler(isx3, self.pattern, 4, measurement_channel, current_measurement_range,
+                                        voltage_measurement_range, stack_size=stack_size)
+        self.frames_acquired = 0
+        self.frames_per_second = 0.0
+
+    @property
+    def n_patterns(self) -> int:
+        return len(self.pattern)
+
+    def iter_frames(self, frames: int = None, spectra: int = 1, timeout: float = None):
+        """
+        Yields EIT frames as they are completed.
+
+        Args:
+            frames (int): Number of frames, runs until the generator is closed if not given.
+            spectra (int): Spectra per measurement, averaged into one value per frequency point.
+            timeout (float): Deadline in seconds for the data of one channel stack, derived from the
+            measurement setup if not given.
+
+        Returns:
+            generator of numpy.ndarray: complex64 arrays of shape (n_patterns, frequency_points),
+            missing values are NaN.
+        """
+        scheduler = self.scheduler
+        missing = np.full((spectra, self.isx3.frequency_points), np.nan, dtype=np.complex64)
+        start = time.time()
+        count = 0
+        while frames is None or count < frames:
+            results = scheduler.run(spectra, timeout, reset=False)
+            frame = np.stack([results.get(c, missing) for c in self.pattern])
+            scheduler.batches.reverse()
+
+            count += 1
+            self.frames_acquired += 1
+            self.frames_per_second = count / (time.time() - start)
+            yield frame.mean(axis=1) if spectra > 1 else frame[:, 0]
+
+    def acquire(self, frames: int = 1, spectra: int = 1, timeout: float = None, reset: bool = True):
+        """
+        Acquires a fixed number of EIT frames.
+
+        Args:
+            frames (int): Number of frames.
+            spectra (int): Spectra per measurement, averaged into one value per frequency point.
+            timeout (float): Deadline in seconds for the data of one channel stack, derived from the
+            measurement setup if not given.
+            reset (bool): Resets the device after the last frame.
+
+        Returns:
+            numpy.ndarray: complex64 array of shape (frames, n_patterns, frequency_points).
+        """
+        data = np.stack(list(self.iter_frames(frames, spectra, timeout)))
+        log.info("%d EIT frames of %d patterns acquired at %.2f frames/s.", frames, self.n_patterns,
+                 self.frames_per_second)
+        if reset:
+            self.isx3.software_reset()
+        return data
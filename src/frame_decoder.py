@@ -0,0 +1,296 @@
+import struct
+
+import numpy as np
+
+
+FRAME_START = 0xB8
+FRAME_LENGTH = 0x0A
+FRAME_SIZE = 13
+FRAME_HEADER = bytes([FRAME_START, FRAME_LENGTH])
+
+# freq_id (uint16), real (float32), imaginary (float32), all big-endian
+PAYLOAD_STRUCT = struct.Struct(">Hff")
+
+# Layout of one complete frame, used to decode many frames at once with np.frombuffer
+FRAME_DTYPE = np.dtype([
+    ("start", "u1"),
+    ("length", "u1"),
+    ("freq_id", ">u2"),
+    ("real", ">f4"),
+    ("imag", ">f4"),
+    ("end", "u1"),
+])
+
+
+class FrameDecoder:
+
+    def __init__(self, frequency_points: int = None) -> None:
+        """
+        Incremental decoder for 0xB8 measurement data frames.
+
+        Bytes are appended to one reusable buffer and scanned in bulk, so a
+        frame split across two reads is completed by the next call to `feed`.
+        Bytes that cannot start a valid frame are skipped.
+
+        A candidate frame is rejected, and the scan resumes one byte after its
+        start, if its end byte is wrong, its real or imaginary part is NaN or Inf,
+        or its frequency ID lies outside the sweep. Rejections are counted per
+        cause: framing errors and skipped bytes point to a noisy link, invalid
+        values or IDs inside intact frames rather to a parser or device problem.
+        A frame at the very end of the received data that may be one byte short
+        is held back until the next byte or a `flush` confirms it.
+
+        Args:
+            frequency_points (int): Frequency points per spectrum. Enables the frequency ID range
+            check and the counting of `sequence_gaps`.
+        """
+        self.frequency_points = frequency_points
+        self._buffer = bytearray()
+        self._last_freq_id = None
+        self.bytes_consumed = 0
+        self.frames_decoded = 0
+        self.skipped_bytes = 0
+        self.resync_count = 0
+        self.framing_errors = 0
+        self.invalid_values = 0
+        self.invalid_ids = 0
+        self.sequence_gaps = 0
+
+    def reset(self):
+        """
+        Drops any buffered partial frame and clears all counters.
+
+        Returns:
+            None
+        """
+        self._buffer.clear()
+        self._last_freq_id = None
+        self.bytes_consumed = 0
+        self.frames_decoded = 0
+        self.skipped_bytes = 0
+        self.resync_count = 0
+        self.framing_errors = 0
+        self.invalid_values = 0
+        self.invalid_ids = 0
+        self.sequence_gaps = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of buffered bytes that do not yet form a complete frame.
+        """
+        return len(self._buffer)
+
+    @property
+    def rejected_frames(self) -> int:
+        """
+        Number of candidate frames rejected for a wrong end byte, a NaN/Inf value or an invalid frequency ID.
+        """
+        return self.framing_errors + self.invalid_values + self.invalid_ids
+
+    def feed(self, data, flush: bool = False) -> list:
+        """
+        Adds received bytes and decodes every complete frame.
+
+        Args:
+            data (bytes or bytearray or memoryview): Bytes read from the device.
+            flush (bool): Accepts a held back frame at the end of the data, e.g. once the line is quiet.
+
+        Returns:
+            list of tuple: Decoded frames as (Frequency ID, Real, Imaginary).
+        """
+        self._buffer += data
+        self.bytes_consumed += len(data)
+        offsets, consumed = self._scan(flush=flush)
+
+        unpack_from = PAYLOAD_STRUCT.unpack_from
+        buffer = self._buffer
+        results = [unpack_from(buffer, offset + 2) for offset in offsets]
+
+        del buffer[:consumed]
+        self.frames_decoded += len(offsets)
+        return results
+
+    def feed_raw(self, data, out: bytearray, flush: bool = False) -> int:
+        """
+        Adds received bytes and appends every complete frame to `out` undecoded.
+
+        Consecutive frames are copied as one block, so no Python object is
+        created per frame. Use `frames_to_array` to decode `out` afterwards.
+
+        Args:
+            data (bytes or bytearray or memoryview): Bytes read from the device.
+            out (bytearray): Destination for the raw 13-byte frames.
+            flush (bool): Accepts a held back frame at the end of the data, e.g. once the line is quiet.
+
+        Returns:
+            int: Number of frames appended.
+        """
+        self._buffer += data
+        self.bytes_consumed += len(data)
+        offsets, consumed = self._scan(flush=flush)
+
+        buffer = self._buffer
+        if offsets:
+            run_start = run_end = offsets[0]
+            for offset in offsets:
+                if offset != run_end:
+                    out += buffer[run_start:run_end]
+                    run_start = offset
+                run_end = offset + FRAME_SIZE
+            out += buffer[run_start:run_end]
+
+        del buffer[:consumed]
+        self.frames_decoded += len(offsets)
+        return len(offsets)
+
+    def decode_buffer(self, buffer, start: int = 0, end: int = None) -> list:
+        """
+        Decodes every complete frame of a finished buffer in place, without copying it.
+
+        Works on any buffer with a `find` method, e.g. a bytearray or an mmap of a
+        raw capture file.
+
+        Args:
+            buffer (bytes or bytearray or mmap.mmap): Complete byte stream.
+            start (int): Index of the first byte to decode.
+            end (int): Index after the last byte to decode, defaults to the buffer end.
+
+        Returns:
+            list of tuple: Decoded frames as (Frequency ID, Real, Imaginary).
+        """
+        end = len(buffer) if end is None else end
+        offsets, _ = self._scan(buffer, start, end, flush=True)
+        self.bytes_consumed += end - start
+        self.frames_decoded += len(offsets)
+        unpack_from = PAYLOAD_STRUCT.unpack_from
+        return [unpack_from(buffer, offset + 2) for offset in offsets]
+
+    def extract_frames(self, buffer, start: int = 0, end: int = None):
+        """
+        Gathers every complete frame of a finished buffer into one contiguous array.
+
+        Args:
+            buffer (bytes or bytearray or mmap.mmap): Complete byte stream.
+            start (int): Index of the first byte to decode.
+            end (int): Index after the last byte to decode, defaults to the buffer end.
+
+        Returns:
+            numpy.ndarray: uint8 array of shape (frames, 13), accepted by `frames_to_array`.
+        """
+        end = len(buffer) if end is None else end
+        offsets, _ = self._scan(buffer, start, end, flush=True)
+        self.bytes_consumed += end - start
+        self.frames_decoded += len(offsets)
+        raw = np.frombuffer(buffer, dtype=np.uint8)
+        frames = raw[np.asarray(offsets, dtype=np.intp)[:, None] + np.arange(FRAME_SIZE)]
+        del raw
+        return frames
+
+    def _scan(self, buffer=None, start: int = 0, end: int = None, flush: bool = False):
+        """
+        Locates complete frames in the buffer.
+
+        Args:
+            buffer (bytes or bytearray or mmap.mmap): Buffer to scan, defaults to the internal buffer.
+            start (int): Index to start scanning from.
+            end (int): Index after the last byte to scan, defaults to the buffer end.
+            flush (bool): No byte follows `end` soon, a frame ending there needs no confirmation.
+
+        Returns:
+            tuple: Start offsets of complete frames and the number of leading
+            bytes that can be discarded afterwards.
+        """
+        if buffer is None:
+            buffer = self._buffer
+        end = len(buffer) if end is None else end
+        offsets = []
+        pos = start
+        limit = self.frequency_points
+        last = self._last_freq_id
+
+        while True:
+            idx = buffer.find(FRAME_HEADER, pos, end)
+            if idx < 0:
+                # A trailing start byte may be the first half of the next header
+                keep_from = end - 1 if end > pos and buffer[end - 1] == FRAME_START else end
+                self._skip(keep_from - pos)
+                self._last_freq_id = last
+                return offsets, keep_from
+
+            self._skip(idx - pos)
+            if idx + FRAME_SIZE > end or (
+                    idx + FRAME_SIZE == end and not flush and buffer[end - 2] == FRAME_START):
+                # Partial frame, or a frame that may be one byte short, wait for the next byte
+                self._last_freq_id = last
+                return offsets, idx
+
+            # Rejected candidates resync one byte further, the next find skips to the next header.
+            # A frame one byte short ends on the start byte of the following header instead of its own.
+            if buffer[idx + FRAME_SIZE - 1] != FRAME_START or (
+                    idx + FRAME_SIZE < end and buffer[idx + FRAME_SIZE] == FRAME_LENGTH):
+                self.framing_errors += 1
+                self._skip(1)
+                pos = idx + 1
+                continue
+
+            # A float32 with all exponent bits set is NaN or Inf
+            if (((buffer[idx + 4] & 0x7F) == 0x7F and buffer[idx + 5] & 0x80)
+                    or ((buffer[idx + 8] & 0x7F) == 0x7F and buffer[idx + 9] & 0x80)):
+                self.invalid_values += 1
+                self._skip(1)
+                pos = idx + 1
+                continue
+
+            if limit:
+                freq_id = buffer[idx + 2] << 8 | buffer[idx + 3]
+                if freq_id >= limit:
+                    self.invalid_ids += 1
+                    self._skip(1)
+                    pos = idx + 1
+                    continue
+                if last is not None and freq_id != (last + 1) % limit:
+                    # Lost frames leave a gap, the frame itself is still valid
+                    self.sequence_gaps += 1
+                last = freq_id
+
+            offsets.append(idx)
+            pos = idx + FRAME_SIZE
+
+    def _skip(self, count: int):
+        if count > 0:
+            self.skipped_bytes += count
+            self.resync_count += 1
+
+
+def frames_to_array(raw_frames, spectra: int, frequency_points: int):
+    """
+    Decodes raw frames collected by `FrameDecoder.feed_raw` in one pass.
+
+    A new spectrum starts whenever the frequency ID does not increase, so a
+    dropped frame leaves a NaN slot instead of shifting all following values.
+
+    Args:
+        raw_frames (bytes or bytearray or numpy.ndarray): Concatenated 13-byte measurement frames.
+        spectra (int): Number of measured spectra (rows of the result).
+        frequency_points (int): Number of frequency points per spectrum (columns).
+
+    Returns:
+        numpy.ndarray: complex64 array of shape (spectra, frequency_points),
+        missing values are NaN.
+    """
+    result = np.full((spectra, frequency_points), complex(np.nan, np.nan), dtype=np.complex64)
+    records = np.frombuffer(raw_frames, dtype=FRAME_DTYPE, count=memoryview(raw_frames).nbytes // FRAME_SIZE)
+    if records.size == 0:
+        return result
+
+    freq_ids = records["freq_id"].astype(np.int64)
+    rows = np.zeros(freq_ids.size, dtype=np.int64)
+    np.cumsum(np.diff(freq_ids) <= 0, out=rows[1:])
+
+    valid = (rows < spectra) & (freq_ids < frequency_points)
+    rows = rows[valid]
+    freq_ids = freq_ids[valid]
+    result.real[rows, freq_ids] = records["real"][valid]
+    result.imag[rows, freq_ids] = records["imag"][valid]
+    return result
@@ -0,0 +1,184 @@
+import bisect
+import threading
+import time
+
+# Upper bounds in seconds of the histogram buckets, the last bucket catches everything above
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+class Histogram:
+
+    def __init__(self, buckets=DEFAULT_BUCKETS) -> None:
+        """
+        Cumulative histogram of observed values in fixed buckets.
+
+        Args:
+            buckets (tuple of float): Sorted upper bucket bounds.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "buckets": dict(zip([*self.buckets, float("inf")], self.counts)),
+        }
+
+
+class _Phase:
+
+    def __init__(self, metrics, name: str) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.metrics.observe(f"{self.name}_seconds", time.perf_counter() - self.start)
+
+
+class Metrics:
+
+    def __init__(self, prefix: str = "isx3", buckets=DEFAULT_BUCKETS, callbacks=None) -> None:
+        """
+        Counters and histograms for the hot paths of the ISX3 driver.
+
+        The driver only touches a Metrics object if one is attached with
+        `ISX3.enable_metrics`, so a disabled driver pays a single `None` check
+        per instrumented call.
+
+        Args:
+            prefix (str): Prefix of the exported metric names.
+            buckets (tuple of float): Histogram bucket bounds in seconds.
+            callbacks (list of callable): Hooks called with (kind, name, value) for every
+            recorded value, kind is "counter" or "histogram".
+        """
+        self.prefix = prefix
+        self.buckets = buckets
+        self.counters = {}
+        self.histograms = {}
+        self.callbacks = list(callbacks or [])
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback):
+        """
+        Registers a hook that receives every recorded value, e.g. to forward it to a monitoring system.
+
+        Args:
+            callback (callable): Called with (kind, name, value).
+
+        Returns:
+            None
+        """
+        self.callbacks.append(callback)
+
+    def count(self, name: str, value: int = 1):
+        """
+        Increments a counter.
+
+        Args:
+            name (str): Counter name (e.g., "bytes_read").
+            value (int): Increment.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        for callback in self.callbacks:
+            callback("counter", name, value)
+
+    def observe(self, name: str, value: float):
+        """
+        Records a value, usually a duration in seconds, in a histogram.
+
+        Args:
+            name (str): Histogram name (e.g., "ack_latency_seconds").
+            value (float): Observed value.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.buckets)
+            histogram.observe(value)
+        for callback in self.callbacks:
+            callback("histogram", name, value)
+
+    def phase(self, name: str):
+        """
+        Times a block and records its duration in the histogram "<name>_seconds".
+
+        Args:
+            name (str): Phase name (e.g., "reset").
+
+        Returns:
+            context manager: Measures the time spent inside the with-block.
+        """
+        return _Phase(self, name)
+
+    def reset(self):
+        """
+        Clears all counters and histograms.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Returns a copy of all recorded values.
+
+        Returns:
+            dict: {"counters": {...}, "histograms": {...}} with one summary dict per histogram.
+        """
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {name: histogram.snapshot() for name, histogram in self.histograms.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Formats all values in the Prometheus text exposition format.
+
+        Returns:
+            str: Counters as "<prefix>_<name>_total", histograms with cumulative buckets.
+        """
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = f"{self.prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+            for name, histogram in sorted(self.histograms.items()):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip([*histogram.buckets, "+Inf"], histogram.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f"{metric}_sum {histogram.sum}")
+                lines.append(f"{metric}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,175 @@
+import contextlib
+import logging
+import threading
+import time
+
+# Parent logger of all driver modules, configure its level and handlers to control the output
+LOGGER_NAME = "isx3"
+
+
+class RateLimitFilter(logging.Filter):
+
+    def __init__(self, rate: float = 5.0, burst: int = 20) -> None:
+        """
+        Token bucket that limits how often the same log message is emitted.
+
+        Messages are grouped by logger and format string, so a repeated warning in a
+        read loop is throttled without hiding other messages. The number of
+        suppressed records is appended to the next record that passes.
+
+        Args:
+            rate (float): Messages per second and group that pass in the long run, None disables the limit.
+            burst (int): Messages per group that may pass at once.
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate is None:
+            return True
+
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            tokens, last, suppressed = self._buckets.get(key, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens < 1.0:
+                self._buckets[key] = (tokens, now, suppressed + 1)
+                return False
+            self._buckets[key] = (tokens - 1.0, now, 0)
+
+        if suppressed and isinstance(record.args, tuple):
+            record.msg = f"{record.msg} (%d similar messages suppressed)"
+            record.args = (*record.args, suppressed)
+        return True
+
+
+RATE_LIMIT = RateLimitFilter()
+
+
+class WarningRecorder(logging.Filter):
+
+    def __init__(self) -> None:
+        """
+        Holds back the warnings and errors the current thread logs while `record_warnings` is active.
+
+        The recorded messages are emitted later with `replay`, e.g. every time a memoized
+        configuration is reused, so a cache hit reports the same invalid input as the first call.
+        """
+        super().__init__()
+        self._local = threading.local()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        messages = getattr(self._local, "messages", None)
+        if messages is None or record.levelno < logging.WARNING:
+            return True
+        messages.append((record.name, record.levelno, record.msg, record.args))
+        return False
+
+
+WARNING_RECORDER = WarningRecorder()
+
+
+@contextlib.contextmanager
+def record_warnings():
+    """
+    Records instead of emits the warnings the driver loggers receive in the current thread.
+
+    Yields:
+        list: (logger name, level, message, args) of every held back record, see `replay`.
+    """
+    previous = getattr(WARNING_RECORDER._local, "messages", None)
+    messages = WARNING_RECORDER._local.messages = []
+    try:
+        yield messages
+    finally:
+        WARNING_RECORDER._local.messages = previous
+
+
+def replay(messages):
+    """
+    Emits messages collected by `record_warnings`, subject to the rate limit like any other record.
+
+    Args:
+        messages (iterable): (logger name, level, message, args) tuples.
+
+    Returns:
+        None
+    """
+    for name, level, msg, args in messages:
+        if isinstance(args, tuple):
+            logging.getLogger(name).log(level, msg, *args)
+        else:
+            logging.getLogger(name).log(level, msg, args)
+
+
+class LazyHex:
+
+    def __init__(self, data) -> None:
+        """
+        Defers the hex formatting of a byte buffer until a log record is actually emitted.
+
+        Args:
+            data (bytes or bytearray): Bytes to show.
+        """
+        self.data = data
+
+    def __str__(self) -> str:
+        return bytes(self.data).hex(" ")
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Returns the rate-limited logger of a driver module.
+
+    Args:
+        name (str): Module name, usually `__name__`.
+
+    Returns:
+        logging.Logger: Child of the "isx3" logger.
+    """
+    logger = logging.getLogger(f"{LOGGER_NAME}.{name.rsplit('.', 1)[-1]}")
+    # The recorder runs first, so held back records do not use up the rate limit
+    if WARNING_RECORDER not in logger.filters:
+        logger.addFilter(WARNING_RECORDER)
+    if RATE_LIMIT not in logger.filters:
+        logger.addFilter(RATE_LIMIT)
+    return logger
+
+
+def set_rate_limit(rate: float = 5.0, burst: int = 20):
+    """
+    Changes the rate limit of all driver loggers.
+
+    Args:
+        rate (float): Messages per second and message that pass in the long run, None disables the limit.
+        burst (int): Messages that may pass at once.
+
+    Returns:
+        None
+    """
+    RATE_LIMIT.rate = rate
+    RATE_LIMIT.burst = burst
+
+
+def configure_logging(level: int = logging.INFO, fmt: str = "%(message)s"):
+    """
+    Sends the driver output to the console, e.g. for scripts that used to rely on the printed messages.
+
+    Args:
+        level (int): Lowest level that is shown, DEBUG also shows the raw message buffers.
+        fmt (str): Format of the console output.
+
+    Returns:
+        logging.Logger: The configured "isx3" logger.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(fmt))
+        logger.addHandler(handler)
+    return logger
@@ -0,0 +1,400 @@
+import math
+import os
+import random
+import select
+import socket
+import struct
+import threading
+import time
+
+from analysis import frequency_axis
+from device_config import SetupConfig
+
+SYSTEM_MESSAGE = 0x18
+ACK = bytes([0x18, 0x01, 0x83, 0x18])
+NACK_NOT_EXECUTED = bytes([0x18, 0x01, 0x81, 0x18])
+NACK_UNKNOWN = bytes([0x18, 0x01, 0x82, 0x18])
+WAKE_UP = bytes([0x18, 0x01, 0x04, 0x18])
+SYSTEM_READY = bytes([0x18, 0x01, 0x84, 0x18])
+TCP_SOCKET = bytes([0x18, 0x01, 0x11, 0x18])
+
+# Upper bound for frames generated per call, keeps memory flat for huge sweeps
+MAX_FRAMES_PER_PRODUCE = 8192
+
+
+class SimulatedISX3:
+
+    def __init__(self, name: str = "SIM", timeout: float = 1.0, rate: float = None, noise: float = 0.0,
+                 garbage_rate: float = 0.0, drop_rate: float = 0.0, resistance: float = 1000.0,
+                 capacitance: float = 1e-7, seed: int = 0, ready_delay: float = 0.0,
+                 start_delay: float = 0.0, max_channels: int = None) -> None:
+        """
+        In-process ISX3 emulator with the interface of serial.Serial.
+
+        Understands the 0xB0/0xB1 frontend, 0x86/0xB6 setup, 0xB8 start/stop and
+        0xA1 reset frames used by the ISX3 driver and answers with ACK messages.
+        After a start frame it streams measurement frames of an R || C circuit
+        at `rate` frames per second.
+
+        Args:
+            name (str): Port name reported as `name`.
+            timeout (float): Time in seconds a read waits for data, like serial.Serial.timeout.
+            rate (float): Measurement frames per second, all frames are available at once if not given.
+            noise (float): Relative Gaussian noise added to the real and imaginary part.
+            garbage_rate (float): Probability of a random byte being inserted before a frame.
+            drop_rate (float): Probability of every single frame byte being dropped.
+            resistance (float): Resistance of the simulated circuit in Ohm.
+            capacitance (float): Capacitance of the simulated circuit in Farad.
+            seed (int): Seed for the random generator, so runs are reproducible.
+            ready_delay (float): Time in seconds between the wake-up and the system-ready message after a reset.
+            start_delay (float): Time in seconds between a start frame and the first measurement frame.
+            max_channels (int): Size of the frontend channel stack, further channels are rejected. Unlimited if not given.
+        """
+        self.name = name
+        self.port = name
+        self.timeout = timeout
+        self.rate = rate
+        self.noise = noise
+        self.garbage_rate = garbage_rate
+        self.drop_rate = drop_rate
+        self.resistance = resistance
+        self.capacitance = capacitance
+        self.ready_delay = ready_delay
+        self.start_delay = start_delay
+        self.max_channels = max_channels
+        self.is_open = True
+
+        self.channels = []
+        self.setup = None
+        self.frequency_points = 1
+        self.commands_received = 0
+
+        self._rng = random.Random(seed)
+        self._impedance = [complex(resistance, 0.0)]
+        self._input = bytearray()
+        self._output = bytearray()
+        self._stream = None
+        # Messages sent later, as (send time, bytes)
+        self._scheduled = []
+        self._lock = threading.Condition()
+
+    @property
+    def in_waiting(self) -> int:
+        with self._lock:
+            self._produce()
+            return len(self._output)
+
+    def write(self, data) -> int:
+        """
+        Receives command bytes, complete frames are answered immediately.
+
+        Args:
+            data (bytes or bytearray): Command bytes.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        with self._lock:
+            self._input += data
+            self._handle_commands()
+            self._lock.notify_all()
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        """
+        Reads up to `size` bytes, waiting at most `timeout` seconds for the first one.
+
+        Args:
+            size (int): Maximum number of bytes.
+
+        Returns:
+            bytes: Received bytes, empty if the read timed out.
+        """
+        deadline = None if self.timeout is None else time.time() + self.timeout
+        with self._lock:
+            while True:
+                self._produce()
+                if self._output:
+                    data = bytes(self._output[:size])
+                    del self._output[:size]
+                    return data
+
+                wait = None if deadline is None else deadline - time.time()
+                if wait is not None and wait <= 0:
+                    return b""
+                next_frame = self._next_frame_time()
+                if next_frame is not None:
+                    wait = next_frame - time.time() if wait is None else min(wait, next_frame - time.time())
+                self._lock.wait(None if wait is None else max(wait, 0.0))
+
+    def reset_input_buffer(self):
+        with self._lock:
+            self._produce()
+            self._output.clear()
+
+    def reset_output_buffer(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+    def _handle_commands(self):
+        buffer = self._input
+        while len(buffer) >= 3:
+            frame_end = buffer[1] + 3
+            if len(buffer) < frame_end:
+                return
+            if buffer[frame_end - 1] != buffer[0]:
+                # Not a frame boundary, drop one byte and resync
+                del buffer[:1]
+                continue
+            frame = bytes(buffer[:frame_end])
+            del buffer[:frame_end]
+            self.commands_received += 1
+            self._handle_frame(frame)
+
+    def _handle_frame(self, frame: bytes):
+        command = frame[0]
+        data = frame[2:-1]
+
+        if command == 0xB0:
+            if data == b"\xFF\xFF\xFF":
+                self.channels = []
+            elif self.max_channels is not None and len(self.channels) >= self.max_channels:
+                self._output += NACK_NOT_EXECUTED
+                return
+            else:
+                self.channels.append(data)
+            self._output += ACK
+        elif command == 0xB1:
+            if data == b"\x02\x00":
+                self._output += bytes([0xB1, 0x02, *len(self.channels).to_bytes(2, "big"), 0xB1])
+            elif len(data) == 1 and 1 <= data[0] <= len(self.channels):
+                channel = self.channels[data[0] - 1]
+                self._output += bytes([0xB1, len(channel)]) + channel + bytes([0xB1])
+            self._output += ACK
+        elif command == 0x86:
+            self.setup = None
+            self._output += ACK
+        elif command == 0xB6:
+            self._apply_setup(data)
+            self._output += ACK
+        elif command == 0xB8:
+            if len(data) == 3 and data[0] == 0x01:
+                spectra = int.from_bytes(data[1:3], "big")
+                self._output += ACK
+                # Every channel of the frontend stack is measured for each spectrum
+                total = spectra * self.frequency_points * max(1, len(self.channels))
+                self._stream = {"total": total, "emitted": 0, "start": time.time() + self.start_delay}
+            else:
+                self._stream = None
+                self._output += ACK
+        elif command == 0xA1:
+            self._stream = None
+            self.channels = []
+            self._output += ACK + WAKE_UP
+            if self.ready_delay:
+                self._scheduled.append((time.time() + self.ready_delay, SYSTEM_READY))
+            else:
+                self._output += SYSTEM_READY
+        else:
+            self._output += NACK_UNKNOWN
+
+    def _apply_setup(self, data: bytes):
+        if len(data) < 22 or data[0] != 0x03:
+            return
+        count = struct.unpack_from(">f", data, 9)[0]
+        self.setup = data
+        self.frequency_points = max(int(count), 1)
+
+        frequencies = frequency_axis(SetupConfig(bytes([0xB6, len(data), *data, 0xB6]), self.frequency_points))
+        self._impedance = (self.resistance / (1.0 + 2j * math.pi * frequencies * self.resistance
+                                              * self.capacitance)).tolist()
+
+    def _next_frame_time(self):
+        times = [send_time for send_time, _ in self._scheduled]
+        stream = self._stream
+        if stream is not None and stream["emitted"] < stream["total"]:
+            if self.rate is not None:
+                times.append(stream["start"] + (stream["emitted"] + 1) / self.rate)
+            elif stream["start"] > time.time():
+                times.append(stream["start"])
+        return min(times, default=None)
+
+    def _produce(self):
+        if self._scheduled:
+            now = time.time()
+            for send_time, message in self._scheduled:
+                if send_time <= now:
+                    self._output += message
+            self._scheduled = [item for item in self._scheduled if item[0] > now]
+
+        stream = self._stream
+        if stream is None or stream["start"] > time.time():
+            return
+        due = min(stream["total"], stream["emitted"] + MAX_FRAMES_PER_PRODUCE)
+        if self.rate is not None:
+            due = min(due, int((time.time() - stream["start"]) * self.rate))
+
+        rng = self._rng
+        n = self.frequency_points
+        for k in range(stream["emitted"], due):
+            freq_id = k % n
+            z = self._impedance[freq_id]
+            real, imag = z.real, z.imag
+            if self.noise:
+                real += abs(real) * self.noise * rng.gauss(0.0, 1.0)
+                imag += abs(imag) * self.noise * rng.gauss(0.0, 1.0)
+            frame = struct.pack(">BBHffB", 0xB8, 0x0A, freq_id, real, imag, 0xB8)
+            if self.garbage_rate and rng.random() < self.garbage_rate:
+                self._output.append(rng.randrange(256))
+            if self.drop_rate:
+                frame = bytes(b for b in frame if rng.random() >= self.drop_rate)
+            self._output += frame
+        stream["emitted"] = max(stream["emitted"], due)
+
+
+class PtyBridge:
+
+    def __init__(self, simulator: SimulatedISX3) -> None:
+        """
+        Exposes a simulator on a pseudo-terminal, so a real serial.Serial can open it (Linux/macOS).
+
+        Args:
+            simulator (SimulatedISX3): Simulator that answers the traffic.
+        """
+        import tty
+
+        self.simulator = simulator
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._forward_commands, name="ISX3-pty-in", daemon=True),
+            threading.Thread(target=self._forward_responses, name="ISX3-pty-out", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Stops forwarding and closes the pseudo-terminal.
+
+        Returns:
+            None
+        """
+        self._running = False
+        for thread in self._threads:
+            thread.join(1.0)
+        os.close(self._master)
+        os.close(self._slave)
+
+    def _forward_commands(self):
+        while self._running:
+            readable, _, _ = select.select([self._master], [], [], 0.1)
+            if readable:
+                self.simulator.write(os.read(self._master, 4096))
+
+    def _forward_responses(self):
+        self.simulator.timeout = 0.1
+        while self._running:
+            data = self.simulator.read(4096)
+            if data:
+                os.write(self._master, data)
+
+
+class TcpServer:
+
+    def __init__(self, simulator: SimulatedISX3, host: str = "127.0.0.1", port: int = 0) -> None:
+        """
+        Exposes a simulator on a local TCP port, so the driver can connect with the TCP profile.
+
+        Like the Ethernet interface, one client is served at a time and greeted with
+        the TCP socket system message (0x11).
+
+        Args:
+            simulator (SimulatedISX3): Simulator that answers the traffic.
+            host (str): Address to listen on.
+            port (int): Port to listen on, a free port is chosen if 0.
+        """
+        self.simulator = simulator
+        self._server = socket.create_server((host, port))
+        self.host, self.port = self._server.getsockname()[:2]
+        self.address = f"{self.host}:{self.port}"
+        self.clients_served = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="ISX3-tcp-server", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Stops serving and closes the listening socket.
+
+        Returns:
+            None
+        """
+        self._running = False
+        self._thread.join(1.0)
+        self._server.close()
+
+    def _serve(self):
+        while self._running:
+            readable, _, _ = select.select([self._server], [], [], 0.1)
+            if not readable:
+                continue
+            client, _ = self._server.accept()
+            with client:
+                self.clients_served += 1
+                client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self._handle(client)
+
+    def _handle(self, client: socket.socket):
+        # Output left over from the previous client is dropped
+        self.simulator.reset_input_buffer()
+        client.sendall(TCP_SOCKET)
+
+        connected = threading.Event()
+        connected.set()
+        responder = threading.Thread(target=self._forward_responses, args=(client, connected),
+                                     name="ISX3-tcp-out", daemon=True)
+        responder.start()
+        try:
+            while self._running:
+                readable, _, _ = select.select([client], [], [], 0.1)
+                if not readable:
+                    continue
+                data = client.recv(4096)
+                if not data:
+                    break
+                self.simulator.write(data)
+        except OSError:
+            pass
+        finally:
+            connected.clear()
+            responder.join(1.0)
+
+    def _forward_responses(self, client: socket.socket, connected: threading.Event):
+        self.simulator.timeout = 0.1
+        while self._running and connected.is_set():
+            data = self.simulator.read(65536)
+            if data:
+                try:
+                    client.sendall(data)
+                except OSError:
+                    return
@@ -1,9 +1,18 @@
-from src.ISX3 import ISX3
+import sys
 
+from ISX3 import ISX3
+from isx3_logging import configure_logging
+
+configure_logging()  # shows the driver messages on the console, use logging.DEBUG for raw buffers
 
 try:
     isx3 = ISX3(n_el=4)
-    isx3.connect_device_fs(port="COM3")  # change to com port if necessary
+    if "--simulate" in sys.argv:
+        # runs without hardware against the software emulator
+        from isx3_simulator import SimulatedISX3
+        isx3.device = SimulatedISX3(rate=1000, noise=0.01)
+    else:
+        isx3.connect_device_fs(port="COM3")  # change to com port if necessary
 
     isx3.set_fs_settings(
         measurement_mode=2,
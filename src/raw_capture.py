@@ -0,0 +1,182 @@
+import argparse
+import mmap
+import struct
+
+from frame_decoder import FrameDecoder, frames_to_array
+from isx3_logging import configure_logging, get_logger
+from result_writers import open_writer
+
+log = get_logger(__name__)
+
+# File header: magic and number of captured bytes, followed by the raw serial byte stream
+CAPTURE_MAGIC = b"ISX3RAW1"
+CAPTURE_HEADER = struct.Struct("<8sQ")
+
+
+class RawCapture:
+
+    def __init__(self, path: str, capacity: int) -> None:
+        """
+        Captures the raw serial byte stream into a preallocated memory-mapped file.
+
+        Received chunks are copied into the mapping as they are, nothing is
+        decoded. The header keeps the number of captured bytes up to date, so a
+        capture is usable even if the process is killed.
+
+        Args:
+            path (str): Capture file path, an existing file is replaced.
+            capacity (int): Maximum number of bytes to capture.
+        """
+        self.path = path
+        self.capacity = capacity
+        self.position = 0
+        self.dropped_bytes = 0
+
+        with open(path, "wb") as file:
+            file.truncate(CAPTURE_HEADER.size + capacity)
+        self._file = open(path, "r+b")
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        CAPTURE_HEADER.pack_into(self._mmap, 0, CAPTURE_MAGIC, 0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def full(self) -> bool:
+        return self.position >= self.capacity
+
+    def write(self, data) -> int:
+        """
+        Appends received bytes to the capture.
+
+        Args:
+            data (bytes or bytearray): Bytes read from the device.
+
+        Returns:
+            int: Number of bytes stored, less than `len(data)` once the capture is full.
+        """
+        count = min(len(data), self.capacity - self.position)
+        if count < len(data):
+            self.dropped_bytes += len(data) - count
+
+        start = CAPTURE_HEADER.size + self.position
+        self._mmap[start:start + count] = memoryview(data)[:count]
+        self.position += count
+        CAPTURE_HEADER.pack_into(self._mmap, 0, CAPTURE_MAGIC, self.position)
+        return count
+
+    def close(self):
+        """
+        Flushes the mapping to disk and closes the file.
+
+        Returns:
+            None
+        """
+        if self._mmap.closed:
+            return
+        self._mmap.flush()
+        self._mmap.close()
+        self._file.close()
+
+
+class CaptureReader:
+
+    def __init__(self, path: str) -> None:
+        """
+        Opens a raw capture file read-only as a memory map for replay.
+
+        Args:
+            path (str): Capture file written by `RawCapture`.
+
+        Raises:
+            ValueError: If the file is not a raw capture.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.length = CAPTURE_HEADER.unpack_from(self._mmap, 0)
+        if magic != CAPTURE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an ISX3 raw capture file.")
+        self.decoder = FrameDecoder()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def frames(self) -> list:
+        """
+        Decodes every frame of the capture directly from the mapping.
+
+        Returns:
+            list of tuple: Decoded frames as (Frequency ID, Real, Imaginary).
+        """
+        return self.decoder.decode_buffer(self._mmap, CAPTURE_HEADER.size, CAPTURE_HEADER.size + self.length)
+
+    def to_array(self, spectra: int, frequency_points: int):
+        """
+        Decodes the capture into a complex array without per-frame Python objects.
+
+        Args:
+            spectra (int): Number of measured spectra (rows of the result).
+            frequency_points (int): Number of frequency points per spectrum (columns).
+
+        Returns:
+            numpy.ndarray: complex64 array of shape (spectra, frequency_points), missing values are NaN.
+        """
+        self.decoder.frequency_points = frequency_points
+        raw_frames = self.decoder.extract_frames(self._mmap, CAPTURE_HEADER.size, CAPTURE_HEADER.size + self.length)
+        return frames_to_array(raw_frames, spectra, frequency_points)
+
+    def close(self):
+        """
+        Closes the mapping and the file.
+
+        Returns:
+            None
+        """
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+
+def replay(path: str, output: str = None) -> list:
+    """
+    Decodes a raw capture file and optionally writes the results.
+
+    Args:
+        path (str): Capture file written by `RawCapture`.
+        output (str): Result file passed to `open_writer` (.bin, .csv, .parquet, .h5).
+
+    Returns:
+        list of tuple: Decoded frames as (Frequency ID, Real, Imaginary).
+    """
+    with CaptureReader(path) as reader:
+        frames = reader.frames()
+        log.info("%d frames decoded from %d bytes, %d bytes skipped, %d frames rejected.", len(frames),
+                 reader.length, reader.decoder.skipped_bytes, reader.decoder.rejected_frames)
+
+    if output is not None and frames:
+        freq_id, real, imag = zip(*frames)
+        with open_writer(output) as writer:
+            writer.write_columns(freq_id, real, imag)
+        log.info("%d Measurement Results were written into %s.", len(frames), output)
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an ISX3 raw capture file through the frame decoder")
+    parser.add_argument("capture", help="capture file written by ISX3.capture_raw")
+    parser.add_argument("-o", "--output", help="result file (.bin, .csv, .parquet, .h5)")
+    args = parser.parse_args()
+    configure_logging()
+    replay(args.capture, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import abc
+import csv
+import os
+import queue
+import threading
+
+import numpy as np
+
+from frame_decoder import FRAME_DTYPE, FRAME_SIZE
+from isx3_logging import get_logger
+
+log = get_logger(__name__)
+
+
+# Record layout of the raw binary result format: 10 bytes per result, big-endian
+RESULT_DTYPE = np.dtype([("freq_id", ">u2"), ("real", ">f4"), ("imag", ">f4")])
+
+
+class ResultWriter(abc.ABC):
+
+    @abc.abstractmethod
+    def write_columns(self, freq_id, real, imag):
+        """
+        Writes one batch of results.
+
+        Args:
+            freq_id (numpy.ndarray): Frequency IDs.
+            real (numpy.ndarray): Real parts.
+            imag (numpy.ndarray): Imaginary parts.
+
+        Returns:
+            None
+        """
+
+    def flush(self):
+        """
+        Pushes buffered data to disk.
+
+        Returns:
+            None
+        """
+
+    def close(self):
+        """
+        Flushes and closes the output file.
+
+        Returns:
+            None
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class RawBinaryWriter(ResultWriter):
+
+    def __init__(self, path: str) -> None:
+        """
+        Appends results as fixed-size big-endian records (see `RESULT_DTYPE`).
+
+        Existing files are extended, never overwritten. Read them back with
+        `read_raw_binary`.
+
+        Args:
+            path (str): Output file path.
+        """
+        self.path = path
+        self._file = open(path, "ab")
+
+    def write_columns(self, freq_id, real, imag):
+        records = np.empty(len(freq_id), dtype=RESULT_DTYPE)
+        records["freq_id"] = freq_id
+        records["real"] = real
+        records["imag"] = imag
+        self._file.write(records.tobytes())
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class CsvWriter(ResultWriter):
+
+    def __init__(self, path: str) -> None:
+        """
+        Appends results to a CSV file, one batch of rows per write.
+
+        The header is only written if the file is new or empty.
+
+        Args:
+            path (str): Output file path.
+        """
+        self.path = path
+        self._file = open(path, mode="a", newline='')
+        self._writer = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self._writer.writerow(["Frequency ID", "Real Part", "Imaginary Part"])
+
+    def write_columns(self, freq_id, real, imag):
+        self._writer.writerows(zip(np.asarray(freq_id).tolist(), np.asarray(real).tolist(),
+                                   np.asarray(imag).tolist()))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter(ResultWriter):
+
+    def __init__(self, path: str) -> None:
+        """
+        Writes results to a Parquet file, one row group per batch.
+
+        Requires the `pyarrow` package. Parquet files cannot be appended to, an
+        existing file at `path` is replaced.
+
+        Args:
+            path (str): Output file path.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self._pa = pa
+        self._schema = pa.schema([("freq_id", pa.uint16()), ("real", pa.float32()), ("imag", pa.float32())])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write_columns(self, freq_id, real, imag):
+        pa = self._pa
+        table = pa.Table.from_arrays([
+            pa.array(np.asarray(freq_id, dtype=np.uint16)),
+            pa.array(np.asarray(real, dtype=np.float32)),
+            pa.array(np.asarray(imag, dtype=np.float32)),
+        ], schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+
+class HDF5Writer(ResultWriter):
+
+    def __init__(self, path: str, group: str = "results") -> None:
+        """
+        Appends results to resizable, chunked datasets in an HDF5 file.
+
+        Requires the `h5py` package. Existing datasets in `group` are extended.
+
+        Args:
+            path (str): Output file path.
+            group (str): HDF5 group holding the freq_id, real and imag datasets.
+        """
+        import h5py
+
+        self.path = path
+        self._file = h5py.File(path, "a")
+        group = self._file.require_group(group)
+        self._datasets = [
+            group[name] if name in group
+            else group.create_dataset(name, shape=(0,), maxshape=(None,), dtype=dtype, chunks=(65536,))
+            for name, dtype in (("freq_id", np.uint16), ("real", np.float32), ("imag", np.float32))
+        ]
+
+    def write_columns(self, freq_id, real, imag):
+        for dataset, values in zip(self._datasets, (freq_id, real, imag)):
+            start = dataset.shape[0]
+            dataset.resize((start + len(values),))
+            dataset[start:] = values
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+WRITERS_BY_EXTENSION = {
+    ".bin": RawBinaryWriter,
+    ".raw": RawBinaryWriter,
+    ".csv": CsvWriter,
+    ".parquet": ParquetWriter,
+    ".h5": HDF5Writer,
+    ".hdf5": HDF5Writer,
+}
+
+
+def open_writer(path: str) -> ResultWriter:
+    """
+    Opens the result writer matching the file extension of `path`.
+
+    Args:
+        path (str): Output file path (.bin/.raw, .csv, .parquet or .h5/.hdf5).
+
+    Returns:
+        ResultWriter: The opened writer. Unknown extensions fall back to CSV.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    writer_class = WRITERS_BY_EXTENSION.get(extension)
+    if writer_class is None:
+        log.warning("Unknown result file extension '%s', writing CSV.", extension)
+        writer_class = CsvWriter
+    return writer_class(path)
+
+
+def read_raw_binary(path: str):
+    """
+    Memory-maps a file written by `RawBinaryWriter`.
+
+    Args:
+        path (str): File path.
+
+    Returns:
+        numpy.ndarray: Structured array with the fields freq_id, real and imag.
+    """
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=RESULT_DTYPE)
+    return np.memmap(path, dtype=RESULT_DTYPE, mode="r")
+
+
+class WriterThread:
+
+    def __init__(self, writer: ResultWriter, batch_size: int = 8192, max_pending_batches: int = 64) -> None:
+        """
+        Runs a ResultWriter on its own thread and feeds it in batches.
+
+        Frames are collected into batches of `batch_size` and handed to the
+        writer thread through a bounded queue, so memory stays flat during long
+        runs. If the disk falls behind, `submit` blocks once `max_pending_batches`
+        batches are waiting.
+
+        Args:
+            writer (ResultWriter): Writer that receives the batches.
+            batch_size (int): Frames per batch.
+            max_pending_batches (int): Maximum number of queued batches.
+        """
+        self.writer = writer
+        self.batch_size = batch_size
+        self.frames_written = 0
+        self.batches_written = 0
+        self.error = None
+        self._batch = []
+        self._queue = queue.Queue(maxsize=max_pending_batches)
+        self._thread = threading.Thread(target=self._run, name="ISX3-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def submit(self, frames):
+        """
+        Queues decoded frames for writing.
+
+        Args:
+            frames (list of tuple): Frames as (Frequency ID, Real, Imaginary).
+
+        Returns:
+            None
+        """
+        self._batch.extend(frames)
+        if len(self._batch) >= self.batch_size:
+            self._queue.put(self._batch)
+            self._batch = []
+
+    def submit_raw(self, raw_frames):
+        """
+        Queues raw 13-byte frames collected by `FrameDecoder.feed_raw` for writing.
+
+        Args:
+            raw_frames (bytes or bytearray): Concatenated complete frames.
+
+        Returns:
+            None
+        """
+        self._flush_batch()
+        if raw_frames:
+            self._queue.put(bytes(raw_frames))
+
+    def close(self):
+        """
+        Writes all queued frames, stops the thread and closes the writer.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: The first error of the writer thread (e.g. OSError on a full disk), frames
+            after it were discarded.
+        """
+        self._flush_batch()
+        self._queue.put(None)
+        self._thread.join()
+        self.writer.close()
+        if self.error is not None:
+            raise self.error
+
+    def _flush_batch(self):
+        if self._batch:
+            self._queue.put(self._batch)
+            self._batch = []
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self.error is not None:
+                continue
+            try:
+                if isinstance(item, list):
+                    columns = np.array(item, dtype=np.float64)
+                    freq_id, real, imag = columns[:, 0].astype(np.uint16), columns[:, 1], columns[:, 2]
+                else:
+                    records = np.frombuffer(item, dtype=FRAME_DTYPE, count=len(item) // FRAME_SIZE)
+                    freq_id, real, imag = records["freq_id"], records["real"], records["imag"]
+                self.writer.write_columns(freq_id, real, imag)
+                self.writer.flush()
+                self.frames_written += len(freq_id)
+                self.batches_written += 1
+            except Exception as e:
+                self.error = e
+                log.error("Error in writer thread: %s", e)
@@ -0,0 +1,182 @@
+import time
+
+import check_User_Input as input_user
+from device_config import CHANNEL_ROLES, frontend_config
+from frame_decoder import frames_to_array
+from isx3_logging import get_logger
+from sweep_timing import sweep_clock
+
+log = get_logger(__name__)
+
+
+def electrode_combinations(n_el: int, points: int = 4) -> list:
+    """
+    Lists the electrode combinations of a ring of `n_el` electrodes with adjacent injection and measurement.
+
+    Electrodes are numbered from 1. For 2-point measurements every adjacent pair (C, W) is
+    used, for 3-point measurements (C, R, W) with R next to W, and for 4-point measurements
+    every adjacent current pair (C, W) is combined with every adjacent voltage pair (R, S)
+    that shares no electrode with it.
+
+    Args:
+        n_el (int): Number of electrodes.
+        points (int): Measurement mode (2, 3 or 4 points).
+
+    Returns:
+        list of tuple: Electrode per channel role, in the order of `CHANNEL_ROLES[points]`.
+    """
+    if n_el < 2 or points not in CHANNEL_ROLES:
+        return []
+
+    ring = [1 + (i % n_el) for i in range(n_el + 2)]
+    pairs = [(ring[i], ring[i + 1]) for i in range(n_el if n_el > 2 else 1)]
+    if points == 2:
+        return pairs
+    if points == 3:
+        return [(ring[i], ring[i + 2], ring[i + 1]) for i in range(n_el)] if n_el > 2 else []
+    return [(c, r, s, w) for c, w in pairs for r, s in pairs if not {c, w} & {r, s}]
+
+
+def switch_count(first: tuple, second: tuple) -> int:
+    """
+    Number of channel roles whose electrode changes between two combinations.
+    """
+    return sum(a != b for a, b in zip(first, second))
+
+
+def order_combinations(combinations) -> list:
+    """
+    Orders combinations so consecutive ones switch as few electrodes as possible.
+
+    Greedy nearest neighbour: starting with the first combination, always continue
+    with the remaining one that differs in the fewest channel roles. Duplicates are removed.
+
+    Args:
+        combinations (list of tuple): Electrode combinations.
+
+    Returns:
+        list of tuple: The reordered combinations.
+    """
+    remaining = list(dict.fromkeys(tuple(c) for c in combinations))
+    if not remaining:
+        return []
+
+    ordered = [remaining.pop(0)]
+    while remaining:
+        current = ordered[-1]
+        best = min(range(len(remaining)), key=lambda i: switch_count(current, remaining[i]))
+        ordered.append(remaining.pop(best))
+    return ordered
+
+
+class SweepScheduler:
+
+    def __init__(self, isx3, combinations=None, measurement_mode: int = 4,
+                 measurement_channel: str = "Extension Port", current_measurement_range: str = "autoranging",
+                 voltage_measurement_range: str = "1V", reorder: bool = True, stack_size: int = 1) -> None:
+        """
+        Sweeps a list of electrode combinations through the extension port channel fields.
+
+        The frontend frame of every combination is built once up front. Configuration
+        and measurement share the one connection to the device, so they run one after
+        the other, the saving comes from switching as few electrodes as possible and
+        from loading several combinations into the frontend channel stack at once
+        (`stack_size` > 1), where a batch that the device still holds is not sent again.
+
+        The data frames carry no channel number, so results of a stack are assigned by
+        arrival order, assuming the device measures the channels of its stack one after
+        the other for every spectrum, each as a full run of the frequency points. This
+        order is not confirmed on hardware yet, which is why one combination per start
+        is the default.
+
+        Args:
+            isx3 (ISX3): Connected device handler with the measurement setup applied.
+            combinations (list of tuple): Electrode per channel role, all adjacent combinations
+            of `isx3.n_el` electrodes if not given (see `electrode_combinations`).
+            measurement_mode (int): Measurement mode (2, 3 or 4 points).
+            measurement_channel (str): Port of the electrode multiplexer (e.g., "Extension Port").
+            current_measurement_range (str): Current measurement range (e.g., "10mA").
+            voltage_measurement_range (str): Voltage measurement range (e.g., "1V").
+            reorder (bool): Reorders the combinations to switch as few electrodes as possible.
+            stack_size (int): Combinations per channel stack and start, all of them if None. Halved
+            automatically if the device rejects a channel of a batch.
+        """
+        self.isx3 = isx3
+        if combinations is None:
+            combinations = electrode_combinations(isx3.n_el, measurement_mode)
+        combinations = [tuple(c) for c in combinations]
+        self.plan = order_combinations(combinations) if reorder else list(dict.fromkeys(combinations))
+        self.configs = {
+            combination: frontend_config(measurement_mode, measurement_channel, current_measurement_range,
+                                         voltage_measurement_range, combination)
+            for combination in self.plan
+        }
+        unsupported = [combination for combination in self.plan if self.configs[combination] is None]
+        if unsupported:
+            log.warning("Electrodes %s could not be configured and are skipped.", unsupported)
+            self.plan = [combination for combination in self.plan if self.configs[combination] is not None]
+        self.switches = sum(switch_count(a, b) for a, b in zip(self.plan, self.plan[1:]))
+
+        # Combinations measured with one channel stack, in measurement order
+        self.stack_size = stack_size
+        size = len(self.plan) if stack_size is None else max(1, stack_size)
+        self.batches = [self.plan[i:i + size] for i in range(0, len(self.plan), size)]
+
+    def run(self, spectra: int = 1, timeout: float = None, reset: bool = True) -> dict:
+        """
+        Measures every combination of the plan.
+
+        Args:
+            spectra (int): Number of spectra per combination.
+            timeout (float): Deadline in seconds for the data of one batch, derived from the
+            measurement setup if not given.
+            reset (bool): Resets the device once after the last combination.
+
+        Returns:
+            dict: Electrode combination mapped to a complex64 array of shape (spectra, frequency_points),
+            missing values are NaN.
+        """
+        isx3 = self.isx3
+        spectra = input_user.check_input_spectra(spectra)
+        frequency_points = isx3.frequency_points
+        results = {}
+        start = time.time()
+
+        pending = list(self.batches)
+        batches = []
+        while pending:
+            batch = pending.pop(0)
+            if not isx3.apply_frontend_configs([self.configs[combination] for combination in batch]):
+                if len(batch) > 1:
+                    # The stack of the device is smaller than the batch
+                    half = (len(batch) + 1) // 2
+                    log.warning("Device rejected a stack of %d channels, using %d channels per start.",
+                                len(batch), half)
+                    self.stack_size = half
+                    remaining = [combination for rest in [batch] + pending for combination in rest]
+                    pending = [remaining[i:i + half] for i in range(0, len(remaining), half)]
+                    continue
+                log.warning("Electrodes %s could not be configured and are skipped.", batch[0])
+                batches.append(batch)
+                continue
+            batches.append(batch)
+
+            channels = len(batch)
+            clock = sweep_clock(isx3.sweep_setup, spectra * channels, timeout)
+            isx3.begin_measurement(spectra)
+            raw_frames = isx3.read_measurement_frames(spectra * channels * frequency_points, clock.deadline,
+                                                      clock=clock)
+            isx3.stop_measurement()
+            if clock.reason is not None:
+                log.warning("Electrodes %s: measurement ended early (%s).", batch, clock.reason)
+            values = frames_to_array(raw_frames, spectra * channels, frequency_points)
+            values = values.reshape(spectra, channels, frequency_points)
+            for channel, combination in enumerate(batch):
+                results[combination] = values[:, channel]
+        self.batches = batches
+
+        log.info("%d electrode combinations measured in %.3f s with %d electrode switches.",
+                 len(results), time.time() - start, self.switches)
+        if reset:
+            isx3.software_reset()
+        return results
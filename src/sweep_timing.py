@@ -0,0 +1,254 @@
+import time
+
+import numpy as np
+
+from analysis import frequency_axis
+
+# Rough timing model of one frequency point: fixed settling/transfer time plus the measured excitation periods
+POINT_OVERHEAD = 0.002
+PERIODS_AT_FULL_PRECISION = 10.0
+
+# The deadline allows for this factor on top of the estimate plus a fixed margin
+DEADLINE_FACTOR = 2.0
+DEADLINE_MARGIN = 1.0
+
+# A stall is declared after this many times the longest expected gap between two frames. Gaps shorter
+# than one read timeout of the full-speed profile cannot be told apart from a slow read
+STALL_FACTOR = 5.0
+MIN_STALL_TIMEOUT = 1.0
+
+# Allowance for the first frame after the start command, the frontend settles before the first point
+# is measured. Generous, as a unit that is given up too early fails every retry the same way
+STARTUP_ALLOWANCE = 2.0
+
+# Used when no setup is known
+DEFAULT_TIMEOUT = 10.0
+
+
+def point_durations(setup) -> np.ndarray:
+    """
+    Estimates the measurement time of every frequency point of a setup.
+
+    Args:
+        setup (SetupConfig): The measurement setup.
+
+    Returns:
+        numpy.ndarray: Seconds per frequency point, indexed by frequency ID.
+    """
+    periods = max(1.0, PERIODS_AT_FULL_PRECISION * setup.precision)
+    return POINT_OVERHEAD + periods / frequency_axis(setup)
+
+
+def estimate_sweep_duration(setup, spectra: int) -> float:
+    """
+    Estimates how long the device needs to measure `spectra` spectra of a setup.
+
+    Args:
+        setup (SetupConfig): The measurement setup.
+        spectra (int): Number of spectra.
+
+    Returns:
+        float: Estimated duration in seconds.
+    """
+    return float(spectra * point_durations(setup).sum())
+
+
+def sweep_deadline(setup, spectra: int) -> float:
+    """
+    Time in seconds after which a sweep is given up, derived from the estimated duration.
+    """
+    if setup is None:
+        return DEFAULT_TIMEOUT
+    return DEADLINE_FACTOR * estimate_sweep_duration(setup, spectra) + DEADLINE_MARGIN + STARTUP_ALLOWANCE
+
+
+def stall_timeout(setup) -> float:
+    """
+    Time in seconds without any received byte after which a sweep counts as stalled.
+    """
+    if setup is None:
+        return DEFAULT_TIMEOUT
+    return max(MIN_STALL_TIMEOUT, STALL_FACTOR * float(point_durations(setup).max()))
+
+
+def startup_timeout(setup) -> float:
+    """
+    Time in seconds the first measurement frame may take after the start command.
+    """
+    if setup is None:
+        return DEFAULT_TIMEOUT
+    return STARTUP_ALLOWANCE + stall_timeout(setup)
+
+
+def sweep_clock(setup, spectra: int, timeout: float = None):
+    """
+    Deadline and stall detector for a sweep of `spectra` spectra of a setup.
+
+    Args:
+        setup (SetupConfig): The measurement setup, only the deadline is used if it is None.
+        spectra (int): Number of spectra.
+        timeout (float): Deadline in seconds instead of the one derived from the setup.
+
+    Returns:
+        SweepClock: The started clock.
+    """
+    deadline = sweep_deadline(setup, spectra) if timeout is None else timeout
+    if setup is None:
+        return SweepClock(deadline)
+    return SweepClock(deadline, stall_timeout(setup), startup_timeout(setup))
+
+
+class SweepStatus:
+
+    def __init__(self, spectra: int, frequency_points: int, reason: str, elapsed: float,
+                 estimated_duration: float = None) -> None:
+        """
+        Completion status of one sweep.
+
+        Args:
+            spectra (int): Requested number of spectra.
+            frequency_points (int): Frequency points per spectrum.
+            reason (str): Why reading stopped: "complete", "timeout" or "stall".
+            elapsed (float): Time in seconds spent reading.
+            estimated_duration (float): Estimated sweep duration in seconds, None if no setup was known.
+        """
+        self.spectra = spectra
+        self.frequency_points = frequency_points
+        self.reason = reason
+        self.elapsed = elapsed
+        self.estimated_duration = estimated_duration
+        # Received slots, indexed by (spectrum, frequency ID)
+        self.received = np.zeros((spectra, frequency_points), dtype=bool)
+        # Slots filled in afterwards by re-measuring them
+        self.recovered = 0
+
+    def mark(self, freq_ids):
+        """
+        Marks the slots of results in arrival order as received, a new spectrum starts
+        whenever the frequency ID does not increase.
+
+        Args:
+            freq_ids (numpy.ndarray): Frequency IDs in arrival order.
+
+        Returns:
+            None
+        """
+        freq_ids = np.asarray(freq_ids, dtype=np.int64)
+        # Corrupted IDs must not split a spectrum
+        freq_ids = freq_ids[(freq_ids >= 0) & (freq_ids < self.frequency_points)]
+        if not len(freq_ids):
+            return
+        rows = np.concatenate(([0], np.cumsum(np.diff(freq_ids) <= 0)))
+        keep = rows < self.spectra
+        self.received[rows[keep], freq_ids[keep]] = True
+
+    def mark_array(self, data):
+        """
+        Marks the slots of a (spectra, frequency_points) result array that hold a value as received.
+        """
+        self.received |= ~np.isnan(data)
+
+    @property
+    def expected_results(self) -> int:
+        return self.received.size
+
+    @property
+    def received_results(self) -> int:
+        return int(self.received.sum())
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.received.all())
+
+    @property
+    def missing_freq_ids(self) -> list:
+        """
+        Frequency IDs that are missing in at least one spectrum, to be measured again.
+        """
+        return np.flatnonzero(~self.received.all(axis=0)).tolist()
+
+    @property
+    def missing_ranges(self) -> list:
+        """
+        Contiguous runs of missing frequency IDs as (first, last) tuples, one setup each when re-measuring.
+        """
+        missing = np.flatnonzero(~self.received.all(axis=0))
+        if not missing.size:
+            return []
+        breaks = np.flatnonzero(np.diff(missing) > 1)
+        firsts = np.concatenate(([missing[0]], missing[breaks + 1]))
+        lasts = np.concatenate((missing[breaks], [missing[-1]]))
+        return list(zip(firsts.tolist(), lasts.tolist()))
+
+    def __repr__(self) -> str:
+        return (f"SweepStatus({self.reason}, {self.received_results}/{self.expected_results} results, "
+                f"{self.recovered} recovered, {self.elapsed:.3f} s, missing frequency IDs {self.missing_freq_ids})")
+
+
+class SweepClock:
+
+    def __init__(self, deadline: float, stall_timeout: float = None, startup_timeout: float = None) -> None:
+        """
+        Deadline and inter-frame stall detector of one read loop.
+
+        The stall detector starts with the first measurement frame, before it only
+        `startup_timeout` applies, so a unit that settles slowly is not declared stalled.
+
+        Args:
+            deadline (float): Maximum time in seconds for the whole read.
+            stall_timeout (float): Maximum time in seconds without data once frames arrive, no stall
+            detection if not given.
+            startup_timeout (float): Maximum time in seconds until the first frame, only the deadline
+            applies if not given.
+        """
+        self.start = time.time()
+        self.deadline = deadline
+        self.stall_timeout = stall_timeout
+        self.startup_timeout = startup_timeout
+        self.first_frame = None
+        self.last_data = self.start
+        self.reason = None
+
+    def data_received(self):
+        self.last_data = time.time()
+
+    def frames_received(self):
+        """
+        Notes that measurement frames were decoded, which starts the stall detector.
+        """
+        self.last_data = time.time()
+        if self.first_frame is None:
+            self.first_frame = self.last_data
+
+    def _stall_due(self):
+        # Time at which the read counts as stalled, None if there is no limit
+        if self.first_frame is None:
+            return None if self.startup_timeout is None else self.start + self.startup_timeout
+        return None if self.stall_timeout is None else self.last_data + self.stall_timeout
+
+    def expired(self) -> bool:
+        """
+        Checks the deadline and the stall detector, the cause is kept in `reason`.
+        """
+        now = time.time()
+        stall_due = self._stall_due()
+        if now - self.start >= self.deadline:
+            self.reason = "timeout"
+        elif stall_due is not None and now >= stall_due:
+            self.reason = "stall"
+        return self.reason is not None
+
+    def remaining(self) -> float:
+        """
+        Time in seconds until the next deadline or stall check is due, bounds blocking reads.
+        """
+        now = time.time()
+        remaining = self.start + self.deadline - now
+        stall_due = self._stall_due()
+        if stall_due is not None:
+            remaining = min(remaining, stall_due - now)
+        return max(remaining, 0.0)
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.start
@@ -0,0 +1,237 @@
+import socket
+from dataclasses import dataclass
+
+import serial
+
+from isx3_logging import get_logger
+
+log = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class TransportProfile:
+    """
+    Connection parameters tuned for one interface of the ISX3.
+
+    Attributes:
+        name (str): Profile name, kept in `ISX3.serial_protocol`.
+        kind (str): "serial" for a (virtual) COM port, "tcp" for a "host:port" target.
+        baudrate (int): Serial baud rate, nominal for USB virtual COM ports, None for TCP.
+        timeout (float): Time in seconds a read blocks when no data is waiting.
+        read_chunk_size (int): Upper bound for a single bulk read.
+        buffer_size (int): Requested OS receive/transmit buffer size in bytes.
+    """
+    name: str
+    kind: str
+    baudrate: int
+    timeout: float
+    read_chunk_size: int
+    buffer_size: int
+
+
+# USB full-speed virtual COM port, the original connection settings
+FULL_SPEED = TransportProfile("FS", "serial", 9600, 1.0, 4096, 4096)
+# USB high-speed: larger transfers arrive at once, short timeouts keep polling responsive
+HIGH_SPEED = TransportProfile("HS", "serial", 3000000, 0.2, 65536, 262144)
+# Ethernet: a TCP byte stream to the device
+ETHERNET = TransportProfile("TCP", "tcp", None, 0.2, 65536, 1048576)
+
+PROFILES = {profile.name: profile for profile in (FULL_SPEED, HIGH_SPEED, ETHERNET)}
+
+
+def is_tcp_target(target: str) -> bool:
+    """
+    Checks if a connection target names a network endpoint ("host:port" or "tcp://host:port").
+    """
+    if target.startswith("tcp://"):
+        return True
+    host, _, port = target.rpartition(":")
+    return bool(host) and port.isdigit() and not target.upper().startswith("COM")
+
+
+def split_tcp_target(target: str) -> tuple:
+    """
+    Splits a "host:port" or "tcp://host:port" target.
+
+    Returns:
+        tuple: Host (str) and port (int).
+    """
+    if target.startswith("tcp://"):
+        target = target[len("tcp://"):]
+    host, _, port = target.rpartition(":")
+    return host, int(port)
+
+
+class SocketTransport:
+
+    def __init__(self, host: str, port: int, timeout: float = 0.2, read_chunk_size: int = 65536,
+                 buffer_size: int = 1048576) -> None:
+        """
+        TCP connection to the Ethernet interface with the subset of the serial.Serial interface the driver uses.
+
+        Received bytes are read with `recv_into` into one preallocated buffer, so a bulk
+        read costs a single copy. TCP_NODELAY sends every command frame immediately
+        instead of waiting to coalesce it with later writes.
+
+        Args:
+            host (str): Device address.
+            port (int): TCP port of the device.
+            timeout (float): Time in seconds a read waits for the first byte, like serial.Serial.timeout.
+            read_chunk_size (int): Size of the preallocated receive buffer, the upper bound for one read.
+            buffer_size (int): Requested OS receive buffer size in bytes.
+
+        Raises:
+            OSError: If the connection cannot be established.
+        """
+        self.name = f"{host}:{port}"
+        self.port = self.name
+        self.timeout = timeout
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, buffer_size)
+        self.is_open = True
+
+        # Received bytes that were not read yet are buffer[start:end]
+        self._buffer = bytearray(read_chunk_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+
+    @property
+    def in_waiting(self) -> int:
+        if self._start == self._end:
+            self._fill(0.0)
+        return self._end - self._start
+
+    def read(self, size: int = 1) -> bytes:
+        """
+        Reads up to `size` bytes, waiting at most `timeout` seconds for the first one.
+
+        Args:
+            size (int): Maximum number of bytes.
+
+        Returns:
+            bytes: Received bytes, empty if the read timed out.
+        """
+        if self._start == self._end:
+            self._fill(self.timeout)
+        count = min(size, self._end - self._start)
+        data = bytes(self._view[self._start:self._start + count])
+        self._start += count
+        return data
+
+    def write(self, data) -> int:
+        self._socket.sendall(data)
+        return len(data)
+
+    def reset_input_buffer(self):
+        self._start = self._end = 0
+        while self._fill(0.0):
+            self._start = self._end = 0
+
+    def reset_output_buffer(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            self._view.release()
+            self._socket.close()
+
+    def _fill(self, timeout) -> int:
+        """
+        Receives the bytes the OS holds into the free end of the buffer, waiting at most `timeout` seconds.
+
+        Returns:
+            int: Number of received bytes, 0 if nothing arrived in time.
+
+        Raises:
+            serial.SerialException: If the device closed the connection.
+        """
+        if self._start == self._end:
+            self._start = self._end = 0
+        elif self._end == len(self._buffer):
+            # Moves the unread bytes to the front to make room
+            pending = self._end - self._start
+            self._view[:pending] = self._view[self._start:self._end]
+            self._start, self._end = 0, pending
+
+        self._socket.settimeout(timeout)
+        try:
+            received = self._socket.recv_into(self._view[self._end:])
+        except (socket.timeout, BlockingIOError):
+            return 0
+        if not received:
+            raise serial.SerialException(f"Connection to {self.name} closed by the device.")
+        self._end += received
+        return received
+
+
+def get_profile(profile) -> TransportProfile:
+    """
+    Resolves a profile name, profiles are passed through.
+
+    Args:
+        profile (str or TransportProfile): "FS", "HS", "TCP" or a custom profile.
+
+    Returns:
+        TransportProfile or None: The profile, None if the name is unknown.
+    """
+    if isinstance(profile, TransportProfile):
+        return profile
+    return PROFILES.get(str(profile).upper())
+
+
+def candidate_profiles(target: str) -> list:
+    """
+    Profiles that can reach a target, fastest first. Used to probe an unknown unit.
+
+    The serial profiles differ in their baud rate, which only a real UART honours. A USB
+    virtual COM port answers on the first candidate, so probing cannot detect its speed.
+
+    Args:
+        target (str): COM port or "host:port".
+
+    Returns:
+        list of TransportProfile: Profiles to try in order.
+    """
+    if is_tcp_target(target):
+        return [ETHERNET]
+    return [HIGH_SPEED, FULL_SPEED]
+
+
+def open_transport(target: str, profile: TransportProfile):
+    """
+    Opens a target with the settings of a profile.
+
+    Serial profiles open a `serial.Serial`, TCP profiles a `SocketTransport` with the same interface.
+
+    Args:
+        target (str): COM port, or "host:port" for TCP profiles.
+        profile (TransportProfile): Connection parameters.
+
+    Returns:
+        serial.Serial or SocketTransport: The open connection.
+
+    Raises:
+        serial.SerialException or OSError: If the connection cannot be established.
+    """
+    if profile.kind == "tcp":
+        host, port = split_tcp_target(target)
+        return SocketTransport(host, port, profile.timeout, profile.read_chunk_size, profile.buffer_size)
+
+    device = serial.Serial(
+        port=target,
+        baudrate=profile.baudrate,
+        timeout=profile.timeout,
+        parity=serial.PARITY_NONE,
+        stopbits=serial.STOPBITS_ONE,
+        bytesize=serial.EIGHTBITS,
+    )
+    # Only supported by the Windows backend, other platforms use the driver defaults
+    if hasattr(device, "set_buffer_size"):
+        device.set_buffer_size(rx_size=profile.buffer_size, tx_size=profile.buffer_size)
+    return device
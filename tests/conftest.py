@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# The driver modules import each other by their flat names
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from ISX3 import ISX3  # noqa: E402
+from isx3_simulator import SimulatedISX3  # noqa: E402
+
+
+@pytest.fixture
+def make_isx3():
+    """
+    Creates an ISX3 handler talking to an in-process simulator with a 10-point setup applied.
+    """
+    def make(n_el: int = 4, frequency_points: int = 10, **options):
+        isx3 = ISX3(n_el)
+        isx3.device = SimulatedISX3(timeout=0.2, **options)
+        isx3.set_setup("1kHz", "1MHz", frequency_points, "log", 1.0, "100mV", "voltage")
+        return isx3
+
+    return make
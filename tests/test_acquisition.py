@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def test_acquisition_thread_delivers_all_frames(make_isx3):
+    isx3 = make_isx3(rate=20000)
+
+    acquisition = isx3.start_measurement_async(spectra=5, reset=False)
+
+    assert acquisition.join(10.0)
+    assert acquisition.reason == "complete"
+    assert sum(len(spectrum) for spectrum in acquisition.poll_spectra()) == 50
+
+
+def test_acquisition_thread_stops_when_frames_are_lost(make_isx3):
+    isx3 = make_isx3(frequency_points=100, rate=20000, drop_rate=0.002)
+
+    acquisition = isx3.start_measurement_async(spectra=10, reset=False)
+
+    assert acquisition.join(10.0)
+    assert acquisition.reason == "stall"
+    assert acquisition.frames_received < 1000
+
+
+def test_acquisition_thread_honours_explicit_deadline(make_isx3):
+    isx3 = make_isx3(rate=20)
+
+    acquisition = isx3.start_measurement_async(spectra=10, reset=False, timeout=0.3)
+
+    assert acquisition.join(5.0)
+    assert acquisition.reason == "timeout"
+
+
+def test_slow_first_point_is_not_a_stall(make_isx3, tmp_path):
+    isx3 = make_isx3(frequency_points=100, start_delay=0.8)
+
+    data = isx3.start_measurement(spectra=1, result_mode="array", csv_path=str(tmp_path / "result.csv"),
+                                  reset=False)
+
+    assert isx3.last_status.reason == "complete"
+    assert not np.isnan(data).any()
+
+
+def test_stall_after_first_frame_ends_the_sweep(make_isx3, tmp_path):
+    isx3 = make_isx3(frequency_points=100, rate=20000, drop_rate=0.002)
+
+    isx3.start_measurement(spectra=10, csv_path=str(tmp_path / "result.csv"), reset=False, retries=0)
+
+    assert isx3.last_status.reason == "stall"
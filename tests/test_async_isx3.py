@@ -0,0 +1,100 @@
+import asyncio
+
+from async_isx3 import AsyncISX3, ISX3Protocol
+from isx3_simulator import SimulatedISX3, TcpServer
+
+
+def run_with_device(simulator, scenario):
+    """
+    Runs `scenario(isx3, protocol)` against a simulator served over a local TCP connection.
+    """
+    async def main(server):
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.create_connection(ISX3Protocol, server.host, server.port)
+        isx3 = AsyncISX3(4)
+        isx3.attach(transport, protocol, "SIM")
+        try:
+            return await scenario(isx3, protocol)
+        finally:
+            await isx3.close()
+
+    with TcpServer(simulator) as server:
+        return asyncio.run(main(server))
+
+
+def test_set_setup_keeps_validated_frequency_count():
+    async def scenario(isx3, protocol):
+        await isx3.set_setup("1kHz", "1MHz", 5000, "log", 1.0, "100mV", "voltage")
+        return isx3.frequency_points
+
+    assert run_with_device(SimulatedISX3(), scenario) == 60
+
+
+def test_iter_frames_yields_complete_measurement():
+    async def scenario(isx3, protocol):
+        await isx3.set_setup("1kHz", "1MHz", 10, "log", 1.0, "100mV", "voltage")
+        return [frame async for frame in isx3.iter_frames(spectra=3)]
+
+    frames = run_with_device(SimulatedISX3(rate=2000), scenario)
+
+    assert [frame[0] for frame in frames] == list(range(10)) * 3
+
+
+def test_closed_measurement_does_not_leak_into_the_next_one():
+    async def scenario(isx3, protocol):
+        await isx3.set_setup("1kHz", "1MHz", 10, "log", 1.0, "100mV", "voltage")
+        frames = isx3.iter_frames(spectra=50)
+        async for frame in frames:
+            if frame[0] == 2:
+                break
+        await frames.aclose()
+        await asyncio.sleep(0.1)
+        return [frame async for frame in isx3.iter_frames(spectra=2)]
+
+    frames = run_with_device(SimulatedISX3(rate=1000), scenario)
+
+    assert [frame[0] for frame in frames] == list(range(10)) * 2
+
+
+def test_stale_frames_are_dropped_before_a_start():
+    async def scenario(isx3, protocol):
+        await isx3.set_setup("1kHz", "1MHz", 10, "log", 1.0, "100mV", "voltage")
+        protocol.frames.put_nowait((7, 0.0, 0.0))
+        return [frame async for frame in isx3.iter_frames(spectra=1)]
+
+    frames = run_with_device(SimulatedISX3(), scenario)
+
+    assert [frame[0] for frame in frames] == list(range(10))
+
+
+def test_reset_consumes_late_system_ready_message():
+    async def scenario(isx3, protocol):
+        isx3.print_msg = False
+        ready = await isx3.software_reset(timeout=2.0)
+        return ready, await isx3.write_command(bytearray([0xC5, 0x00, 0xC5]))
+
+    ready, code = run_with_device(SimulatedISX3(ready_delay=0.05), scenario)
+
+    assert ready
+    assert code == 0x82
+
+
+def test_stray_byte_does_not_hold_back_acknowledgements():
+    async def scenario(isx3, protocol):
+        isx3.print_msg = False
+        protocol.data_received(b"\xF0")
+        return [await isx3.write_command(bytearray([0x86, 0x01, 0x01, 0x86]), timeout=0.5) for _ in range(2)]
+
+    assert run_with_device(SimulatedISX3(), scenario) == [0x83, 0x83]
+
+
+def test_iter_frames_resyncs_on_garbage():
+    async def scenario(isx3, protocol):
+        isx3.print_msg = False
+        await isx3.set_setup("1kHz", "1MHz", 20, "log", 1.0, "100mV", "voltage")
+        return [frame async for frame in isx3.iter_frames(spectra=10, timeout=1.0)], protocol.skipped_bytes
+
+    frames, skipped = run_with_device(SimulatedISX3(rate=5000, garbage_rate=0.02, seed=3), scenario)
+
+    assert len(frames) == 200
+    assert skipped > 0
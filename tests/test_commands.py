@@ -0,0 +1,68 @@
+import time
+
+from device_config import frontend_config
+from ISX3 import ACK_MESSAGE, CHANNEL_COUNT_REQUEST, SYSTEM_READY_MESSAGE, parse_system_message
+
+UNKNOWN_COMMAND = bytearray([0xC5, 0x00, 0xC5])
+
+
+def test_parse_system_message_skips_unsolicited_codes():
+    buffer = bytes([0x18, 0x01, 0x84, 0x18, 0x18, 0x01, 0x83, 0x18])
+
+    assert parse_system_message(buffer).code == SYSTEM_READY_MESSAGE
+    assert parse_system_message(buffer, skip=(SYSTEM_READY_MESSAGE,)).code == ACK_MESSAGE
+
+
+def test_command_is_acknowledged(make_isx3):
+    isx3 = make_isx3()
+
+    message = isx3.write_command_string(bytearray([0x86, 0x01, 0x01, 0x86]))
+
+    assert message.acknowledged
+
+
+def test_unknown_command_is_rejected(make_isx3):
+    isx3 = make_isx3()
+
+    message = isx3.write_command_string(UNKNOWN_COMMAND)
+
+    assert message.rejected
+    assert message.code == 0x82
+
+
+def test_late_ready_message_is_not_taken_as_answer(make_isx3):
+    isx3 = make_isx3(ready_delay=0.05)
+
+    # Reset without waiting for readiness, the system-ready message arrives during the next command
+    isx3.device.write(bytearray([0xA1, 0x00, 0xA1]))
+    assert isx3.write_command_string(bytearray([0x86, 0x01, 0x01, 0x86])).code == ACK_MESSAGE
+    time.sleep(0.1)
+
+    assert isx3.write_command_string(UNKNOWN_COMMAND).rejected
+
+
+def test_query_returns_readback_frame(make_isx3):
+    isx3 = make_isx3()
+    isx3.apply_frontend_config(frontend_config(4, "Main Port"))
+
+    frame = isx3.query(CHANNEL_COUNT_REQUEST)
+
+    assert frame == bytes([0xB1, 0x02, 0x00, 0x01, 0xB1])
+    assert isx3.last_message.acknowledged
+
+
+def test_rejected_frontend_config_is_not_kept_in_shadow(make_isx3):
+    isx3 = make_isx3(max_channels=0)
+
+    assert not isx3.apply_frontend_config(frontend_config(4, "Main Port"))
+    assert isx3.frontend is None
+
+
+def test_unchanged_frontend_config_is_not_sent_again(make_isx3):
+    isx3 = make_isx3()
+    config = frontend_config(4, "Main Port", "10mA")
+    assert isx3.apply_frontend_config(config)
+    sent = isx3.device.commands_received
+
+    assert isx3.apply_frontend_config(config)
+    assert isx3.device.commands_received == sent
@@ -0,0 +1,36 @@
+import numpy as np
+
+from device_pool import ISX3Pool
+from ISX3 import ISX3
+
+
+def test_pool_array_mode_stacks_connected_devices(make_isx3, tmp_path):
+    pool = ISX3Pool(n_el=4)
+    pool.add("a", make_isx3(rate=20000))
+    pool.add("b", make_isx3(rate=20000))
+    pool.add("offline", ISX3(4))
+
+    data = pool.start_measurement(spectra=2, result_mode="array", csv_directory=str(tmp_path), reset=False)
+
+    assert data.shape == (2, 2, 10)
+    assert not np.isnan(data).any()
+
+
+def test_pool_tuples_mode_tags_results_with_device(make_isx3, tmp_path):
+    pool = ISX3Pool(n_el=4)
+    pool.add("a", make_isx3(rate=20000))
+    pool.add("b", make_isx3(rate=20000))
+
+    rows = pool.start_measurement(spectra=1, csv_directory=str(tmp_path), reset=False)
+
+    assert len(rows) == 20
+    assert {row[0] for row in rows} == {"a", "b"}
+
+
+def test_empty_pool_returns_empty_results(tmp_path):
+    pool = ISX3Pool(n_el=4)
+
+    data = pool.start_measurement(spectra=3, result_mode="array", csv_directory=str(tmp_path))
+
+    assert data.shape == (0, 3, 0)
+    assert pool.start_measurement(spectra=3, csv_directory=str(tmp_path)) == []
@@ -0,0 +1,46 @@
+import numpy as np
+
+from eit import eit_pattern
+
+
+def test_opposite_pattern_uses_every_injection_pair_once():
+    pattern = eit_pattern(8, "opposite")
+
+    injections = {frozenset((c, w)) for c, _, _, w in pattern}
+    assert len(injections) == 4
+    assert len(pattern) == 16
+
+
+def test_opposite_pattern_with_four_electrodes_falls_back_to_adjacent():
+    assert eit_pattern(4, "opposite") == eit_pattern(4, "adjacent") != []
+
+
+def test_one_measurement_per_start_by_default(make_isx3):
+    isx3 = make_isx3(n_el=8, rate=50000)
+    eit = isx3.eit()
+
+    data = eit.acquire(frames=2, reset=False)
+
+    assert not np.isnan(data).any()
+    assert all(len(batch) == 1 for batch in eit.scheduler.batches)
+
+
+def test_stacked_frames_after_the_first_send_no_configuration(make_isx3):
+    isx3 = make_isx3(n_el=8, rate=50000)
+    eit = isx3.eit(stack_size=None)
+    sent = isx3.device.commands_received
+
+    data = eit.acquire(frames=3, reset=False)
+
+    assert data.shape == (3, 40, 10)
+    assert not np.isnan(data).any()
+    # Stack clear and 40 channels once, then a start and a stop per frame
+    assert isx3.device.commands_received - sent == 1 + 40 + 3 * 2
+
+
+def test_stack_is_split_when_the_device_rejects_it(make_isx3):
+    isx3 = make_isx3(n_el=8, rate=50000, max_channels=16)
+
+    data = isx3.eit(stack_size=None).acquire(frames=2, reset=False)
+
+    assert not np.isnan(data).any()
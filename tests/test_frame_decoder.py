@@ -0,0 +1,66 @@
+import struct
+
+import numpy as np
+
+from frame_decoder import FrameDecoder, frames_to_array
+
+
+def frame(freq_id, real=1.0, imag=-1.0):
+    return struct.pack(">BBHffB", 0xB8, 0x0A, freq_id, real, imag, 0xB8)
+
+
+def test_decodes_frames_split_across_reads():
+    data = frame(0, 1.5, 2.5) + frame(1, 3.5, 4.5)
+    decoder = FrameDecoder(2)
+
+    assert decoder.feed(data[:7]) == []
+    assert decoder.feed(data[7:], flush=True) == [(0, 1.5, 2.5), (1, 3.5, 4.5)]
+    assert decoder.pending == 0
+
+
+def test_skips_garbage_between_frames():
+    decoder = FrameDecoder(10)
+
+    frames = decoder.feed(b"\x00\xB8\x13" + frame(3) + b"\xFF" + frame(4), flush=True)
+
+    assert [f[0] for f in frames] == [3, 4]
+    assert decoder.skipped_bytes == 4
+
+
+def test_rejects_truncated_frame_instead_of_borrowing_the_next_header():
+    decoder = FrameDecoder(10)
+    truncated = frame(1)[:-2] + b"\xB8"
+
+    frames = decoder.feed(truncated + frame(2), flush=True)
+
+    assert [f[0] for f in frames] == [2]
+    assert decoder.rejected_frames >= 1
+
+
+def test_holds_back_ambiguous_last_frame_until_confirmed():
+    # The byte before the end byte is a start byte, the frame could be one byte short
+    imag = struct.unpack(">f", b"\x3F\x80\x00\xB8")[0]
+    decoder = FrameDecoder(10)
+
+    assert decoder.feed(frame(5, 1.0, imag)) == []
+    assert decoder.feed(b"", flush=True) == [(5, 1.0, imag)]
+
+
+def test_rejects_invalid_values_and_frequency_ids():
+    decoder = FrameDecoder(4)
+
+    frames = decoder.feed(frame(0, float("nan")) + frame(9) + frame(1), flush=True)
+
+    assert [f[0] for f in frames] == [1]
+    assert decoder.invalid_values == 1
+    assert decoder.invalid_ids == 1
+
+
+def test_frames_to_array_leaves_dropped_frames_as_nan():
+    raw = frame(0) + frame(1) + frame(2) + frame(0) + frame(2)
+
+    data = frames_to_array(raw, 2, 3)
+
+    assert data.shape == (2, 3)
+    assert np.isnan(data[1, 1])
+    assert np.count_nonzero(~np.isnan(data)) == 5
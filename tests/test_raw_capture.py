@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from raw_capture import CAPTURE_HEADER, CaptureReader, RawCapture, replay
+from result_writers import read_raw_binary
+
+
+def test_capture_raw_replays_all_frames(make_isx3, tmp_path):
+    isx3 = make_isx3(rate=20000)
+    path = str(tmp_path / "capture.raw")
+
+    captured = isx3.capture_raw(path, spectra=5, reset=False)
+
+    assert captured >= 5 * 10 * 13
+    output = str(tmp_path / "result.bin")
+    frames = replay(path, output)
+    assert len(frames) == 50
+    assert read_raw_binary(output)["freq_id"].tolist() == [frame[0] for frame in frames]
+
+
+def test_capture_reader_to_array(make_isx3, tmp_path):
+    isx3 = make_isx3(rate=20000)
+    path = str(tmp_path / "capture.raw")
+    isx3.capture_raw(path, spectra=3, reset=False)
+
+    with CaptureReader(path) as reader:
+        data = reader.to_array(spectra=3, frequency_points=10)
+
+    assert data.shape == (3, 10)
+    assert not np.isnan(data).any()
+
+
+def test_capture_raw_honours_explicit_deadline(make_isx3, tmp_path):
+    isx3 = make_isx3(rate=20)
+
+    captured = isx3.capture_raw(str(tmp_path / "capture.raw"), spectra=10, timeout=0.3, reset=False)
+
+    assert captured < 10 * 10 * 13
+
+
+def test_raw_capture_drops_bytes_beyond_capacity(tmp_path):
+    path = str(tmp_path / "capture.raw")
+
+    with RawCapture(path, capacity=4) as capture:
+        assert capture.write(b"\x01\x02\x03") == 3
+        assert capture.write(b"\x04\x05\x06") == 1
+        assert capture.full
+        assert capture.dropped_bytes == 2
+
+    with CaptureReader(path) as reader:
+        assert reader.length == 4
+        assert reader.frames() == []
+
+
+def test_capture_reader_rejects_other_files(tmp_path):
+    path = tmp_path / "result.bin"
+    path.write_bytes(bytes(CAPTURE_HEADER.size))
+
+    with pytest.raises(ValueError):
+        CaptureReader(str(path))
@@ -0,0 +1,43 @@
+import numpy as np
+
+from analysis import frequency_axis
+from device_config import setup_config
+
+
+def test_sub_range_keeps_the_frequencies_of_its_ids():
+    setup = setup_config("1kHz", "1MHz", 50, "log", 1.0, "100mV", "voltage")
+
+    sub = setup.sub_range(10, 19)
+
+    assert sub.frequency_points == 10
+    np.testing.assert_allclose(frequency_axis(sub), frequency_axis(setup)[10:20], rtol=1e-5)
+
+
+def test_remeasure_missing_fills_every_missing_slot(make_isx3, tmp_path):
+    isx3 = make_isx3(frequency_points=20, rate=20000)
+    setup = isx3.sweep_setup
+    complete = isx3.start_measurement(spectra=3, result_mode="array", csv_path=str(tmp_path / "result.csv"),
+                                      reset=False)
+
+    # Two spectra lack frequency ID 4, so the k-th re-measured value has to fill the k-th gap
+    data = complete.copy()
+    data[0, 4] = data[2, 4] = data[1, 11] = data[1, 12] = np.nan
+
+    recovered = isx3.remeasure_missing(data)
+
+    np.testing.assert_allclose(recovered, complete, rtol=1e-4)
+    assert isx3.sweep_setup == setup
+    assert isx3.device.frequency_points == 20
+
+
+def test_lossy_sweep_is_recovered_by_retries(make_isx3, tmp_path):
+    isx3 = make_isx3(frequency_points=50, rate=20000, drop_rate=0.001, seed=1)
+    setup = isx3.sweep_setup
+
+    data = isx3.start_measurement(spectra=5, result_mode="array", csv_path=str(tmp_path / "result.csv"),
+                                  reset=False, retries=2)
+
+    assert not np.isnan(data).any()
+    assert isx3.last_status.recovered > 0
+    assert isx3.last_status.complete
+    assert isx3.sweep_setup == setup
@@ -0,0 +1,40 @@
+import sys
+
+import pytest
+
+from device_config import frontend_config
+from isx3_simulator import PtyBridge, SimulatedISX3
+from ISX3 import ISX3
+
+UNKNOWN_COMMAND = bytearray([0xC5, 0x00, 0xC5])
+
+
+def test_reset_waits_for_system_ready(make_isx3):
+    isx3 = make_isx3(ready_delay=0.1)
+
+    assert isx3.software_reset()
+    assert isx3.device.in_waiting == 0
+    assert isx3.setup is None and isx3.frontend is None
+
+
+def test_reset_fails_without_answer(make_isx3):
+    isx3 = make_isx3()
+    isx3.device.write = lambda data: len(data)
+
+    assert not isx3.software_reset(timeout=0.2)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="pseudo-terminals need Linux or macOS")
+def test_late_system_ready_does_not_shift_acknowledgements():
+    with PtyBridge(SimulatedISX3(ready_delay=0.05)) as bridge:
+        isx3 = ISX3(4)
+        assert isx3.connect(bridge.port, "HS", [bridge.port])
+        try:
+            assert isx3.software_reset()
+
+            # A rejected command must be reported as rejected, not as the previous answer
+            assert isx3.write_command_string(UNKNOWN_COMMAND).rejected
+            assert isx3.apply_frontend_config(frontend_config(4, "Main Port"))
+            assert isx3.frontend is not None
+        finally:
+            isx3.device.close()
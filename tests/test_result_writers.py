@@ -0,0 +1,97 @@
+import csv
+
+import numpy as np
+import pytest
+
+from frame_decoder import FRAME_DTYPE
+from result_writers import CsvWriter, RawBinaryWriter, WriterThread, open_writer, read_raw_binary
+
+FRAMES = [(1, 0.5, -0.25), (2, 1.5, 2.0), (3, -4.0, 8.0)]
+
+
+def columns(frames):
+    freq_id, real, imag = zip(*frames)
+    return np.array(freq_id, dtype=np.uint16), np.array(real), np.array(imag)
+
+
+def test_raw_binary_round_trip(tmp_path):
+    path = str(tmp_path / "result.bin")
+
+    with RawBinaryWriter(path) as writer:
+        writer.write_columns(*columns(FRAMES[:2]))
+        writer.write_columns(*columns(FRAMES[2:]))
+
+    records = read_raw_binary(path)
+    assert records["freq_id"].tolist() == [1, 2, 3]
+    assert records["real"].tolist() == [0.5, 1.5, -4.0]
+    assert records["imag"].tolist() == [-0.25, 2.0, 8.0]
+
+
+def test_read_raw_binary_of_empty_file(tmp_path):
+    path = str(tmp_path / "result.bin")
+    RawBinaryWriter(path).close()
+
+    assert len(read_raw_binary(path)) == 0
+
+
+def test_csv_round_trip_appends_without_second_header(tmp_path):
+    path = str(tmp_path / "result.csv")
+
+    with CsvWriter(path) as writer:
+        writer.write_columns(*columns(FRAMES[:2]))
+    with CsvWriter(path) as writer:
+        writer.write_columns(*columns(FRAMES[2:]))
+
+    with open(path, newline='') as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["Frequency ID", "Real Part", "Imaginary Part"]
+    assert [(int(f), float(r), float(i)) for f, r, i in rows[1:]] == FRAMES
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".h5"])
+def test_columnar_writers_round_trip(tmp_path, extension):
+    path = str(tmp_path / ("result" + extension))
+
+    reader = pytest.importorskip("pyarrow.parquet" if extension == ".parquet" else "h5py")
+
+    with open_writer(path) as writer:
+        writer.write_columns(*columns(FRAMES[:2]))
+        writer.write_columns(*columns(FRAMES[2:]))
+
+    if extension == ".parquet":
+        table = reader.read_table(path).to_pydict()
+        freq_id, real, imag = (table[name] for name in ("freq_id", "real", "imag"))
+    else:
+        with reader.File(path, "r") as file:
+            group = file["results"]
+            freq_id, real, imag = (group[name][()].tolist() for name in ("freq_id", "real", "imag"))
+    assert list(zip(freq_id, real, imag)) == FRAMES
+
+
+def test_writer_thread_writes_frames_and_raw_frames(tmp_path):
+    path = str(tmp_path / "result.bin")
+    raw_frames = np.zeros(1, dtype=FRAME_DTYPE)
+    raw_frames[["freq_id", "real", "imag"]] = FRAMES[2]
+
+    with WriterThread(RawBinaryWriter(path), batch_size=1) as thread:
+        thread.submit(FRAMES[:2])
+        thread.submit_raw(raw_frames.tobytes())
+
+    assert thread.frames_written == 3
+    assert read_raw_binary(path)["freq_id"].tolist() == [1, 2, 3]
+
+
+class FailingWriter(CsvWriter):
+
+    def write_columns(self, freq_id, real, imag):
+        raise OSError("disk full")
+
+
+def test_writer_thread_raises_writer_error_on_close(tmp_path):
+    thread = WriterThread(FailingWriter(str(tmp_path / "result.csv")), batch_size=1)
+    thread.submit(FRAMES[:1])
+    thread.submit(FRAMES[1:])
+
+    with pytest.raises(OSError, match="disk full"):
+        thread.close()
+    assert thread.frames_written == 0
@@ -0,0 +1,106 @@
+import socket
+import threading
+import time
+
+import numpy as np
+import pytest
+import serial
+
+from ISX3 import ISX3, TCP_SOCKET_MESSAGE
+from isx3_simulator import SimulatedISX3, TcpServer
+from transport import SocketTransport, candidate_profiles, is_tcp_target, split_tcp_target
+
+
+@pytest.fixture
+def peer():
+    """
+    Opens a SocketTransport with an 8-byte receive buffer to a plain local socket, yields both ends.
+    """
+    server = socket.create_server(("127.0.0.1", 0))
+    accepted = []
+    thread = threading.Thread(target=lambda: accepted.append(server.accept()[0]))
+    thread.start()
+    transport = SocketTransport("127.0.0.1", server.getsockname()[1], timeout=0.2, read_chunk_size=8)
+    thread.join()
+    yield transport, accepted[0]
+    transport.close()
+    accepted[0].close()
+    server.close()
+
+
+def wait_for_bytes(transport, count, timeout=2.0):
+    deadline = time.time() + timeout
+    while transport.in_waiting < count and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_tcp_targets_are_recognised():
+    assert is_tcp_target("192.168.1.10:5000")
+    assert is_tcp_target("tcp://localhost:5000")
+    assert not is_tcp_target("COM3")
+    assert split_tcp_target("tcp://localhost:5000") == ("localhost", 5000)
+    assert [profile.name for profile in candidate_profiles("localhost:5000")] == ["TCP"]
+
+
+def test_in_waiting_does_not_block(peer):
+    transport, _ = peer
+
+    start = time.time()
+    assert transport.in_waiting == 0
+    assert time.time() - start < 0.1
+
+
+def test_reads_across_the_end_of_the_receive_buffer(peer):
+    transport, other = peer
+    other.sendall(bytes(range(6)))
+    wait_for_bytes(transport, 6)
+    assert transport.read(4) == bytes(range(4))
+
+    # The two unread bytes are moved to the front to make room for the next ones
+    other.sendall(bytes(range(6, 12)))
+    received = b""
+    while len(received) < 8:
+        received += transport.read(8)
+    assert received == bytes(range(4, 12))
+
+
+def test_read_times_out_without_data(peer):
+    transport, _ = peer
+
+    assert transport.read(4) == b""
+
+
+def test_reset_input_buffer_drops_received_bytes(peer):
+    transport, other = peer
+    other.sendall(b"\x01\x02\x03")
+    wait_for_bytes(transport, 3)
+
+    transport.reset_input_buffer()
+
+    assert transport.in_waiting == 0
+
+
+def test_closed_connection_raises(peer):
+    transport, other = peer
+    other.close()
+
+    with pytest.raises(serial.SerialException):
+        transport.read(1)
+
+
+def test_isx3_measures_over_tcp(tmp_path):
+    with TcpServer(SimulatedISX3(rate=20000)) as server:
+        isx3 = ISX3(4)
+        assert isx3.connect(server.address)
+        try:
+            assert isx3.serial_protocol == "TCP"
+            assert isx3.last_message.code == TCP_SOCKET_MESSAGE
+
+            isx3.set_setup("1kHz", "1MHz", 20, "log", 1.0, "100mV", "voltage")
+            data = isx3.start_measurement(spectra=5, result_mode="array", csv_path=str(tmp_path / "result.csv"))
+
+            assert data.shape == (5, 20)
+            assert not np.isnan(data).any()
+            assert isx3.last_status.reason == "complete"
+        finally:
+            isx3.device.close()